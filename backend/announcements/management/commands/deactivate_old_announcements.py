@@ -12,6 +12,8 @@ from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
 from events.models import Event
 from announcements.models import Announcement
+from core.versioning import bump_on_commit
+from search.index import remove_for_model
 
 
 class Command(BaseCommand):
@@ -30,11 +32,14 @@ class Command(BaseCommand):
             return
 
         # Deactivate announcements for past events
-        updated_count = Announcement.objects.filter(
+        stale = Announcement.objects.filter(
             content_type=event_type,
             object_id__in=past_event_ids,
             is_active=True
-        ).update(is_active=False)
+        )
+        remove_for_model(Announcement, stale.values_list('id', flat=True))
+        updated_count = stale.update(is_active=False)
+        bump_on_commit(Announcement)
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -52,7 +52,13 @@ def handle_lost_item_announcement(sender, instance, created, **kwargs):
     else:
         # If item is resolved, deactivate its announcement
         if instance.is_resolved:
-            Announcement.objects.filter(
+            from core.versioning import bump_on_commit
+            from search.index import remove_for_model
+
+            announcements = Announcement.objects.filter(
                 content_type=lost_item_type,
                 object_id=instance.id
-            ).update(is_active=False)
+            )
+            remove_for_model(Announcement, announcements.values_list('id', flat=True))
+            announcements.update(is_active=False)
+            bump_on_commit(Announcement)
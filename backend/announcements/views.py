@@ -1,9 +1,10 @@
 from rest_framework import viewsets, permissions
+from core.projection import ValuesListMixin
 from .models import Announcement
 from .serializers import AnnouncementSerializer
 
 
-class AnnouncementViewSet(viewsets.ModelViewSet):
+class AnnouncementViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing announcements.
 
@@ -75,10 +76,20 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
 
         # IMPORTANT: Actually update the database to set is_active=False
         if deactivate_filters:
-            Announcement.objects.filter(
+            stale_ids = list(Announcement.objects.filter(
                 deactivate_filters,
                 is_active=True  # Only update those that are currently active
-            ).update(is_active=False)
+            ).values_list('id', flat=True))
+
+            if stale_ids:
+                from core.versioning import bump_on_commit
+                from search.index import remove_for_model
+
+                Announcement.objects.filter(id__in=stale_ids).update(is_active=False)
+                # update() skips post_save, so drop them from the search index
+                # and move the announcement version here
+                remove_for_model(Announcement, stale_ids)
+                bump_on_commit(Announcement)
 
         # Now return only active announcements
         return queryset.filter(is_active=True)
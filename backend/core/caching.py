@@ -0,0 +1,213 @@
+"""
+Cache-aside for public, read-mostly viewsets.
+
+``CachedResponseMixin`` stores rendered list/retrieve responses in the
+``API_CACHE_ALIAS`` cache (local memory, file-based or Redis, see
+``CACHES``). Keys combine the versions of the models the response reads
+(``core.versioning``) with the request's scheme, host, path and query
+string, so any write moves readers to a new key and nothing has to be
+deleted. File URLs in responses are absolute, so one host's response is
+never served to another.
+
+- Concurrent misses for the same key are coalesced (``core.singleflight``):
+  one request computes while the others serve the previous version of the
+  response if there is one, or wait briefly for the new one.
+- Entries older than the soft timeout are served as they are while one
+  background refresh recomputes them, so time-dependent lists (upcoming
+  events) catch up without any request waiting on the database. The
+  refresh runs the view again on a copy of the request and a new view
+  instance, so it shares nothing with the request still being answered.
+- Staff requests bypass the cache entirely: several of these viewsets return
+  a different queryset for ``is_staff``.
+
+Only JSON 200 responses are cached, with the headers the view set (``Vary``,
+``Allow``, pagination links...); the browsable API renders the user into the
+page.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections
+from django.http import HttpRequest, HttpResponse
+from django.urls import resolve
+
+from .singleflight import LOCK_TIMEOUT, get_lock, run_once
+from .versioning import cache_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 60 * 60
+DEFAULT_SOFT_TIMEOUT = 5 * 60
+
+# Headers not worth keeping with a cached response: recomputed per response,
+# or specific to the request that computed it
+UNCACHED_HEADERS = frozenset(['content-length', 'set-cookie', 'x-cache'])
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='api-cache-refresh')
+
+
+def get_api_cache():
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+class CachedResponseMixin:
+    """
+    ViewSet mixin caching list and retrieve responses for non-staff users.
+
+    ``cache_models`` lists the models (or version collections) the response
+    reads and defaults to the queryset's model. ``cache_timeout`` and
+    ``cache_soft_timeout`` default to ``API_CACHE_TIMEOUT`` and
+    ``API_CACHE_SOFT_TIMEOUT``. Override ``get_cache_variant()`` when the
+    response depends on something besides the URL (e.g. today's date).
+    """
+    cache_models = None
+    cache_timeout = None
+    cache_soft_timeout = None
+
+    def get_cache_models(self):
+        return self.cache_models or [self.get_queryset().model]
+
+    def get_cache_variant(self):
+        return ()
+
+    def get_cache_key(self, request, versioned=True):
+        """
+        The versioned key for this request, or with ``versioned=False`` the
+        key holding the latest response whatever the version.
+        """
+        return cache_key(
+            f'api:{self.basename}:{self.action}',
+            self.get_cache_models() if versioned else [],
+            request.build_absolute_uri('/'),
+            request.get_full_path(),
+            request.accepted_media_type,
+            *self.get_cache_variant(),
+        )
+
+    def should_cache(self, request):
+        return not request.user.is_staff and request.accepted_renderer.format == 'json'
+
+    def _render(self, request, handler, *args, **kwargs):
+        """Run the view and return the rendered response."""
+        response = self.finalize_response(request, handler(request, *args, **kwargs), *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def _store(self, key, stale_key, response):
+        """Cache a 200 response; return its entry, or None if it wasn't cacheable."""
+        if response.status_code != 200:
+            return None
+        entry = {
+            'content': response.content,
+            'content_type': response['Content-Type'],
+            'headers': [
+                (name, value) for name, value in response.items() if name.lower() not in UNCACHED_HEADERS
+            ],
+            'created': time.time(),
+        }
+        timeout = self.cache_timeout or getattr(settings, 'API_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+        get_api_cache().set_many({key: entry, stale_key: entry}, timeout)
+        return entry
+
+    def _compute(self, key, stale_key, request, handler, *args, **kwargs):
+        """
+        Compute a missing entry, letting only one request per key do it.
+
+        Returns the entry, or the view's own response if it couldn't be cached
+        (errors, redirects).
+        """
+        cache = get_api_cache()
+        rendered = []
+
+        def compute():
+            response = self._render(request, handler, *args, **kwargs)
+            rendered.append(response)
+            return self._store(key, stale_key, response)
+
+        entry = run_once(
+            key,
+            compute,
+            check=lambda: cache.get(key),
+            stale=lambda: cache.get(stale_key),
+        )
+        if entry is not None:
+            return entry
+        return rendered[0] if rendered else self._render(request, handler, *args, **kwargs)
+
+    def _refresh_request(self, request):
+        """
+        A copy of ``request`` for the background refresh, made before this
+        request goes on, so the two threads never touch the same objects.
+        """
+        original = request._request
+        copy = HttpRequest()
+        copy.method = 'GET'
+        copy.path, copy.path_info = original.path, original.path_info
+        copy.META = {**original.META, 'REQUEST_METHOD': 'GET'}
+        copy.GET = original.GET.copy()
+        copy.COOKIES = dict(original.COOKIES)
+        # Already authenticated; the session authenticator reads it from here
+        copy.user = request.user
+        copy._api_cache_refresh = True
+        return copy
+
+    def _refresh(self, key, token, request):
+        close_old_connections()
+        try:
+            # A new view instance (see cached_response) recomputes and stores
+            match = resolve(request.path_info)
+            match.func(request, *match.args, **match.kwargs)
+        except Exception:
+            logger.exception("Background refresh of %s failed", key)
+        finally:
+            get_lock().release(key, token)
+            close_old_connections()
+
+    def _schedule_refresh(self, key, request):
+        token = get_lock().acquire(key, LOCK_TIMEOUT)
+        if token is not None:
+            _executor.submit(self._refresh, key, token, self._refresh_request(request))
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        if not self.should_cache(request):
+            return handler(request, *args, **kwargs)
+
+        key = self.get_cache_key(request)
+        stale_key = self.get_cache_key(request, versioned=False)
+        if getattr(request._request, '_api_cache_refresh', False):
+            response = self._render(request, handler, *args, **kwargs)
+            self._store(key, stale_key, response)
+            return response
+
+        entry = get_api_cache().get(key)
+        if entry is None:
+            entry = self._compute(key, stale_key, request, handler, *args, **kwargs)
+            if not isinstance(entry, dict):
+                return entry
+            state = 'MISS'
+        else:
+            soft_timeout = self.cache_soft_timeout or getattr(
+                settings, 'API_CACHE_SOFT_TIMEOUT', DEFAULT_SOFT_TIMEOUT
+            )
+            if time.time() - entry['created'] > soft_timeout:
+                self._schedule_refresh(key, request)
+                state = 'STALE'
+            else:
+                state = 'HIT'
+
+        response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        for name, value in entry.get('headers', ()):
+            response[name] = value
+        response['X-Cache'] = state
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
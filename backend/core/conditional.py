@@ -0,0 +1,78 @@
+"""
+Conditional GET for viewsets, driven by version stamps.
+
+``ConditionalGetMixin`` gives list and retrieve responses an ETag built from
+the versions of the models the response reads (see ``core.versioning``) and
+the request variant (path and query string, negotiated media type, user).
+Building it costs a cache read, so a client revalidating with
+``If-None-Match`` gets a 304 before the queryset is evaluated or anything is
+serialized.
+"""
+
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .versioning import make_etag
+
+
+def etag_matches(request, etag):
+    """
+    True if ``etag`` is listed in the request's If-None-Match.
+
+    Uses the weak comparison If-None-Match calls for, so ETags weakened by
+    the compression middleware still match.
+    """
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    etag = etag.removeprefix('W/')
+    return any(candidate.removeprefix('W/') == etag for candidate in parse_etags(header))
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin answering unchanged list/retrieve requests with 304.
+
+    ``etag_models`` lists every model whose rows appear in the response
+    (defaults to the queryset's model) and may also name collections; each
+    must be versioned (``settings.VERSIONED_MODELS`` or a
+    ``VERSION_COLLECTIONS`` member) so its version moves on writes.
+    """
+    etag_models = None
+
+    def get_etag_models(self):
+        return self.etag_models or [self.queryset.model]
+
+    def get_etag(self, request):
+        user = request.user
+        return make_etag(
+            self.basename,
+            self.get_etag_models(),
+            request.get_full_path(),
+            request.accepted_media_type or '',
+            user.pk if user.is_authenticated else 0,
+        )
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        etag = self.get_etag(request)
+        if etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response['ETag'] = etag
+        # Responses differ per user (staff views, "my listings")
+        patch_vary_headers(response, ('Accept', 'Authorization'))
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().retrieve, *args, **kwargs)
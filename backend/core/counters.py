@@ -0,0 +1,36 @@
+"""
+Running counts in summary tables.
+
+Summary tables (dasa_users.DemographicCount, elections.TurnoutCount) keep
+one row per ``(dimension, value)`` bucket, optionally scoped (e.g. per
+election), with a ``count`` column moved by signed deltas as the counted
+rows change. ``add_counts`` applies a batch of deltas with one UPDATE per
+changed bucket, creating a bucket's row the first time it is used.
+Taking from a bucket that has no row is a no-op: nothing was counted
+there, or the row went with its scope (an election being deleted).
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+
+def add_counts(model, deltas, **scope):
+    """
+    Add ``deltas`` (``{(dimension, value): delta}``) to ``model``'s counts.
+
+    ``scope`` narrows the rows (e.g. ``election_id=3``) and is set on new
+    ones. Buckets are updated in sorted order, so concurrent writers lock
+    rows in the same order.
+    """
+    for (dimension, value), delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        rows = model.objects.filter(dimension=dimension, value=value, **scope)
+        if rows.update(count=F('count') + delta) or delta < 0:
+            continue
+        try:
+            with transaction.atomic():
+                model.objects.create(dimension=dimension, value=value, count=delta, **scope)
+        except IntegrityError:
+            # Created concurrently
+            rows.update(count=F('count') + delta)
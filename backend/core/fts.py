@@ -0,0 +1,91 @@
+"""
+Helpers shared by the full-text search indexes (SQLite FTS5 / Postgres tsvector).
+
+User input is never passed to MATCH / to_tsquery as-is: it is split into
+word tokens and rebuilt into a query string, so quotes, operators and column
+filters typed by a user cannot break or widen the query.
+
+Highlights are requested with ``MARK_START``/``MARK_END`` rather than HTML
+tags; ``highlighted_html`` escapes the text and only then puts ``<mark>``
+tags in, so markup in indexed content never reaches a client as HTML.
+"""
+
+import re
+from html import escape
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Private-use characters passed to highlight()/snippet()/ts_headline()
+MARK_START = '\ue000'
+MARK_END = '\ue001'
+
+
+def tokenize(text):
+    """Split free text into lowercase word tokens."""
+    return TOKEN_RE.findall((text or '').lower())
+
+
+def fts5_match_query(text, prefix=True):
+    """
+    Build an FTS5 MATCH expression requiring every token.
+
+    With ``prefix=True`` each token also matches longer words
+    ("elect" matches "election").
+    """
+    tokens = tokenize(text)
+    suffix = '*' if prefix else ''
+    return ' '.join(f'"{token}"{suffix}' for token in tokens)
+
+
+def tsquery(text, prefix=True):
+    """Build a Postgres to_tsquery() expression requiring every token."""
+    tokens = tokenize(text)
+    suffix = ':*' if prefix else ''
+    return ' & '.join(f'{token}{suffix}' for token in tokens)
+
+
+def highlighted_html(text):
+    """Escape highlighted FTS output, turning the match markers into <mark> tags."""
+    if text is None:
+        return None
+    return escape(text).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def headline_options(**options):
+    """ts_headline() options with the match markers as start/stop selectors."""
+    options = {'StartSel': f'"{MARK_START}"', 'StopSel': f'"{MARK_END}"', **options}
+    return ', '.join(f'{name}={value}' for name, value in options.items())
+
+
+def is_sqlite(connection):
+    return connection.vendor == 'sqlite'
+
+
+def is_postgres(connection):
+    return connection.vendor == 'postgresql'
+
+
+def edit_distance(a, b, max_distance=2):
+    """
+    Levenshtein distance between two words, capped at ``max_distance + 1``.
+
+    Used for typo-tolerant matching against an index vocabulary, where only
+    "close enough or not" matters, so rows stop early once every cell is
+    over the cap.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
@@ -0,0 +1,147 @@
+"""
+Management command comparing DRF's stdlib JSONRenderer/JSONParser with the
+orjson-backed FastJSONRenderer/FastJSONParser (core.renderers, core.parsers).
+
+Inserts throwaway products, an election with results and a constitution
+inside a transaction that is rolled back, collects the real response data
+of ProductViewSet.list, ElectionViewSet.stats and ChapterViewSet.list, and
+times rendering and parsing of each payload. Rendered bytes are checked to
+be identical.
+
+Usage:
+    python manage.py benchmark_json
+    python manage.py benchmark_json --products 2000 --repeat 20
+"""
+
+import io
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer, orjson
+from dasa_users.models import User
+from elections.models import Election, Position, Candidate, Vote
+from elections.views import ElectionViewSet
+from legal.models import Chapter, Article
+from legal.views import ChapterViewSet
+from market.models import Product
+from market.views import ProductViewSet
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the orjson renderer/parser against the stdlib JSON ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=1000, help='Products to list (default 1000)')
+        parser.add_argument('--repeat', type=int, default=10, help='Best of N runs (default 10)')
+
+    def create_data(self, products):
+        user = User.objects.create_user(username='benchmark-user', password='benchmark-pass', is_staff=True)
+        body = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 10
+
+        Product.objects.bulk_create([
+            Product(
+                seller=user, title=f'Product {i}', price=f'{10 + i % 500}.50', category='Books',
+                condition='Used - Good', image='market/product.jpg', description=body,
+                whatsapp_number='0200000000',
+            )
+            for i in range(products)
+        ])
+
+        now = timezone.now()
+        election = Election.objects.create(
+            title='Benchmark Election', start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=1), is_active=True,
+        )
+        for rank in range(10):
+            position = Position.objects.create(election=election, name=f'Position {rank}', rank=rank)
+            candidates = Candidate.objects.bulk_create([
+                Candidate(position=position, user=user, manifesto=body, photo='candidates/photo.jpg')
+                for _ in range(5)
+            ])
+            Vote.objects.create(voter=user, position=position, candidate=candidates[0])
+
+        for number in range(1, 21):
+            chapter = Chapter.objects.create(number=number, title=f'Chapter {number}')
+            Article.objects.bulk_create([
+                Article(chapter=chapter, article_number=f'{number}.{i}', title=f'Article {number}.{i}', content=body * 3)
+                for i in range(1, 11)
+            ])
+        return user, election
+
+    def collect_payloads(self, user, election):
+        factory = APIRequestFactory()
+
+        request = factory.get('/api/market/products/', HTTP_HOST='localhost')
+        products = ProductViewSet.as_view({'get': 'list'})(request).data
+
+        request = factory.get(f'/api/elections/elections/{election.id}/stats/', HTTP_HOST='localhost')
+        force_authenticate(request, user)
+        stats = ElectionViewSet.as_view({'get': 'stats'})(request, pk=election.id).data
+
+        # Any query string bypasses the precompiled document and serializes;
+        # staff requests bypass the response cache, which returns rendered bytes
+        request = factory.get('/api/constitution/chapters/?fresh=1', HTTP_HOST='localhost')
+        force_authenticate(request, user)
+        chapters = ChapterViewSet.as_view({'get': 'list'})(request).data
+
+        return [
+            ('ProductViewSet.list', products),
+            ('ElectionViewSet.stats', stats),
+            ('ChapterViewSet.list', chapters),
+        ]
+
+    def best_of(self, repeat, func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best * 1000
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed; both paths use the stdlib.'))
+        repeat = options['repeat']
+
+        try:
+            with transaction.atomic():
+                payloads = self.collect_payloads(*self.create_data(options['products']))
+                raise Rollback(payloads)
+        except Rollback as rollback:
+            payloads = rollback.args[0]
+
+        stdlib_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        stdlib_parser, fast_parser = JSONParser(), FastJSONParser()
+
+        self.stdout.write(f'Best of {repeat} runs (ms):')
+        for name, data in payloads:
+            stdlib_bytes = stdlib_renderer.render(data)
+            fast_bytes = fast_renderer.render(data)
+            if stdlib_bytes != fast_bytes:
+                raise CommandError(f'{name}: rendered output differs')
+
+            render_stdlib = self.best_of(repeat, lambda: stdlib_renderer.render(data))
+            render_fast = self.best_of(repeat, lambda: fast_renderer.render(data))
+            parse_stdlib = self.best_of(repeat, lambda: stdlib_parser.parse(io.BytesIO(stdlib_bytes)))
+            parse_fast = self.best_of(repeat, lambda: fast_parser.parse(io.BytesIO(stdlib_bytes)))
+
+            self.stdout.write(
+                f'  {name:<22} {len(stdlib_bytes) / 1024:8.1f} KB   '
+                f'render {render_stdlib:7.2f} -> {render_fast:6.2f} ({render_stdlib / render_fast:4.1f}x)   '
+                f'parse {parse_stdlib:7.2f} -> {parse_fast:6.2f} ({parse_stdlib / parse_fast:4.1f}x)'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Rendered output identical; benchmark rows rolled back.'))
@@ -0,0 +1,138 @@
+"""
+Management command comparing the ModelSerializer list path with the
+values() + CompiledSerializer fast path (core.projection).
+
+Inserts throwaway rows inside a transaction that is rolled back, renders
+each list both ways, checks the JSON output is byte-for-byte identical and
+reports the per-row cost.
+
+Usage:
+    python manage.py benchmark_list_serializers
+    python manage.py benchmark_list_serializers --rows 2000 --repeat 10
+"""
+
+import time
+from datetime import date, time as dtime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core.projection import compile_serializer
+from announcements.models import Announcement
+from announcements.serializers import AnnouncementSerializer
+from events.models import Event
+from events.serializers import EventSerializer
+from gallery.models import GalleryItem
+from gallery.serializers import GalleryItemSerializer
+from opportunities.models import Opportunity
+from opportunities.serializers import OpportunitySerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+def make_rows(rows):
+    """Unsaved instances with realistically sized text fields."""
+    now = timezone.now()
+    body = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 40
+    return {
+        Event: [
+            Event(
+                title=f'Event {i}', description=body, date=date.today() + timedelta(days=i % 30),
+                start_time=dtime(9, 0), end_time=dtime(12, 30), location='Great Hall',
+                event_image='events/images/poster.jpg' if i % 2 else None,
+                registration_link='https://example.com/register',
+            )
+            for i in range(rows)
+        ],
+        Opportunity: [
+            Opportunity(
+                title=f'Opportunity {i}', organization='KNUST', location='Kumasi', type='Internship',
+                description=body, application_link='https://example.com/apply',
+                deadline=now + timedelta(days=i % 60),
+            )
+            for i in range(rows)
+        ],
+        GalleryItem: [
+            GalleryItem(
+                title=f'Photo {i}', media_type='Image' if i % 3 else 'Video',
+                image='gallery/images/photo.jpg' if i % 3 else None,
+                video=None if i % 3 else 'gallery/videos/clip.mp4',
+                video_thumbnail=None if i % 3 else 'gallery/thumbnails/clip.jpg',
+            )
+            for i in range(rows)
+        ],
+        Announcement: [
+            Announcement(title=f'Announcement {i}', message=body, related_link='https://example.com')
+            for i in range(rows)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark values() + compiled serializer list rendering against ModelSerializer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows per model (default 500)')
+        parser.add_argument('--repeat', type=int, default=5, help='Best of N runs (default 5)')
+
+    def best_of(self, repeat, func):
+        best = None
+        result = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        request = RequestFactory().get('/', HTTP_HOST='localhost')
+        context = {'request': request}
+        renderer = JSONRenderer()
+
+        cases = [
+            (Event, EventSerializer),
+            (Opportunity, OpportunitySerializer),
+            (GalleryItem, GalleryItemSerializer),
+            (Announcement, AnnouncementSerializer),
+        ]
+
+        try:
+            with transaction.atomic():
+                for model, instances in make_rows(rows).items():
+                    model.objects.bulk_create(instances)
+
+                self.stdout.write(f'{rows} rows per model, best of {repeat}:')
+                for model, serializer_class in cases:
+                    compiled = compile_serializer(serializer_class)
+                    if compiled is None:
+                        raise CommandError(f'{serializer_class.__name__} cannot be compiled')
+                    queryset = model.objects.all()
+
+                    model_time, model_data = self.best_of(
+                        repeat, lambda: serializer_class(list(queryset), many=True, context=context).data
+                    )
+                    fast_time, fast_data = self.best_of(
+                        repeat, lambda: compiled.render(queryset.values(*compiled.columns), context)
+                    )
+
+                    if renderer.render(model_data) != renderer.render(fast_data):
+                        raise CommandError(f'{serializer_class.__name__}: fast path output differs')
+
+                    model_us = model_time / rows * 1e6
+                    fast_us = fast_time / rows * 1e6
+                    self.stdout.write(
+                        f'  {serializer_class.__name__:<24} ModelSerializer {model_us:7.1f} us/row   '
+                        f'values() {fast_us:7.1f} us/row   {model_us / fast_us:4.1f}x'
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('Outputs identical; benchmark rows rolled back.'))
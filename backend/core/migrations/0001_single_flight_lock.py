@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="SingleFlightLock",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=250, primary_key=True, serialize=False),
+                ),
+                ("token", models.CharField(max_length=32)),
+                ("expires_at", models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
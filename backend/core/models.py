@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.db import models
+
+
+class SingleFlightLock(models.Model):
+    """
+    A lock row for core.singleflight (SINGLE_FLIGHT_LOCK = "db"), for
+    shared caches without an atomic add(). A row exists while one process
+    computes ``key``; ``expires_at`` lets others take over from a process
+    that died.
+    """
+    key = models.CharField(max_length=250, primary_key=True)
+    token = models.CharField(max_length=32)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.key
+
+
+class DeletionJob(models.Model):
+    """
+    A bulk deletion run in the background by core.deletion, with progress.
+
+    ``ids`` holds the primary keys to delete; ``processed`` counts how many
+    of them have been handled so far.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    model = models.CharField(max_length=100, help_text="app_label.ModelName of the rows to delete")
+    ids = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    total = models.PositiveIntegerField()
+    processed = models.PositiveIntegerField(default=0)
+    deleted = models.PositiveIntegerField(default=0, help_text="Rows deleted, including cascades")
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Delete {self.total} {self.model} ({self.status})"
@@ -0,0 +1,285 @@
+"""
+Column projection fast path for read-only list endpoints.
+
+A DRF ModelSerializer list costs, per row: a full model instance (every
+column, including large TextFields), then for every field a get_attribute()
+walk, a None check and a to_representation() call dispatched through the
+field class. For the card lists on the public pages that is most of the
+response time.
+
+``CompiledSerializer`` inspects a ModelSerializer once and turns it into a
+flat list of ``(output key, row key, converter)`` steps over
+``QuerySet.values()`` dicts. Only the columns the serializer emits (plus any
+``row_dependencies`` it declares for computed fields) are fetched, and
+fields whose representation is the database value itself (strings, ints,
+bools, choices, primary keys) are copied without a call. Output is identical
+to ``serializer_class(queryset, many=True).data``.
+
+Computed fields still work: properties (``time_display``) and
+SerializerMethodFields (``get_event_image_url``) are called with a
+lightweight row proxy that exposes columns as attributes (file columns as
+FieldFiles) instead of a model instance.
+
+Serializers the compiler cannot reproduce exactly (nested serializers,
+model methods used as sources, custom to_representation) make
+``compile_serializer`` return None and the view falls back to the regular
+path.
+"""
+
+import datetime
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.utils import timezone
+from rest_framework import fields as drf_fields
+from rest_framework import relations, serializers
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+# DRF fields whose to_representation() returns database values unchanged
+IDENTITY_FIELDS = (
+    drf_fields.CharField,
+    drf_fields.IntegerField,
+    drf_fields.BooleanField,
+    drf_fields.ChoiceField,
+    drf_fields.ReadOnlyField,
+    relations.PrimaryKeyRelatedField,
+)
+
+
+class NotCompilable(Exception):
+    """The serializer uses something the fast path can't reproduce exactly."""
+
+
+class RowProxy:
+    """
+    Attribute access over a values() row, standing in for a model instance
+    when calling properties and SerializerMethodFields.
+    """
+    __slots__ = ('_row', '_file_fields')
+
+    def __init__(self, row, file_fields):
+        self._row = row
+        self._file_fields = file_fields
+
+    def __getattr__(self, name):
+        row = self._row
+        if name == 'pk':
+            name = 'id'
+        try:
+            value = row[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        field = self._file_fields.get(name)
+        if field is not None:
+            return field.attr_class(None, field, value)
+        return value
+
+
+class CompiledSerializer:
+    """
+    A ModelSerializer precompiled into a flat plan over values() rows.
+
+    Use ``columns`` for ``QuerySet.values(*columns)`` and ``render(rows,
+    context)`` to produce the serialized list.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        serializer = serializer_class()
+        if type(serializer).to_representation is not serializers.ModelSerializer.to_representation:
+            raise NotCompilable('custom to_representation()')
+
+        model = serializer.Meta.model
+        self.model = model
+        self.file_fields = {}
+        columns = ['id']
+        needs_all_columns = False
+        # (key, row key, converter kind, converter)
+        self.steps = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.BaseSerializer):
+                raise NotCompilable(f'{name}: nested serializer')
+
+            if isinstance(field, serializers.SerializerMethodField):
+                self.steps.append((name, None, 'method', field.method_name))
+                needs_all_columns |= name not in self._dependencies(serializer)
+                columns.extend(self._dependencies(serializer).get(name, ()))
+                continue
+
+            source = field.source
+            model_field = self._model_field(model, source)
+            if model_field is None:
+                prop = getattr(model, source, None)
+                if not isinstance(prop, property):
+                    raise NotCompilable(f'{name}: source {source!r} is not a column or property')
+                self.steps.append((name, None, 'property', prop.fget))
+                needs_all_columns |= name not in self._dependencies(serializer)
+                columns.extend(self._dependencies(serializer).get(name, ()))
+                continue
+
+            columns.append(source)
+            if isinstance(model_field, models.FileField):
+                if not isinstance(field, drf_fields.FileField) or not getattr(field, 'use_url', True):
+                    raise NotCompilable(f'{name}: file field without URL output')
+                self.steps.append((name, source, 'file', model_field.storage))
+            elif isinstance(field, IDENTITY_FIELDS):
+                self.steps.append((name, source, 'value', None))
+            elif type(field) is drf_fields.DateTimeField and self._is_iso(field, api_settings.DATETIME_FORMAT):
+                self.steps.append((name, source, 'datetime', field))
+            elif type(field) in (drf_fields.DateField, drf_fields.TimeField) and self._is_iso(
+                field, api_settings.DATE_FORMAT if type(field) is drf_fields.DateField else api_settings.TIME_FORMAT
+            ):
+                self.steps.append((name, source, 'isoformat', None))
+            else:
+                self.steps.append((name, source, 'convert', field.to_representation))
+
+        if needs_all_columns:
+            columns = []
+            for f in model._meta.concrete_fields:
+                columns.append(f.name)
+                if f.is_relation:
+                    columns.append(f.attname)
+        self.columns = tuple(dict.fromkeys(columns))
+
+        # File columns reach properties/method fields as FieldFiles
+        for column in self.columns:
+            model_field = self._model_field(model, column)
+            if isinstance(model_field, models.FileField):
+                self.file_fields[column] = model_field
+
+    @staticmethod
+    def _is_iso(field, default):
+        output_format = getattr(field, 'format', default)
+        return output_format is not None and output_format.lower() == ISO_8601
+
+    @staticmethod
+    def _dependencies(serializer):
+        return getattr(serializer, 'row_dependencies', {})
+
+    @staticmethod
+    def _model_field(model, source):
+        if '.' in source:
+            raise NotCompilable(f'dotted source {source!r}')
+        try:
+            field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            return None
+        if field.many_to_many or field.one_to_many or (field.is_relation and not field.concrete):
+            raise NotCompilable(f'{source}: reverse or many-valued relation')
+        return field
+
+    def render(self, rows, context=None):
+        """Serialize an iterable of values() rows."""
+        context = context or {}
+        request = context.get('request')
+        build_uri = request.build_absolute_uri if request is not None else None
+        serializer = None
+        file_fields = self.file_fields
+
+        # Bind per-request state once, not per row
+        steps = []
+        for key, row_key, kind, converter in self.steps:
+            if kind == 'method':
+                if serializer is None:
+                    serializer = self.serializer_class(context=context)
+                converter = getattr(serializer, converter)
+            elif kind == 'datetime':
+                converter = _datetime_converter(converter)
+            elif kind == 'isoformat':
+                kind, converter = 'convert', _isoformat
+            steps.append((key, row_key, 'convert' if kind == 'datetime' else kind, converter))
+
+        data = []
+        for row in rows:
+            proxy = None
+            item = {}
+            for key, row_key, kind, converter in steps:
+                if kind == 'value':
+                    item[key] = row[row_key]
+                elif kind == 'convert':
+                    value = row[row_key]
+                    item[key] = None if value is None else converter(value)
+                elif kind == 'file':
+                    name = row[row_key]
+                    if not name:
+                        item[key] = None
+                    else:
+                        url = converter.url(name)
+                        item[key] = build_uri(url) if build_uri else url
+                else:
+                    if proxy is None:
+                        proxy = RowProxy(row, file_fields)
+                    item[key] = converter(proxy)
+            data.append(item)
+        return data
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+def _datetime_converter(field):
+    """
+    DRF DateTimeField.to_representation() (ISO 8601) with the field's
+    timezone resolved once instead of on every value.
+    """
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+
+    def convert(value):
+        if isinstance(value, str):
+            return value
+        if field_timezone is not None:
+            value = value.astimezone(field_timezone) if timezone.is_aware(value) else timezone.make_aware(
+                value, field_timezone
+            )
+        elif timezone.is_aware(value):
+            value = timezone.make_naive(value, datetime.timezone.utc)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    return convert
+
+
+@lru_cache(maxsize=None)
+def compile_serializer(serializer_class):
+    """Compiled form of ``serializer_class``, or None if it can't be compiled."""
+    try:
+        return CompiledSerializer(serializer_class)
+    except NotCompilable:
+        return None
+
+
+class ValuesListMixin:
+    """
+    ViewSet mixin serving ``list`` through ``QuerySet.values()`` and a
+    CompiledSerializer, enabled per viewset by mixing it in.
+
+    ``list_serializer_class`` (defaults to ``serializer_class``) is the
+    serializer whose output the list reproduces. Filtering, ordering and
+    pagination behave as before. Serializers that can't be compiled fall back
+    to the regular ModelSerializer list.
+    """
+    list_serializer_class = None
+
+    def get_list_serializer_class(self):
+        return self.list_serializer_class or self.get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        compiled = compile_serializer(self.get_list_serializer_class())
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).values(*compiled.columns)
+        context = self.get_serializer_context()
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(compiled.render(page, context))
+        return Response(compiled.render(queryset, context))
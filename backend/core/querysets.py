@@ -0,0 +1,174 @@
+"""
+Queryset planning driven by serializer declarations.
+
+``QueryPlanMixin`` walks a viewset's serializer once per serializer class
+and works out what the queryset needs so rendering a page costs a fixed
+number of queries:
+
+- ``select_related`` for every single-valued relation a field reads
+  through (``source='election.title'``, nested serializers,
+  ``source='candidate.user.get_full_name'``),
+- ``prefetch_related`` for nested many-valued relations
+  (``ArticleSerializer(many=True)``),
+- ``only()`` listing the columns the serializer reads, when every field
+  maps onto a model field. Anything the walk cannot see through
+  (SerializerMethodField, properties, annotations, an overridden
+  to_representation) turns ``only()`` off for that serializer, since
+  deferring a column it reads would cost a query per row.
+
+Serializers can add relations their method fields read with
+``select_related`` / ``prefetch_related`` class attributes (see
+``UserSummarySerializer``); they are prefixed with the source path of the
+field the serializer is nested under.
+"""
+
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+
+class QueryPlan:
+    """select_related / prefetch_related / only() for one serializer class."""
+
+    def __init__(self, select_related=(), prefetch_related=(), only=None):
+        self.select_related = tuple(dict.fromkeys(select_related))
+        self.prefetch_related = tuple(dict.fromkeys(prefetch_related))
+        self.only = tuple(sorted(only)) if only is not None else None
+
+    def apply(self, queryset, use_only=True):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if use_only and self.only:
+            queryset = queryset.only(*self.only)
+        return queryset
+
+    def __repr__(self):
+        return (
+            f'QueryPlan(select_related={self.select_related!r}, '
+            f'prefetch_related={self.prefetch_related!r}, only={self.only!r})'
+        )
+
+
+class _Planner:
+
+    def __init__(self):
+        self.select_related = []
+        self.prefetch_related = []
+        self.only = set()
+        self.only_safe = True
+
+    def _get_field(self, model, name):
+        try:
+            return model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    def _declared(self, serializer, prefix, in_prefetch):
+        for related in getattr(serializer, 'select_related', ()):
+            target = self.prefetch_related if in_prefetch else self.select_related
+            target.append(prefix + related)
+        for related in getattr(serializer, 'prefetch_related', ()):
+            self.prefetch_related.append(prefix + related)
+
+    def walk(self, serializer, model, prefix='', in_prefetch=False):
+        """
+        Add what ``serializer`` (rendering ``model`` instances reached through
+        ``prefix``) needs to the plan.
+        """
+        self._declared(serializer, prefix, in_prefetch)
+        if type(serializer).to_representation is not serializers.ModelSerializer.to_representation:
+            self.only_safe = False
+
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+                self.only_safe = False
+                continue
+            self._walk_field(field, model, prefix, in_prefetch)
+
+    def _walk_field(self, field, model, prefix, in_prefetch):
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        is_serializer = isinstance(nested, serializers.BaseSerializer)
+        attrs = field.source_attrs
+        path = prefix
+
+        for i, attr in enumerate(attrs):
+            last = i == len(attrs) - 1
+            model_field = self._get_field(model, attr)
+            if model_field is None:
+                # Property, method, annotation: can't see which columns it reads
+                self.only_safe = False
+                return
+
+            if not model_field.is_relation:
+                if not in_prefetch:
+                    self.only.add(path + attr)
+                return
+
+            if model_field.many_to_many or model_field.one_to_many:
+                self.prefetch_related.append(path + attr)
+                if is_serializer and last:
+                    self.walk(nested, model_field.related_model, f'{path}{attr}__', in_prefetch=True)
+                return
+
+            if model_field.concrete and not in_prefetch:
+                # Forward FK / one-to-one: the local column is always needed
+                self.only.add(path + attr)
+            if last and not is_serializer and isinstance(field, (RelatedField, ManyRelatedField)):
+                # Primary key only; no join needed
+                return
+
+            target = self.prefetch_related if in_prefetch else self.select_related
+            target.append(path + attr)
+            model = model_field.related_model
+            path = f'{path}{attr}__'
+
+        if is_serializer:
+            self.walk(nested, model, path, in_prefetch)
+        else:
+            # The field renders a related object itself (e.g. via __str__)
+            self.only_safe = False
+
+    def plan(self):
+        return QueryPlan(
+            self.select_related,
+            self.prefetch_related,
+            self.only if self.only_safe else None,
+        )
+
+
+@lru_cache(maxsize=None)
+def plan_for_serializer(serializer_class):
+    """
+    The QueryPlan needed to render ``serializer_class``.
+
+    Cached per class: serializer fields are declared statically, so the
+    walk only happens once per process.
+    """
+    serializer = serializer_class()
+    planner = _Planner()
+    planner.walk(serializer, serializer.Meta.model)
+    return planner.plan()
+
+
+class QueryPlanMixin:
+    """
+    ViewSet mixin applying the serializer's QueryPlan in filter_queryset(),
+    so it covers list and detail views even when get_queryset() builds its
+    own queryset. only() is applied to reads (GET/HEAD) only; writes keep
+    full instances for validation and save().
+
+    Custom actions that build their own querysets can call plan_queryset().
+    """
+
+    def plan_queryset(self, queryset):
+        plan = plan_for_serializer(self.get_serializer_class())
+        return plan.apply(queryset, use_only=self.request.method in ('GET', 'HEAD'))
+
+    def filter_queryset(self, queryset):
+        return self.plan_queryset(super().filter_queryset(queryset))
@@ -0,0 +1,54 @@
+"""
+orjson-backed JSON renderer.
+
+Drop-in replacement for DRF's JSONRenderer: same media type and the same
+output for the payloads this API produces (compact separators, UTF-8,
+escaped U+2028/U+2029), but encoded in C. UUIDs are handled natively by
+orjson; datetimes, dates and times are passed through to DRF's own
+JSONEncoder.default (whatever precision the installed DRF uses, ``Z`` for
+UTC), as is anything else orjson doesn't know (Decimal, lazy translation
+strings, timedelta, querysets...), so they are represented exactly as
+before.
+
+orjson is optional: without it, or when a request asks for indented output
+(``Accept: application/json; indent=4``, the browsable API), rendering falls
+back to the stdlib implementation.
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer encoding with orjson when it is installed."""
+
+    options = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+    default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # orjson only writes compact, non-ASCII-escaped output
+        if orjson is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=self.options)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits; let the stdlib raise or cope
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict JavaScript subset, like JSONRenderer
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
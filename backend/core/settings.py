@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     "corsheaders",
     "django_filters",
     # Local apps
+    "core",
     "dasa_users",
     "elections",
     "leadership",
@@ -54,10 +55,12 @@ INSTALLED_APPS = [
     "market",
     "lost_found",
     "opportunities",
+    "search",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.CompressionMiddleware",  # Sees responses after the middleware below
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",  # Must be above CommonMiddleware
     "django.middleware.common.CommonMiddleware",
@@ -94,6 +97,13 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Background work (resource text extraction) writes from another
+        # thread; IMMEDIATE transactions make writers wait for the lock
+        # instead of failing with "database is locked"
+        "OPTIONS": {
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+        },
     }
 }
 
@@ -102,6 +112,32 @@ CSRF_TRUSTED_ORIGINS = ['https://*.ngrok-free.app']
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
+# Password hashing (dasa_users.hashers). PASSWORD_HASHER_PROFILE picks the
+# hasher for new passwords ("argon2" needs argon2-cffi); the others stay
+# listed so existing hashes verify and are upgraded on the next login.
+PASSWORD_HASHER_PROFILE = "scrypt"
+PASSWORD_HASHER_PROFILES = {
+    "scrypt": "dasa_users.hashers.TunedScryptPasswordHasher",
+    "argon2": "dasa_users.hashers.TunedArgon2PasswordHasher",
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE],
+    *(hasher for name, hasher in PASSWORD_HASHER_PROFILES.items() if name != PASSWORD_HASHER_PROFILE),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+# Cost parameters; scrypt at N=2**15, r=8, p=1 needs 32 MB per hash, argon2
+# follows the OWASP minimum (19 MiB, 2 passes)
+PASSWORD_HASHER_PARAMS = {
+    "scrypt": {"work_factor": 2**15, "block_size": 8, "parallelism": 1, "maxmem": 64 * 1024 * 1024},
+    "argon2": {"time_cost": 2, "memory_cost": 19 * 1024, "parallelism": 1},
+}
+# Processes per server process hashing passwords (0 = hash in the request
+# thread), and how many hashes may queue for them. Request threads still wait
+# for their hash; the pool only bounds the cores hashing can take.
+PASSWORD_HASH_WORKERS = 2
+PASSWORD_HASH_MAX_PENDING = 16
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -153,12 +189,215 @@ CORS_ALLOWED_ORIGINS = [
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploads are stored content-addressed so identical files are kept only once
+STORAGES = {
+    "default": {
+        "BACKEND": "core.storage.ContentAddressedStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# Streaming upload handlers: enforce UPLOAD_LIMITS chunk by chunk and hash
+# the data for ContentAddressedStorage while it streams in
+FILE_UPLOAD_HANDLERS = [
+    "core.uploads.LimitedMemoryFileUploadHandler",
+    "core.uploads.LimitedTemporaryFileUploadHandler",
+]
+
+# Per-field upload limits, keyed by form field name ('default' covers the image fields)
+IMAGE_CONTENT_TYPES = ["image/jpeg", "image/png", "image/webp", "image/gif"]
+IMAGE_EXTENSIONS = [".jpg", ".jpeg", ".png", ".webp", ".gif"]
+
+UPLOAD_LIMITS = {
+    "default": {
+        "max_size": 5 * 1024 * 1024,
+        "content_types": IMAGE_CONTENT_TYPES,
+        "extensions": IMAGE_EXTENSIONS,
+    },
+    # resources/pasco/ past questions
+    "file": {
+        "max_size": 25 * 1024 * 1024,
+        "content_types": ["application/pdf"],
+        "extensions": [".pdf"],
+    },
+    # Student rosters for dasa_users bulk import (CSV or XLSX)
+    "roster": {
+        "max_size": 20 * 1024 * 1024,
+        "content_types": [
+            "text/csv",
+            "application/vnd.ms-excel",
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            "application/octet-stream",
+        ],
+        "extensions": [".csv", ".xlsx"],
+    },
+    # gallery/videos/
+    "video": {
+        "max_size": 200 * 1024 * 1024,
+        "content_types": ["video/mp4", "video/webm", "video/quicktime"],
+        "extensions": [".mp4", ".webm", ".mov"],
+    },
+}
+
+# Browser/proxy cache lifetime for the precompiled constitution document.
+# Clients revalidate with the version ETag after this, so edits still show up.
+CONSTITUTION_CACHE_SECONDS = 60 * 60 * 24
+# Lifetime of the precompiled document in the cache. Edits rebuild it at
+# once in the process that made them; with a per-process cache (LocMemCache)
+# other processes pick them up when their copy expires.
+CONSTITUTION_DOCUMENT_TIMEOUT = 60 * 60
+
+# Caches. "default" also holds the version stamps (core.versioning); with a
+# per-process backend each process only sees its own writes until its
+# versions expire (VERSION_TIMEOUT), so deployments running several
+# processes should use a shared backend for it.
+# "api" holds cached API responses (core.caching); it can be switched to
+#   "django.core.cache.backends.filebased.FileBasedCache" with
+#       "LOCATION": BASE_DIR / "cache" / "api"
+#   "django.core.cache.backends.redis.RedisCache" with
+#       "LOCATION": "redis://127.0.0.1:6379/1"
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "api": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "api-responses",
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    },
+}
+
+# Cached responses live for API_CACHE_TIMEOUT seconds; after
+# API_CACHE_SOFT_TIMEOUT they are still served while a background refresh
+# recomputes them. Writes never wait for either: keys carry model versions.
+API_CACHE_ALIAS = "api"
+API_CACHE_TIMEOUT = 60 * 60
+API_CACHE_SOFT_TIMEOUT = 5 * 60
+
+# Lock used by core.singleflight so only one process recomputes an expired
+# entry. Only meaningful once CACHES["api"] is shared between processes
+# (other processes must be able to read the leader's result): "cache" (a key
+# in that cache, needs an atomic add(), e.g. Redis) or "db" (a row per key,
+# for the file-based cache). With a process-local cache, or "local", requests
+# are coalesced within each process only and nothing is written per miss.
+SINGLE_FLIGHT_LOCK = "local"
+
+# Authenticated users are kept in process memory for AUTH_USER_CACHE_SECONDS
+# (dasa_users.authentication); saving a user or profile invalidates them.
+AUTH_USER_CACHE_SECONDS = 60
+AUTH_USER_CACHE_SIZE = 2048
+
+# Bulk student import (dasa_users.imports): rows validated and inserted per
+# chunk, passwords hashed in the PASSWORD_HASH_WORKERS pool. Rosters longer
+# than BULK_IMPORT_SYNC_LIMIT rows are imported in the background.
+BULK_IMPORT_CHUNK_SIZE = 500
+BULK_IMPORT_SYNC_LIMIT = 100
+
+# Chunked bulk deletion (core.deletion). Models listed here are deleted
+# with raw DELETEs although they have delete signals: their receivers only
+# bump versions, drop search entries, clear auth caches or adjust summary
+# counts, which core.deletion and its pre_bulk_delete/bulk_deleted
+# receivers do per chunk instead.
+BULK_DELETE_CHUNK_SIZE = 100
+BULK_DELETE_SYNC_LIMIT = 200
+BULK_DELETE_RAW_MODELS = [
+    "dasa_users.User",
+    "elections.Candidate",
+    "elections.Vote",
+    "elections.ElectionVoter",
+    "leadership.Executive",
+    "market.Product",
+    "lost_found.LostItem",
+]
+
+# Tokens carry the user's role flags and token version (dasa_users.tokens)
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "dasa_users.tokens.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "dasa_users.tokens.RoleTokenRefreshSerializer",
+}
+
+# Response compression (core.middleware.CompressionMiddleware). Brotli is
+# used when the optional brotli package is installed, gzip otherwise.
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_BROTLI_QUALITY = 5
+
+# Seconds a version stamp lives before it restarts from the clock. Bounds how
+# long a process with a per-process "default" cache keeps answering 304s and
+# cached responses after a write made by another process; None once the
+# "default" cache is shared by every process.
+VERSION_TIMEOUT = 60
+
+# Models with a version stamp bumped on every write (core.versioning), used
+# for ETags and cache keys
+VERSIONED_MODELS = [
+    "announcements.Announcement",
+    "events.Event",
+    "gallery.GalleryItem",
+    "market.Product",
+    "lost_found.LostItem",
+    "opportunities.Opportunity",
+    "leadership.Executive",
+    "resources.AcademicResource",
+    "elections.Election",
+    "elections.Position",
+    "elections.Candidate",
+    "elections.Vote",
+    "welfare.WelfareReport",
+    "dasa_users.User",
+    "dasa_users.Profile",
+]
+
+# Fields no versioned response shows: saves writing only these don't bump
+# the model's version (logins write last_login, and the password when its
+# hash is upgraded), so they don't drop cached executives and dashboards
+VERSION_IGNORED_FIELDS = {
+    "dasa_users.User": ["last_login", "password"],
+}
+
+# Versions shared by several models: a write to any member bumps them too
+VERSION_COLLECTIONS = {
+    "constitution": ["legal.Chapter", "legal.Article"],
+}
+
+# Browser cache lifetime for published election results (private: they are
+# only served to signed-in users). Results are frozen at publish time; URLs pinned to a snapshot version (?v=) are cached
+# for a year instead.
+ELECTION_RESULTS_CACHE_SECONDS = 60 * 60
+
+# Live election streams (elections.stream, served by an ASGI worker). Each
+# process polls the ElectionEvent table every ELECTION_STREAM_POLL_SECONDS
+# while anyone is listening (at once after a vote in the same process) and
+# keeps the last ELECTION_STREAM_REPLAY_EVENTS events per election for
+# clients resuming with Last-Event-ID. A gap in the event ids is waited for
+# ELECTION_STREAM_GAP_SECONDS (a transaction still committing). Clients more
+# than ELECTION_STREAM_QUEUE_SIZE events behind are disconnected. Stream
+# tokens (for EventSource, which can't send the JWT) are valid for
+# ELECTION_STREAM_TOKEN_SECONDS.
+ELECTION_STREAM_POLL_SECONDS = 1
+ELECTION_STREAM_HEARTBEAT_SECONDS = 15
+ELECTION_STREAM_REPLAY_EVENTS = 1000
+ELECTION_STREAM_GAP_SECONDS = 5
+ELECTION_STREAM_QUEUE_SIZE = 1000
+ELECTION_STREAM_TOKEN_SECONDS = 60
+
 # Django REST Framework Settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "dasa_users.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
+    # orjson-backed JSON (falls back to the stdlib when orjson is missing)
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
@@ -0,0 +1,257 @@
+"""
+Single-flight execution: one computation per key at a time.
+
+When a popular cache entry expires (election stats after a vote, the event
+list after a new featured event) every concurrent request would otherwise
+recompute it. ``run_once(key, fn)`` makes sure only one does:
+
+- within a process, concurrent callers for the same key share the result
+  of the first caller (the leader) instead of running ``fn`` themselves;
+- across processes, only if the API cache is shared (Redis, file-based):
+  the leader holds a lock (``SINGLE_FLIGHT_LOCK``: "cache" for a key in
+  that cache, "db" for a row in the database) and other processes poll
+  ``check()`` (usually a cache read of the leader's result) until it
+  returns something, the lock is released or ``wait`` seconds pass.
+
+With a process-local cache (the default LocMemCache) another process could
+never read the leader's result, so a cross-process lock would only add a
+write per miss; the lock is then kept in process (``LocalLock``) whatever
+``SINGLE_FLIGHT_LOCK`` says.
+
+Callers that have an older result can pass ``stale``; followers then return
+it immediately instead of waiting. If the leader fails, is too slow or
+produced nothing reusable, followers compute for themselves: coalescing is
+an optimisation, never a reason to fail a request.
+
+``get_or_compute()`` wraps the common cache-aside case.
+"""
+
+import hashlib
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+LOCK_TIMEOUT = 30
+WAIT = 2.0
+POLL_INTERVAL = 0.05
+
+LOCK_PREFIX = 'singleflight:'
+
+
+def _lock_key(key):
+    # Lock rows/keys are capped at 250 characters
+    if len(key) > 200:
+        key = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    return LOCK_PREFIX + key
+
+
+class LocalLock:
+    """Lock held in this process only."""
+
+    def __init__(self):
+        self._held = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key, timeout):
+        token = uuid.uuid4().hex
+        now = time.monotonic()
+        with self._lock:
+            held = self._held.get(key)
+            if held is not None and held[1] > now:
+                return None
+            self._held[key] = (token, now + timeout)
+        return token
+
+    def release(self, key, token):
+        with self._lock:
+            if self._held.get(key, (None,))[0] == token:
+                del self._held[key]
+
+    def is_held(self, key):
+        with self._lock:
+            held = self._held.get(key)
+            return held is not None and held[1] > time.monotonic()
+
+
+class CacheLock:
+    """Lock held as a cache key; only shared across processes if the cache is."""
+
+    def __init__(self, alias=None):
+        self.alias = alias or getattr(settings, 'API_CACHE_ALIAS', 'default')
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def acquire(self, key, timeout):
+        token = uuid.uuid4().hex
+        return token if self.cache.add(_lock_key(key), token, timeout) else None
+
+    def release(self, key, token):
+        if self.cache.get(_lock_key(key)) == token:
+            self.cache.delete(_lock_key(key))
+
+    def is_held(self, key):
+        return self.cache.get(_lock_key(key)) is not None
+
+
+class DatabaseLock:
+    """Lock held as a SingleFlightLock row; shared by every process using the database."""
+
+    def acquire(self, key, timeout):
+        from .models import SingleFlightLock
+
+        now = timezone.now()
+        lock_key = _lock_key(key)
+        token = uuid.uuid4().hex
+        # Take over locks left behind by a process that died mid-computation
+        SingleFlightLock.objects.filter(key=lock_key, expires_at__lte=now).delete()
+        try:
+            with transaction.atomic():
+                SingleFlightLock.objects.create(
+                    key=lock_key, token=token, expires_at=now + timedelta(seconds=timeout)
+                )
+        except IntegrityError:
+            return None
+        return token
+
+    def release(self, key, token):
+        from .models import SingleFlightLock
+
+        SingleFlightLock.objects.filter(key=_lock_key(key), token=token).delete()
+
+    def is_held(self, key):
+        from .models import SingleFlightLock
+
+        return SingleFlightLock.objects.filter(key=_lock_key(key), expires_at__gt=timezone.now()).exists()
+
+
+_local_lock = LocalLock()
+
+
+def api_cache_is_shared():
+    """False if the API cache lives in each process's memory."""
+    alias = getattr(settings, 'API_CACHE_ALIAS', 'default')
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
+
+
+def get_lock():
+    mode = getattr(settings, 'SINGLE_FLIGHT_LOCK', 'local')
+    if mode == 'local' or not api_cache_is_shared():
+        return _local_lock
+    if mode == 'cache':
+        return CacheLock()
+    return DatabaseLock()
+
+
+class _Flight:
+    __slots__ = ('done', 'result', 'failed')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.failed = False
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def _run_locked(key, fn, check, stale, wait, lock_timeout):
+    """Run ``fn`` under the cross-process lock, or wait for the holder's result."""
+    lock = get_lock()
+    token = lock.acquire(key, lock_timeout)
+    if token is not None:
+        try:
+            return fn()
+        finally:
+            lock.release(key, token)
+
+    if stale is not None:
+        value = stale()
+        if value is not None:
+            return value
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        if check is not None:
+            value = check()
+            if value is not None:
+                return value
+        if not lock.is_held(key):
+            break
+    return fn()
+
+
+def run_once(key, fn, *, check=None, stale=None, wait=WAIT, lock_timeout=LOCK_TIMEOUT):
+    """
+    Return ``fn()``, computed by at most one caller per ``key`` at a time.
+
+    ``check`` returns the leader's result once it is available elsewhere
+    (e.g. in the cache), or None; ``stale`` returns an older value followers
+    may serve instead of waiting, or None. Both are callables so nothing is
+    read unless needed.
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        if stale is not None:
+            value = stale()
+            if value is not None:
+                return value
+        if flight.done.wait(wait) and not flight.failed and flight.result is not None:
+            return flight.result
+        return fn()
+
+    try:
+        flight.result = _run_locked(key, fn, check, stale, wait, lock_timeout)
+        return flight.result
+    except BaseException:
+        flight.failed = True
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
+
+
+def get_or_compute(cache, key, fn, timeout, *, stale_key=None, wait=WAIT):
+    """
+    Cache-aside with single-flight recomputation.
+
+    Returns the cached value for ``key``, or ``fn()`` computed once across
+    concurrent callers and stored for ``timeout`` seconds. With
+    ``stale_key`` the latest value is also kept there (without the version
+    in the key), so while a recomputation runs other callers get that
+    instead of waiting.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    def compute():
+        result = fn()
+        cache.set(key, result, timeout)
+        if stale_key is not None:
+            cache.set(stale_key, result, timeout)
+        return result
+
+    return run_once(
+        key,
+        compute,
+        check=lambda: cache.get(key),
+        stale=(lambda: cache.get(stale_key)) if stale_key is not None else None,
+        wait=wait,
+    )
@@ -0,0 +1,98 @@
+"""
+Content-addressed media storage.
+
+Uploads are stored under ``<upload_to>/<aa>/<sha256><ext>`` instead of their
+original filename. Identical files therefore map to the same name and are
+written to disk only once, instead of piling up as ``l9.jpg``,
+``l9_xkLMzlF.jpg`` and so on.
+
+Note: because several rows can now point at the same file, files must not be
+deleted from storage just because one row referencing them was deleted.
+"""
+
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that names files by the SHA-256 of their content.
+
+    The digest is taken from ``content.sha256`` when the upload handlers in
+    ``core.uploads`` already computed it while streaming. Otherwise the
+    content is streamed to a temporary file in chunks and hashed on the way.
+    """
+
+    incoming_dir = '.incoming'
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is derived from the content in _save(), so there is
+        # no need to probe the filesystem for a free name here.
+        return name
+
+    def hashed_name(self, name, digest):
+        directory, basename = posixpath.split(name)
+        ext = os.path.splitext(basename)[1].lower()
+        return posixpath.join(directory, digest[:2], f"{digest[2:]}{ext}")
+
+    def _save(self, name, content):
+        digest = getattr(content, 'sha256', None)
+
+        if digest:
+            target = self.hashed_name(name, digest)
+            if self.exists(target):
+                return target
+            if hasattr(content, 'temporary_file_path'):
+                self._prepare_directory(target)
+                file_move_safe(content.temporary_file_path(), self.path(target), allow_overwrite=True)
+                return self._finish(target)
+
+        temp_path, digest = self._stream_to_temp(content)
+        target = self.hashed_name(name, digest)
+        if self.exists(target):
+            os.remove(temp_path)
+            return target
+
+        self._prepare_directory(target)
+        # Identical content may have landed in the meantime; replacing it
+        # with the same bytes is harmless.
+        os.replace(temp_path, self.path(target))
+        return self._finish(target)
+
+    def _stream_to_temp(self, content):
+        """Write content to a temporary file chunk by chunk, hashing as we go."""
+        incoming = os.path.join(self.location, self.incoming_dir)
+        os.makedirs(incoming, exist_ok=True)
+
+        hasher = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=incoming)
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    hasher.update(chunk)
+                    temp_file.write(chunk)
+        except Exception:
+            os.remove(temp_path)
+            raise
+        return temp_path, hasher.hexdigest()
+
+    def _prepare_directory(self, name):
+        directory = os.path.dirname(self.path(name))
+        if self.directory_permissions_mode is not None:
+            os.makedirs(directory, self.directory_permissions_mode, exist_ok=True)
+        else:
+            os.makedirs(directory, exist_ok=True)
+
+    def _finish(self, name):
+        if self.file_permissions_mode is not None:
+            os.chmod(self.path(name), self.file_permissions_mode)
+        return name
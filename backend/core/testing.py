@@ -0,0 +1,36 @@
+"""
+Assertions shared by the app test suites.
+"""
+
+import json
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from .projection import compile_serializer
+
+
+class ProjectionParityMixin:
+    """
+    TestCase mixin checking that a ValuesListMixin list endpoint returns
+    exactly what its ModelSerializer would.
+    """
+
+    def assertListMatchesSerializer(self, url, serializer_class, queryset):
+        """
+        GET ``url`` and compare it, and the compiled serializer's own
+        output, with ``serializer_class(queryset, many=True).data``.
+        Returns the response payload.
+        """
+        compiled = compile_serializer(serializer_class)
+        self.assertIsNotNone(compiled, f'{serializer_class.__name__} is not on the values() fast path')
+
+        response = APIClient(HTTP_HOST='localhost').get(url)
+        self.assertEqual(response.status_code, 200)
+        context = {'request': response.wsgi_request}
+        expected = serializer_class(queryset, many=True, context=context).data
+
+        self.assertEqual(compiled.render(queryset.values(*compiled.columns), context), expected)
+        data = response.json()
+        self.assertEqual(data, json.loads(JSONRenderer().render(expected)))
+        return data
@@ -0,0 +1,417 @@
+import datetime
+import decimal
+import gzip
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import HttpResponse, StreamingHttpResponse
+from django.db import connection, transaction
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from PIL import Image
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from announcements.models import Announcement
+from dasa_users.models import User
+from legal.models import Article, Chapter
+from market.models import Product
+from . import middleware, singleflight, versioning
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer
+from .uploads import get_upload_limits
+
+
+class SingleFlightTests(TestCase):
+    """Concurrent recomputations of one key are coalesced."""
+
+    def test_concurrent_callers_share_the_leaders_result(self):
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'result'
+
+        waiting = threading.Semaphore(0)
+
+        def no_stale_value():
+            # Only followers ask for a stale value, before waiting on the leader
+            waiting.release()
+
+        def call():
+            results.append(singleflight.run_once('key', compute, stale=no_stale_value))
+
+        results = []
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=call) for _ in range(3)]
+        for follower in followers:
+            follower.start()
+        for _ in followers:
+            waiting.acquire(timeout=5)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        self.assertEqual(results, ['result'] * 4)
+        self.assertEqual(len(calls), 1)
+
+    @override_settings(SINGLE_FLIGHT_LOCK='db')
+    def test_process_local_cache_takes_no_database_lock(self):
+        # Other processes couldn't read the result from a LocMemCache anyway
+        self.assertIsInstance(singleflight.get_lock(), singleflight.LocalLock)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(singleflight.run_once('key', lambda: 'result'), 'result')
+        self.assertEqual(len(queries), 0)
+
+    @override_settings(
+        SINGLE_FLIGHT_LOCK='db',
+        CACHES={'api': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': 'unused'}},
+    )
+    def test_shared_cache_uses_the_configured_lock(self):
+        self.assertIsInstance(singleflight.get_lock(), singleflight.DatabaseLock)
+
+
+def png_bytes(size=8, noise=False):
+    if noise:
+        image = Image.frombytes('RGB', (size, size), os.urandom(size * size * 3))
+    else:
+        image = Image.new('RGB', (size, size), 'teal')
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class UploadTests(TestCase):
+    """Uploads are checked against their field's limits and stored by content."""
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        media_override = override_settings(MEDIA_ROOT=media)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        self.media = media
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(User.objects.create_user(username='seller'))
+
+    def post_product(self, content, name='calculator.png', content_type='image/png'):
+        return self.client.post('/api/market/products/', {
+            'title': 'Calculator', 'price': '50.00', 'category': 'Electronics',
+            'condition': 'Used - Good', 'description': 'Barely used', 'whatsapp_number': '0200000000',
+            'image': SimpleUploadedFile(name, content, content_type=content_type),
+        }, format='multipart')
+
+    def stored_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.media)
+            for root, _, names in os.walk(self.media) for name in names
+        )
+
+    def test_limits_are_per_field(self):
+        self.assertEqual(get_upload_limits('profile.profile_picture')['extensions'], ['.jpg', '.jpeg', '.png', '.webp', '.gif'])
+        self.assertEqual(get_upload_limits('file')['content_types'], ['application/pdf'])
+
+        response = self.post_product(b'%PDF-1.4', name='calculator.pdf', content_type='application/pdf')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("'image' does not accept files of type application/pdf", response.json()['detail'])
+
+        response = self.post_product(png_bytes(), name='calculator.exe')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("'image' only accepts", response.json()['detail'])
+
+    @override_settings(UPLOAD_LIMITS={
+        'default': {'max_size': 1024 * 1024},
+        'image': {'max_size': 4096, 'content_types': ['image/png'], 'extensions': ['.png']},
+    })
+    def test_oversized_uploads_are_rejected_while_streaming(self):
+        content = png_bytes(64, noise=True)
+        self.assertGreater(len(content), 4096)
+
+        for max_memory in (1024 * 1024, 1024):  # in memory, then via a temporary file
+            with self.subTest(max_memory=max_memory), override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=max_memory):
+                response = self.post_product(content)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("'image' exceeds the maximum upload size", response.json()['detail'])
+
+        self.assertFalse(Product.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_files_are_named_by_content(self):
+        content = png_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+
+        response = self.post_product(content, name='My Calculator.PNG')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Product.objects.get().image.name, f'market/{digest[:2]}/{digest[2:]}.png')
+        self.assertEqual(self.stored_files(), [os.path.join('market', digest[:2], f'{digest[2:]}.png')])
+
+    def test_identical_uploads_share_one_file(self):
+        content = png_bytes()
+        self.assertEqual(self.post_product(content, name='first.png').status_code, 201)
+        with override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=16):  # streamed to a temporary file instead
+            self.assertEqual(self.post_product(content, name='second.png').status_code, 201)
+        # Saved without the digest from the upload handlers: hashed while copying
+        direct = default_storage.save('market/third.png', ContentFile(content))
+
+        names = set(Product.objects.values_list('image', flat=True))
+        self.assertEqual(names, {direct})
+        self.assertEqual(len([name for name in self.stored_files() if not name.startswith('.incoming')]), 1)
+
+
+class FastJSONTests(TestCase):
+    """The orjson renderer and parser produce exactly what DRF's JSON classes do."""
+
+    def test_output_matches_drf(self):
+        moment = datetime.datetime(2026, 3, 1, 9, 30, 15, 123456, tzinfo=datetime.timezone.utc)
+        data = {
+            'utc': moment,
+            'offset': moment.astimezone(datetime.timezone(datetime.timedelta(hours=-5))),
+            'local': timezone.localtime(moment),
+            'naive': moment.replace(tzinfo=None),
+            'whole_seconds': moment.replace(microsecond=0),
+            'date': moment.date(),
+            'time': moment.time(),
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'price': decimal.Decimal('12.50'),
+            'label': gettext_lazy('Lost & Found'),
+            'duration': datetime.timedelta(minutes=90),
+            'text': 'Akwaaba \u2014 caf\u00e9 \u2028 \u2029 <b>',
+            'nested': [{1: True, 2: None}, 1.5, -7, 2 ** 40, ''],
+        }
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertIn(b'"utc":"2026-03-01T09:30:15.123456Z"', FastJSONRenderer().render(data))
+
+    def test_indented_and_empty_output_fall_back(self):
+        data = {'when': datetime.date(2026, 3, 1), 'items': [1, 2]}
+        context = {'indent': 4}
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json', context),
+            JSONRenderer().render(data, 'application/json', context),
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_parser_matches_drf(self):
+        body = '{"title": "caf\u00e9", "price": 12.5, "tags": [1, null, true]}'.encode()
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)), {'title': 'caf\u00e9', 'price': 12.5, 'tags': [1, None, True]}
+        )
+        for invalid in [b'{"title": ', b'{"price": NaN}']:
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(invalid))
+
+
+class CompressionTests(TestCase):
+    """Responses are compressed per Accept-Encoding, and conditional GETs survive it."""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.factory = RequestFactory()
+        self.body = b'{"results":[' + b','.join(b'{"id":%d,"title":"Calculator"}' % i for i in range(100)) + b']}'
+
+    def process(self, response, accept_encoding='gzip'):
+        request = self.factory.get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return middleware.CompressionMiddleware(lambda request: response)(request)
+
+    def test_encoding_negotiation(self):
+        preferred = middleware.available_encodings()[0]
+        self.assertEqual(middleware.choose_encoding('gzip, deflate, br'), preferred)
+        self.assertEqual(middleware.choose_encoding('br;q=0.5, gzip'), 'gzip')
+        self.assertEqual(middleware.choose_encoding('br;q=0, gzip;q=0.1'), 'gzip')
+        self.assertEqual(middleware.choose_encoding('*'), preferred)
+        self.assertIsNone(middleware.choose_encoding('gzip;q=0, identity'))
+        self.assertIsNone(middleware.choose_encoding(''))
+
+    def test_compresses_and_weakens_the_etag(self):
+        response = HttpResponse(self.body, content_type='application/json')
+        response['ETag'] = '"abc"'
+
+        response = self.process(response)
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.body)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['ETag'], 'W/"abc"')
+
+        if middleware.brotli is not None:
+            response = self.process(HttpResponse(self.body, content_type='application/json'), 'gzip, br')
+            self.assertEqual(response['Content-Encoding'], 'br')
+            self.assertEqual(middleware.brotli.decompress(response.content), self.body)
+
+    def test_small_and_binary_responses_are_left_alone(self):
+        with override_settings(COMPRESSION_MIN_SIZE=len(self.body) + 1):
+            response = self.process(HttpResponse(self.body, content_type='application/json'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertFalse(response.has_header('Vary'))
+
+        response = self.process(HttpResponse(self.body, content_type='image/png'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        # Compressible, but not for this client: caches must still vary on it
+        response = self.process(HttpResponse(self.body, content_type='application/json'), 'identity')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response.content, self.body)
+
+    def test_streaming_responses(self):
+        chunks = [self.body[i:i + 500] for i in range(0, len(self.body), 500)]
+        response = StreamingHttpResponse(iter(chunks), content_type='text/csv')
+        response['Content-Length'] = str(len(self.body))
+
+        response = self.process(response)
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), self.body)
+
+    def test_conditional_get_through_compression(self):
+        seller = User.objects.create_user(username='seller')
+        with self.captureOnCommitCallbacks(execute=True):
+            products = [
+                Product.objects.create(
+                    seller=seller, title=f'Calculator {number}', price='50.00', category='Electronics',
+                    condition='Used - Good', image='market/p.jpg', description='Casio fx-991 ' * 10,
+                    whatsapp_number='0200000000',
+                )
+                for number in range(5)
+            ]
+
+        plain = self.client.get('/api/market/products/')
+        compressed = self.client.get('/api/market/products/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(plain['ETag'].startswith('W/'))
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(compressed['ETag'], 'W/' + plain['ETag'])
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+
+        # Either form of the ETag revalidates, without touching the database
+        for etag in [plain['ETag'], compressed['ETag']]:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(
+                    '/api/market/products/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag
+                )
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b'')
+            self.assertEqual(response['ETag'], plain['ETag'])
+            self.assertEqual(len(queries), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            products[0].title = 'Graphing calculator'
+            products[0].save()
+        response = self.client.get('/api/market/products/', HTTP_IF_NONE_MATCH=compressed['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], plain['ETag'])
+
+
+class VersioningTests(TestCase):
+    """Versions move once per committed transaction, and keys and ETags follow them."""
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.announcement = Announcement.objects.create(title='Welcome', message='Akwaaba')
+
+    def version(self, target=Announcement):
+        return versioning.get_version(target)
+
+    def test_writes_bump_once_per_commit(self):
+        before = self.version()
+        with self.captureOnCommitCallbacks(execute=False):
+            self.announcement.title = 'Welcome back'
+            self.announcement.save()
+        self.assertEqual(self.version(), before)  # not committed yet
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for number in range(3):
+                Announcement.objects.create(title=f'Notice {number}', message='Text')
+            self.announcement.delete()
+        self.assertEqual(self.version(), before + 1)
+
+    def test_collections_move_with_their_members(self):
+        constitution, article = self.version('constitution'), self.version(Article)
+        with self.captureOnCommitCallbacks(execute=True):
+            chapter = Chapter.objects.create(number=1, title='Name')
+            Article.objects.create(chapter=chapter, article_number='1', title='Name', content='DASA')
+        self.assertEqual(self.version('constitution'), constitution + 1)
+        self.assertEqual(self.version(Article), article + 1)
+
+    def test_rolled_back_writes_keep_the_version(self):
+        before = self.version()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    Announcement.objects.create(title='Draft', message='Text')
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.version(), before)
+
+    def test_ignored_fields_bump_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create_user(username='student', password='secret-pass')
+        before = self.version(User)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.set_password('another-pass')
+            user.save(update_fields=['password'])
+        self.assertEqual(self.version(User), before)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.first_name = 'Ama'
+            user.save(update_fields=['first_name'])
+        self.assertEqual(self.version(User), before + 1)
+
+    def test_keys_and_etags_follow_saves_and_deletes(self):
+        key = versioning.cache_key('announcements', [Announcement], '/api/announcements/', 1)
+        etag = versioning.make_etag('announcements', [Announcement], '/api/announcements/', 1)
+        self.assertEqual(key, versioning.cache_key('announcements', [Announcement], '/api/announcements/', 1))
+        self.assertNotEqual(key, versioning.cache_key('announcements', [Announcement], '/api/announcements/', 2))
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.announcement.title = 'Welcome back'
+            self.announcement.save()
+        saved_key = versioning.cache_key('announcements', [Announcement], '/api/announcements/', 1)
+        saved_etag = versioning.make_etag('announcements', [Announcement], '/api/announcements/', 1)
+        self.assertNotEqual(saved_key, key)
+        self.assertNotEqual(saved_etag, etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.announcement.delete()
+        self.assertNotIn(
+            versioning.make_etag('announcements', [Announcement], '/api/announcements/', 1), [etag, saved_etag]
+        )
+
+    def test_evicted_versions_restart_from_the_clock(self):
+        versioning.bump_version('core.tests')
+        versioning.cache.delete(versioning._key('core.tests'))
+        self.assertGreaterEqual(versioning.get_version('core.tests'), int(time.time()) * 10 ** 6)
+
+    def test_versions_expire(self):
+        # As in a process whose cache never saw another process's bump
+        with override_settings(VERSION_TIMEOUT=0.05):
+            versioning.cache.delete(versioning._key('core.tests.expiry'))
+            first = versioning.get_version('core.tests.expiry')
+            etag = versioning.make_etag('expiry', ['core.tests.expiry'])
+            versioning.bump_version('core.tests.expiry')
+            time.sleep(0.1)
+
+            self.assertGreater(versioning.get_version('core.tests.expiry'), first + 1)
+            self.assertNotEqual(versioning.make_etag('expiry', ['core.tests.expiry']), etag)
@@ -0,0 +1,112 @@
+"""
+Streaming upload handlers with per-field size/type limits.
+
+Django's default handlers buffer the whole file (in memory or in a temporary
+file) before any validation runs. These handlers enforce the limits from
+``settings.UPLOAD_LIMITS`` while the body is still streaming in, so an
+oversized or disallowed file is rejected after the first offending chunk.
+
+Every chunk is also fed into a SHA-256 digest. The finished digest is
+attached to the uploaded file as ``sha256`` so that
+``core.storage.ContentAddressedStorage`` can name (and deduplicate) the
+file without reading it a second time.
+"""
+
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+from django.http.multipartparser import MultiPartParserError
+
+
+class UploadRejected(MultiPartParserError):
+    """
+    Raised when an upload breaks its field's limits.
+
+    Subclasses MultiPartParserError so DRF turns it into a 400 ParseError
+    and plain Django views (e.g. the admin) answer with a 400 as well.
+    """
+
+
+def get_upload_limits(field_name):
+    """
+    Return the limits for a form field.
+
+    Field names such as ``profile.profile_picture`` (sent by the profile
+    FormData) are matched on their last component.
+    """
+    limits = getattr(settings, 'UPLOAD_LIMITS', {})
+    key = (field_name or '').rsplit('.', 1)[-1]
+    return limits.get(key, limits.get('default', {}))
+
+
+class UploadLimitMixin:
+    """
+    Shared limit checking and hashing for the concrete upload handlers below.
+    """
+
+    def new_file(self, field_name, file_name, content_type, content_length, *args, **kwargs):
+        # Checks run before super() because the memory handler raises
+        # StopFutureHandlers from its own new_file().
+        self.limits = get_upload_limits(field_name)
+        self.received = 0
+        self.digest = hashlib.sha256()
+        self._check_type(field_name, file_name, content_type)
+        if content_length:
+            self._check_size(field_name, content_length)
+        super().new_file(field_name, file_name, content_type, content_length, *args, **kwargs)
+
+    def is_consuming(self):
+        """Whether this handler is the one storing the file data."""
+        return True
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.is_consuming():
+            self.received += len(raw_data)
+            self._check_size(self.field_name, self.received)
+            self.digest.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file_obj = super().file_complete(file_size)
+        if file_obj is not None:
+            file_obj.sha256 = self.digest.hexdigest()
+        return file_obj
+
+    def _check_type(self, field_name, file_name, content_type):
+        content_types = self.limits.get('content_types')
+        if content_types and content_type not in content_types:
+            raise UploadRejected(
+                f"'{field_name}' does not accept files of type {content_type}."
+            )
+
+        extensions = self.limits.get('extensions')
+        ext = os.path.splitext(file_name or '')[1].lower()
+        if extensions and ext not in extensions:
+            raise UploadRejected(
+                f"'{field_name}' only accepts {', '.join(extensions)} files."
+            )
+
+    def _check_size(self, field_name, size):
+        max_size = self.limits.get('max_size')
+        if max_size and size > max_size:
+            raise UploadRejected(
+                f"'{field_name}' exceeds the maximum upload size of {max_size // (1024 * 1024)} MB."
+            )
+
+
+class LimitedMemoryFileUploadHandler(UploadLimitMixin, MemoryFileUploadHandler):
+    """In-memory handler for small uploads, with limits and hashing."""
+
+    def is_consuming(self):
+        # When not activated, chunks pass through to the temporary handler
+        # which does the checking instead.
+        return self.activated
+
+
+class LimitedTemporaryFileUploadHandler(UploadLimitMixin, TemporaryFileUploadHandler):
+    """Temporary-file handler for large uploads, with limits and hashing."""
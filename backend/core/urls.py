@@ -52,6 +52,7 @@ urlpatterns = [
     path("api/lost-found/", include("lost_found.urls")),
     path("api/career/", include("opportunities.urls")),
     path("api/opportunities/", include("opportunities.urls")),
+    path("api/search/", include("search.urls")),
 ]
 
 # Serve media files in development
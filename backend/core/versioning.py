@@ -0,0 +1,215 @@
+"""
+Version stamps for models and collections.
+
+A version is an integer kept in the cache that only ever moves forward.
+Comparing versions is a cache read, so code can tell whether anything
+changed without querying or hashing a response body: ETags
+(``ConditionalGetMixin``), cache keys and in-process caches such as the
+course-code trie are all built on it.
+
+Targets are either model classes, named by their ``app_label.model`` label,
+or plain names:
+
+- every model in ``settings.VERSIONED_MODELS`` is bumped, after commit,
+  from post_save/post_delete;
+- ``settings.VERSION_COLLECTIONS`` maps a collection name to member models
+  (``'constitution'`` -> Chapter and Article); a member change bumps the
+  collection as well;
+- ``settings.VERSION_IGNORED_FIELDS`` lists fields no versioned response
+  shows; a save writing only those (a login's ``last_login``) bumps nothing;
+- other names are free-standing and bumped explicitly (the course-code
+  version only moves when a code changes, not on every download).
+
+``QuerySet.update()`` / ``bulk_create()`` send no signals, so call sites
+doing bulk writes call ``bump_on_commit(Model)`` themselves, as they do for
+the search index.
+
+Bumps requested within a transaction are coalesced: each target (and each
+collection) moves once when it commits, however many rows it wrote. Every
+bump sends ``version_changed`` (sender is the target name), for work that
+should follow a new version, like rebuilding the constitution document.
+
+Versions are seeded from the clock (in microseconds), so a restarted,
+evicted or expired key never hands out a version that clients may still
+hold in an ETag.
+
+Version keys live for ``settings.VERSION_TIMEOUT`` seconds from their seed
+(bumps don't extend it). With a per-process cache (LocMemCache) a process
+never sees the bumps made by the others, so its versions expire and restart
+from the clock: a process that missed a write stops answering 304s and
+serving cached responses for it within that time. With a cache shared by
+every process the timeout can be None.
+"""
+
+import hashlib
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal
+
+VERSION_KEY = 'core:version:{name}'
+DEFAULT_TIMEOUT = 60
+
+# Sent after a bump with sender=<target name> and version=<new version>
+version_changed = Signal()
+
+# model label -> collection names it belongs to
+_collections = {}
+# model label -> fields whose saves alone don't bump it
+_ignored_fields = {}
+
+
+def target_name(target):
+    """'announcements.announcement' for a model, the name itself for a string."""
+    if isinstance(target, str):
+        return target
+    return target._meta.label_lower
+
+
+def _key(name):
+    return VERSION_KEY.format(name=name)
+
+
+def _timeout():
+    return getattr(settings, 'VERSION_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def get_versions(targets):
+    """Return the current versions of ``targets`` in order, initialising any unset."""
+    keys = [_key(target_name(target)) for target in targets]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        seed = time.time_ns() // 1000
+        timeout = _timeout()
+        for key in missing:
+            cache.add(key, seed, timeout=timeout)
+        found.update(cache.get_many(missing))
+    return [found[key] for key in keys]
+
+
+def get_version(target):
+    return get_versions([target])[0]
+
+
+def _incr(name):
+    key = _key(name)
+    try:
+        version = cache.incr(key)
+    except ValueError:
+        get_version(name)
+        version = cache.incr(key)
+    version_changed.send(sender=name, version=version)
+    return version
+
+
+def _bump(names):
+    """Bump ``names`` and, once each, the collections they belong to; return the new versions."""
+    versions = {name: _incr(name) for name in names}
+    for name in names:
+        for collection in _collections.get(name, ()):
+            if collection not in versions:
+                versions[collection] = _incr(collection)
+    return versions
+
+
+def bump_version(target):
+    """Move ``target`` (and any collection it belongs to) to a new version."""
+    name = target_name(target)
+    return _bump([name])[name]
+
+
+class _Batch:
+    """Targets bumped by one transaction's commit."""
+
+    def __init__(self):
+        self.names = {}
+        self.done = False
+
+
+class _BumpCallback:
+    """An on_commit callback; the first of a batch to run bumps it all."""
+
+    def __init__(self, batch):
+        self.batch = batch
+
+    def __call__(self):
+        if not self.batch.done:
+            self.batch.done = True
+            _bump(list(self.batch.names))
+
+
+def bump_on_commit(*targets):
+    """
+    Bump ``targets`` once the current transaction commits (now, outside one).
+
+    Within a transaction the targets are collected into one batch, so a
+    target (and its collections) moves once per commit however many rows
+    were written. Targets added inside a savepoint that is rolled back are
+    still bumped with the rest; that only costs a cache miss.
+    """
+    connection = transaction.get_connection()
+    batch = None
+    if connection.in_atomic_block:
+        batch = next((
+            func.batch for _, func, _ in reversed(connection.run_on_commit)
+            if isinstance(func, _BumpCallback) and not func.batch.done
+        ), None)
+    batch = batch or _Batch()
+    batch.names.update(dict.fromkeys(target_name(target) for target in targets))
+    transaction.on_commit(_BumpCallback(batch))
+
+
+def version_stamp(targets):
+    """The versions of ``targets`` joined into one string."""
+    return '.'.join(str(version) for version in get_versions(targets))
+
+
+def _digest(parts):
+    variant = '|'.join(str(part) for part in parts)
+    return hashlib.blake2b(variant.encode(), digest_size=8).hexdigest()
+
+
+def cache_key(prefix, targets, *parts):
+    """
+    A cache key that changes whenever any of ``targets`` does.
+
+    ``parts`` identify the variant (path, query string, user...) and are
+    hashed, so the key stays short whatever they contain.
+    """
+    return f'{prefix}:{version_stamp(targets)}:{_digest(parts)}'
+
+
+def make_etag(prefix, targets, *parts):
+    """A strong ETag that changes whenever any of ``targets`` does."""
+    return f'"{prefix}-{version_stamp(targets)}-{_digest(parts)}"'
+
+
+def _bump_on_save_or_delete(sender, update_fields=None, **kwargs):
+    ignored = _ignored_fields.get(sender._meta.label_lower)
+    if ignored and update_fields and set(update_fields) <= ignored:
+        return
+    bump_on_commit(sender)
+
+
+def connect_signals():
+    """Wire VERSIONED_MODELS and VERSION_COLLECTIONS members to post_save/post_delete."""
+    _collections.clear()
+    _ignored_fields.clear()
+    for label, fields in getattr(settings, 'VERSION_IGNORED_FIELDS', {}).items():
+        _ignored_fields[label.lower()] = frozenset(fields)
+    labels = list(getattr(settings, 'VERSIONED_MODELS', []))
+    for collection, members in getattr(settings, 'VERSION_COLLECTIONS', {}).items():
+        for label in members:
+            _collections.setdefault(label.lower(), []).append(collection)
+            labels.append(label)
+
+    for label in dict.fromkeys(labels):
+        model = apps.get_model(label)
+        uid = f'core.versioning:{model._meta.label_lower}'
+        post_save.connect(_bump_on_save_or_delete, sender=model, dispatch_uid=uid)
+        post_delete.connect(_bump_on_save_or_delete, sender=model, dispatch_uid=uid)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Profile, SystemConfig
+from .models import User, Profile, SystemConfig, GraduationRollover, StudentImport
 
 
 @admin.register(User)
@@ -24,6 +24,28 @@ class ProfileAdmin(admin.ModelAdmin):
     readonly_fields = ['user']
 
 
+@admin.register(GraduationRollover)
+class GraduationRolloverAdmin(admin.ModelAdmin):
+    """Read-only history of graduation rollovers (started via the API or graduate_year_group)"""
+    list_display = ['year_group', 'status', 'expected', 'graduated', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'year_group']
+    readonly_fields = [field.name for field in GraduationRollover._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(StudentImport)
+class StudentImportAdmin(admin.ModelAdmin):
+    """Read-only history of background roster imports (started via the API)"""
+    list_display = ['filename', 'status', 'rows', 'created', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['status']
+    readonly_fields = [field.name for field in StudentImport._meta.fields if field.name != 'roster']
+
+    def has_add_permission(self, request):
+        return False
+
+
 @admin.register(SystemConfig)
 class SystemConfigAdmin(admin.ModelAdmin):
     """Admin interface for SystemConfig singleton model"""
@@ -0,0 +1,189 @@
+"""
+JWT authentication with a per-process user cache.
+
+simplejwt's JWTAuthentication loads the User row on every request, and
+the profile is another query as soon as the user is serialized.
+``CachedJWTAuthentication`` keeps recently seen users (with their profile)
+in process memory for ``AUTH_USER_CACHE_SECONDS``, so repeated requests from
+the same user normally cost no queries at all.
+
+Entries are tied to the user's version in ``core.versioning``
+(``auth:user:<id>``), which ``dasa_users.signals`` bumps whenever the user
+or their profile is saved or deleted. That covers password changes,
+deactivation and staff changes: the next request sees the new version and
+reloads the row. With a cache backend that isn't shared between processes
+a change can take up to the TTL to reach other processes.
+
+Tokens carrying role claims (``dasa_users.tokens``) skip even that until a
+view needs more than the claims: after the token version check,
+``request.user`` is a ``ClaimsUser`` answering ``pk``, ``is_authenticated``,
+truth tests (DRF permissions check ``request.user and ...``), the username
+and the role flags from the token, and loading the user on first access to
+anything else.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from core import versioning
+from .tokens import TOKEN_VERSION_CLAIM, TOKEN_VERSION_KEY, USERNAME_CLAIM, get_token_version
+
+DEFAULT_TTL = 60
+DEFAULT_SIZE = 2048
+
+
+def user_version_name(user_id):
+    return f'auth:user:{user_id}'
+
+
+def invalidate_user(user_id):
+    """Drop every process's cached copy of a user (after commit)."""
+    versioning.bump_on_commit(user_version_name(user_id))
+
+
+def invalidate_users(user_ids):
+    """
+    Drop cached copies and token versions of many users (after commit).
+
+    For changes made with ``QuerySet.update()``, which sends no signals.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    versioning.bump_on_commit(*(user_version_name(user_id) for user_id in user_ids))
+    keys = [TOKEN_VERSION_KEY.format(user_id=user_id) for user_id in user_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class _UserCache:
+    """Small thread-safe LRU of user_id -> (version, expires, user)."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, version):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            cached_version, expires, user = entry
+            if cached_version != version or expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        # Views may modify request.user; never hand out the shared instance
+        return copy.deepcopy(user)
+
+    def set(self, user_id, version, user):
+        ttl = getattr(settings, 'AUTH_USER_CACHE_SECONDS', DEFAULT_TTL)
+        size = getattr(settings, 'AUTH_USER_CACHE_SIZE', DEFAULT_SIZE)
+        with self._lock:
+            self._entries[user_id] = (version, time.monotonic() + ttl, copy.deepcopy(user))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = _UserCache()
+
+
+def _claim_property(name):
+    return property(lambda self: self.__dict__['_token'][name])
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    ``request.user`` for a token with current role claims.
+
+    Role flags, the id and the username come from the token; any other
+    attribute loads the user (usually from the user cache).
+    """
+    is_authenticated = True
+    is_anonymous = False
+
+    is_active = _claim_property('is_active')
+    is_staff = _claim_property('is_staff')
+    is_superuser = _claim_property('is_superuser')
+    is_student = _claim_property('is_student')
+    is_alumni = _claim_property('is_alumni')
+
+    def __init__(self, token, load):
+        super().__init__(load)
+        self.__dict__['_token'] = token
+
+    @property
+    def pk(self):
+        # Claims hold the id as a string
+        user_id = self.__dict__['_token'][api_settings.USER_ID_CLAIM]
+        return get_user_model()._meta.pk.to_python(user_id)
+
+    id = pk
+
+    @property
+    def username(self):
+        token = self.__dict__['_token']
+        if USERNAME_CLAIM in token:
+            return token[USERNAME_CLAIM]
+        # Tokens issued before the claim existed
+        return super().__getattr__('username')
+
+    def __bool__(self):
+        # SimpleLazyObject would load the user to answer this
+        return True
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication resolving users through the per-process user cache."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        if TOKEN_VERSION_CLAIM in validated_token:
+            # Deactivation bumps the version too, so this covers is_active
+            if validated_token[TOKEN_VERSION_CLAIM] != get_token_version(user_id):
+                raise AuthenticationFailed(_("Token is no longer valid"), code="token_outdated")
+            return ClaimsUser(validated_token, lambda: self.load_user(validated_token, user_id))
+        return self.load_user(validated_token, user_id)
+
+    def load_user(self, validated_token, user_id):
+        version = versioning.get_version(user_version_name(user_id))
+        user = user_cache.get(user_id, version)
+        if user is None:
+            try:
+                user = self.user_model.objects.select_related('profile').get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            user_cache.set(user_id, version, user)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            from rest_framework_simplejwt.utils import get_md5_hash_password
+
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
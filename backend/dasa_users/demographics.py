@@ -0,0 +1,185 @@
+"""
+Membership breakdowns kept in a summary table.
+
+Admin analytics want member counts per hall, college, year group, gender
+and student/alumni status. Computing those on request means GROUP BYs over
+every user joined to their profile; instead each (dimension, value) pair has
+a DemographicCount row, and reading the breakdowns is one query over a few
+dozen rows whatever the membership size.
+
+The counts are maintained incrementally:
+
+- ``dasa_users.signals`` applies ``count_saved`` / ``count_deleted`` on
+  User and Profile saves and deletions. Each model snapshots its counted
+  fields when loaded (``snapshot``, called from ``from_db``), so a save only
+  moves a count when a counted value actually changed;
+- set-based writes that send no signals adjust the counts themselves
+  (``count_created`` after ``bulk_create``, ``apply`` for rollovers) and
+  chunked user deletion decrements them from ``pre_bulk_delete``.
+
+Every user counts once per dimension, in the "unknown" bucket while the
+value isn't set. Anything that slips past the signals (a raw SQL fix, a
+``QuerySet.update()`` elsewhere) is corrected by ``rebuild``, run
+periodically by the ``rebuild_demographics`` management command.
+"""
+
+from collections import Counter
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count
+
+from core import counters
+
+UNKNOWN = 'unknown'
+
+
+def user_status(is_student, is_alumni):
+    if is_alumni:
+        return 'alumni'
+    return 'student' if is_student else 'other'
+
+
+def _label(value):
+    return UNKNOWN if value in (None, '') else str(value)
+
+
+# Per model label: dimension -> (fields it is computed from, value function)
+DIMENSIONS = {
+    'dasa_users.User': {
+        'status': (('is_student', 'is_alumni'), user_status),
+    },
+    'dasa_users.Profile': {
+        'hall': (('hall_of_residence',), _label),
+        'college': (('college',), _label),
+        'year_group': (('year_group',), _label),
+        'gender': (('gender',), _label),
+    },
+}
+
+
+def _dimensions(model):
+    return DIMENSIONS[model._meta.label]
+
+
+def counted_fields(model):
+    """The fields ``model``'s dimensions are computed from."""
+    return [field for fields, _ in _dimensions(model).values() for field in fields]
+
+
+def snapshot(instance):
+    """The counted field values of ``instance``, or None if any is deferred."""
+    try:
+        return {field: instance.__dict__[field] for field in counted_fields(type(instance))}
+    except KeyError:
+        return None
+
+
+def buckets(model, values):
+    """``(dimension, value)`` pairs for a row with counted field ``values``."""
+    return [
+        (dimension, label(*(values[field] for field in fields)))
+        for dimension, (fields, label) in _dimensions(model).items()
+    ]
+
+
+def apply(deltas):
+    """Add ``deltas`` (a Counter of ``(dimension, value)``) to the counts."""
+    from .models import DemographicCount
+
+    counters.add_counts(DemographicCount, deltas)
+
+
+def _stored_values(instance):
+    model = type(instance)
+    return model._base_manager.filter(pk=instance.pk).values(*counted_fields(model)).first()
+
+
+def load_snapshot(instance):
+    """
+    Make sure a saved ``instance`` knows its counted values before saving.
+
+    Instances loaded with some counted field deferred read them from the
+    database instead.
+    """
+    if instance.pk is not None and getattr(instance, '_loaded_demographics', None) is None:
+        instance._loaded_demographics = _stored_values(instance)
+
+
+def count_saved(instance, created, update_fields=None):
+    """Move ``instance`` between buckets after a save."""
+    model = type(instance)
+    old = None if created else getattr(instance, '_loaded_demographics', None)
+    if not created and old is None:
+        return
+    new = {}
+    for field in counted_fields(model):
+        if old is not None and (field not in instance.__dict__ or (update_fields and field not in update_fields)):
+            new[field] = old[field]
+        else:
+            new[field] = getattr(instance, field)
+
+    deltas = Counter(buckets(model, new))
+    if old is not None:
+        deltas.subtract(buckets(model, old))
+    apply(deltas)
+    instance._loaded_demographics = new
+
+
+def count_deleted(instance):
+    """Take a deleted ``instance`` out of its buckets."""
+    model = type(instance)
+    values = getattr(instance, '_loaded_demographics', None) or snapshot(instance)
+    if values is not None:
+        apply(Counter({bucket: -1 for bucket in buckets(model, values)}))
+
+
+def count_created(instances):
+    """Count rows inserted with ``bulk_create`` (which sends no signals)."""
+    deltas = Counter()
+    for instance in instances:
+        deltas.update(buckets(type(instance), snapshot(instance)))
+        instance._loaded_demographics = snapshot(instance)
+    apply(deltas)
+
+
+def count_rows(queryset, sign=1):
+    """Counter of the buckets of ``queryset``'s rows, computed in the database."""
+    model = queryset.model
+    fields = counted_fields(model)
+    deltas = Counter()
+    for row in queryset.order_by().values(*fields).annotate(rows=Count('pk')):
+        deltas.update({bucket: sign * row['rows'] for bucket in buckets(model, row)})
+    return deltas
+
+
+def rebuild(registry=apps):
+    """
+    Recount everything from User and Profile; returns the number of buckets.
+
+    ``registry`` is the app registry to take the models from (migrations
+    pass their historical one).
+    """
+    DemographicCount = registry.get_model('dasa_users', 'DemographicCount')
+
+    with transaction.atomic():
+        counts = Counter()
+        for label in DIMENSIONS:
+            counts.update(count_rows(registry.get_model(label)._base_manager.all()))
+        DemographicCount.objects.all().delete()
+        DemographicCount.objects.bulk_create([
+            DemographicCount(dimension=dimension, value=value, count=count)
+            for (dimension, value), count in sorted(counts.items())
+        ])
+    return len(counts)
+
+
+def breakdowns():
+    """``{dimension: {value: count}}`` for every dimension, zero counts left out."""
+    from .models import DemographicCount
+
+    result = {dimension: {} for dimensions in DIMENSIONS.values() for dimension in dimensions}
+    rows = DemographicCount.objects.filter(count__gt=0).order_by('dimension', 'value')
+    for dimension, value, count in rows.values_list('dimension', 'value', 'count'):
+        result.setdefault(dimension, {})[value] = count
+    return result
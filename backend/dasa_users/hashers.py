@@ -0,0 +1,178 @@
+"""
+Password hashing: tuned hashers and an off-thread hashing pool.
+
+Hashers
+    ``PASSWORD_HASHER_PROFILE`` (settings) picks the hasher for new
+    passwords; the other profiles stay in ``PASSWORD_HASHERS`` so existing
+    hashes keep verifying. Django rehashes a password with the preferred
+    hasher (and current parameters) on the next successful
+    ``check_password``, so old PBKDF2 hashes are upgraded as users log in.
+    The tuned hashers below take their cost parameters from
+    ``PASSWORD_HASHER_PARAMS``.
+
+Pool
+    Hashing is CPU-bound by design. ``make_password`` and ``check_password``
+    run it in a small process pool (``PASSWORD_HASH_WORKERS`` processes, at
+    most ``PASSWORD_HASH_MAX_PENDING`` hashes queued per server process), so
+    a burst of registrations or logins queues up there instead of taking
+    every core the web workers have. With ``PASSWORD_HASH_WORKERS = 0``
+    hashing runs in the calling thread.
+
+    The pool caps CPU, not latency: ``set_password`` and ``check_password``
+    still block the calling (request) thread until their hash is done, so
+    a registration or login takes as long as before plus any queueing, and
+    the request threads must outnumber the hashes one can wait for. Each
+    server process also starts its own pool on first use, so a deployment
+    hashes with up to ``PASSWORD_HASH_WORKERS`` processes per web worker;
+    size it per process, not per machine.
+
+Workers are spawned and configure Django themselves, so they use the
+hasher settings as they were when the pool started.
+"""
+
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+
+
+def _params(algorithm):
+    return getattr(settings, 'PASSWORD_HASHER_PARAMS', {}).get(algorithm, {})
+
+
+class TunedHasherMixin:
+    """Override the hasher's cost attributes from PASSWORD_HASHER_PARAMS."""
+
+    def __init__(self):
+        super().__init__()
+        for name, value in _params(self.algorithm).items():
+            if not hasattr(self, name):
+                raise ImproperlyConfigured(
+                    f"PASSWORD_HASHER_PARAMS['{self.algorithm}']: unknown parameter '{name}'"
+                )
+            setattr(self, name, value)
+
+
+class TunedScryptPasswordHasher(TunedHasherMixin, hashers.ScryptPasswordHasher):
+    pass
+
+
+class TunedArgon2PasswordHasher(TunedHasherMixin, hashers.Argon2PasswordHasher):
+    pass
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def _make(password):
+    return hashers.make_password(password)
+
+
+def _verify(password, encoded):
+    return hashers.verify_password(password, encoded)
+
+
+class _HashPool:
+    """Process pool started on first use, with a bound on queued work."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+
+    def _start(self):
+        """The executor and its queue slots, or None to hash in-process."""
+        workers = getattr(settings, 'PASSWORD_HASH_WORKERS', DEFAULT_WORKERS)
+        if not workers:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    workers, mp_context=get_context('spawn'), initializer=_init_worker
+                )
+                self._slots = threading.BoundedSemaphore(
+                    getattr(settings, 'PASSWORD_HASH_MAX_PENDING', workers * 8)
+                )
+            return self._executor, self._slots
+
+    def map(self, fn, *iterables):
+        """``[fn(*args) for args in zip(*iterables)]``, computed in the pool."""
+        calls = list(zip(*iterables))
+        started = self._start()
+        if started is None:
+            return [fn(*args) for args in calls]
+        executor, slots = started
+        futures = []
+        try:
+            for args in calls:
+                # Waiting for a slot is the backpressure: hashes never pile up unbounded
+                slots.acquire()
+                try:
+                    future = executor.submit(fn, *args)
+                except BaseException:
+                    slots.release()
+                    raise
+                future.add_done_callback(lambda _: slots.release())
+                futures.append(future)
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start over next time
+            logger.exception("Password hashing pool broke; hashing in-process")
+            self.shutdown()
+        return [fn(*args) for args in calls]
+
+    def run(self, fn, *args):
+        return self.map(fn, *([arg] for arg in args))[0]
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+pool = _HashPool()
+
+
+def make_password(password):
+    """``django.contrib.auth.hashers.make_password``, hashed in the pool."""
+    if password is None:
+        return hashers.make_password(None)
+    return pool.run(_make, password)
+
+
+def make_passwords(passwords):
+    """
+    Hashes for ``passwords``, all queued to the pool at once; empty entries
+    get unusable passwords.
+    """
+    hashed = [hashers.make_password(None) for _ in passwords]
+    todo = [i for i, password in enumerate(passwords) if password]
+    for i, value in zip(todo, pool.map(_make, [passwords[i] for i in todo])):
+        hashed[i] = value
+    return hashed
+
+
+def check_password(password, encoded, setter=None):
+    """
+    ``django.contrib.auth.hashers.check_password``, verified in the pool.
+
+    ``setter(password)`` is called after a successful check when the hash
+    should be upgraded (older hasher or parameters).
+    """
+    is_correct, must_update = pool.run(_verify, password, encoded)
+    if setter and is_correct and must_update:
+        setter(password)
+    return is_correct
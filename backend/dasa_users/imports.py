@@ -0,0 +1,330 @@
+"""
+Bulk student import from CSV or XLSX rosters.
+
+Onboarding a cohort through ``create_user`` costs a password hash, an
+INSERT and a signal-created profile per student, one request at a time.
+``import_students`` instead:
+
+- reads the roster row by row (``read_roster``), never holding the whole
+  file in memory;
+- validates rows in chunks of ``BULK_IMPORT_CHUNK_SIZE``, checking
+  uniqueness against the database with one query per field and chunk;
+- hashes the chunk's passwords in the shared hashing pool
+  (``hashers.make_passwords``: spawned workers, ``PASSWORD_HASH_WORKERS`` of
+  them), since hashers are deliberately CPU-bound;
+- inserts the chunk's users and profiles with two ``bulk_create`` calls.
+  No signals fire, so version stamps are bumped and the demographic
+  counts updated explicitly.
+
+Invalid rows are reported with their line number and skipped; they never
+abort the rest of the import. Rows without a password get an unusable one.
+
+Even with the pool a cohort takes minutes to hash, longer than a request
+should run. ``start_import`` keeps the roster in a StudentImport row and
+imports it on a background thread, recording progress and the report
+there; rosters of up to ``BULK_IMPORT_SYNC_LIMIT`` rows are imported
+within the request.
+"""
+
+import codecs
+import csv
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from core import versioning
+from . import demographics, hashers
+from .models import Profile, StudentImport, User
+from .serializers import StudentImportRowSerializer
+
+try:
+    from openpyxl import load_workbook
+except ImportError:  # pragma: no cover - optional dependency
+    load_workbook = None
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+SYNC_LIMIT = 100
+
+REQUIRED_COLUMNS = {'username', 'email', 'student_id'}
+
+USER_FIELDS = ['username', 'email', 'first_name', 'last_name', 'phone_number']
+PROFILE_FIELDS = [
+    'student_id', 'other_names', 'gender', 'college', 'program_of_study',
+    'hall_of_residence', 'year_group', 'hometown',
+]
+
+# Fields that must be unique, with the queryset to check them against
+UNIQUE_FIELDS = {
+    'username': (User.objects, 'username'),
+    'email': (User.objects, 'email'),
+    'phone_number': (User.objects, 'phone_number'),
+    'student_id': (Profile.objects, 'student_id'),
+}
+
+
+class RosterError(ValueError):
+    """The roster as a whole can't be read (format, missing columns)."""
+
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='student-import')
+
+
+def _column(name):
+    return str(name or '').strip().lower().replace(' ', '_')
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheets store IDs and phone numbers as numbers
+        value = int(value)
+    return str(value).strip()
+
+
+def _decode_errors(reader):
+    try:
+        yield from reader
+    except UnicodeDecodeError:
+        raise RosterError("CSV files must be UTF-8 encoded.")
+
+
+def _read_csv(file):
+    reader = _decode_errors(csv.reader(codecs.iterdecode(file, 'utf-8-sig')))
+    try:
+        header = [_column(name) for name in next(reader)]
+    except StopIteration:
+        raise RosterError("The file is empty.")
+    return header, reader
+
+
+def _read_xlsx(file):
+    if load_workbook is None:
+        raise RosterError("XLSX import needs openpyxl (pip install openpyxl); upload a CSV instead.")
+    try:
+        sheet = load_workbook(file, read_only=True, data_only=True).active
+    except Exception as e:
+        raise RosterError(f"Could not read the workbook: {e}")
+    rows = sheet.iter_rows(values_only=True)
+    try:
+        header = [_column(name) for name in next(rows)]
+    except StopIteration:
+        raise RosterError("The worksheet is empty.")
+    return header, rows
+
+
+def read_roster(file, name):
+    """
+    Check a CSV or XLSX roster's header and return an iterator of its rows.
+
+    The iterator yields ``(line, row)`` for each non-empty row: ``line`` is
+    the row's number in the file (the header is line 1) and ``row`` maps
+    normalised column names ("Student ID" -> "student_id") to cell text.
+    Raises RosterError if the header can't be read or lacks a required
+    column; the iterator raises it if the file turns out to be unreadable
+    further down.
+    """
+    ext = os.path.splitext(name or '')[1].lower()
+    header, rows = _read_xlsx(file) if ext == '.xlsx' else _read_csv(file)
+
+    missing = REQUIRED_COLUMNS - set(header)
+    if missing:
+        raise RosterError(f"Missing required column(s): {', '.join(sorted(missing))}.")
+
+    def iter_rows():
+        for line, values in enumerate(rows, start=2):
+            row = {column: _cell(value) for column, value in zip(header, values) if column}
+            if any(row.values()):
+                yield line, row
+
+    return iter_rows()
+
+
+class ImportReport:
+    """Outcome of an import: rows read, users created, per-row errors."""
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.errors = []
+
+    def add_error(self, line, errors):
+        self.errors.append({'row': line, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'failed': len(self.errors),
+            'errors': self.errors,
+        }
+
+
+def _taken_values(rows):
+    """Values of the unique fields used by ``rows`` that already exist."""
+    taken = {}
+    for field, (manager, lookup) in UNIQUE_FIELDS.items():
+        values = {row[field] for _, row in rows if row.get(field)}
+        taken[field] = set(
+            manager.filter(**{f'{lookup}__in': values}).values_list(lookup, flat=True)
+        ) if values else set()
+    return taken
+
+
+def _validate_chunk(chunk, seen, report):
+    """Valid ``(line, data)`` pairs of ``chunk``; the rest go to the report."""
+    valid = []
+    for line, row in chunk:
+        serializer = StudentImportRowSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((line, dict(serializer.validated_data)))
+        else:
+            report.add_error(line, serializer.errors)
+
+    taken = _taken_values(valid)
+    unique = []
+    for line, data in valid:
+        errors = {}
+        for field in UNIQUE_FIELDS:
+            value = data.get(field)
+            if not value:
+                continue
+            if value in taken[field]:
+                errors[field] = [f"A user with this {field.replace('_', ' ')} already exists."]
+            elif value in seen[field]:
+                errors[field] = [f"Duplicate {field.replace('_', ' ')} in this file."]
+        if errors:
+            report.add_error(line, errors)
+            continue
+        for field in UNIQUE_FIELDS:
+            if data.get(field):
+                seen[field].add(data[field])
+        unique.append((line, data))
+    return unique
+
+
+def _build(data, password):
+    user = User(
+        password=password,
+        is_student=True,
+        is_alumni=False,
+        **{field: data.get(field, '') for field in USER_FIELDS},
+    )
+    # phone_number is unique but nullable: no number is NULL, not ''
+    user.phone_number = user.phone_number or None
+    profile = Profile(**{field: data[field] for field in PROFILE_FIELDS if field in data})
+    return user, profile
+
+
+def _insert(pairs):
+    """Insert users and their profiles; all or nothing."""
+    with transaction.atomic():
+        users = User.objects.bulk_create([user for user, _ in pairs])
+        if any(user.pk is None for user in users):
+            # Backends that can't return ids from a bulk insert (MySQL)
+            ids = dict(User.objects.filter(
+                username__in=[user.username for user in users]
+            ).values_list('username', 'pk'))
+            for user in users:
+                user.pk = ids[user.username]
+        for user, profile in pairs:
+            profile.user = user
+        Profile.objects.bulk_create([profile for _, profile in pairs])
+        demographics.count_created(users)
+        demographics.count_created([profile for _, profile in pairs])
+
+
+def _import_chunk(chunk, seen, report):
+    valid = _validate_chunk(chunk, seen, report)
+    if not valid:
+        return
+    passwords = hashers.make_passwords([data.get('password') for _, data in valid])
+    pairs = [_build(data, password) for (_, data), password in zip(valid, passwords)]
+
+    try:
+        _insert(pairs)
+        report.created += len(pairs)
+    except IntegrityError:
+        # Someone created one of these users since the chunk was checked:
+        # insert row by row so only the conflicting rows fail
+        for (line, _), pair in zip(valid, pairs):
+            try:
+                _insert([pair])
+                report.created += 1
+            except IntegrityError as e:
+                report.add_error(line, {'non_field_errors': [str(e)]})
+
+
+def import_students(rows, *, chunk_size=None, progress=None):
+    """
+    Create students from ``(line, row)`` pairs (see ``read_roster``).
+
+    Returns an ImportReport; ``progress(report)`` is called after each
+    chunk. If the file turns out to be unreadable part way through, the rows
+    before that point are kept and the error is reported without a row
+    number.
+    """
+    chunk_size = chunk_size or getattr(settings, 'BULK_IMPORT_CHUNK_SIZE', CHUNK_SIZE)
+    report = ImportReport()
+    seen = {field: set() for field in UNIQUE_FIELDS}
+    rows = iter(rows)
+
+    while True:
+        try:
+            chunk = list(islice(rows, chunk_size))
+        except RosterError as e:
+            report.add_error(None, {'non_field_errors': [str(e)]})
+            break
+        if not chunk:
+            break
+        report.rows += len(chunk)
+        _import_chunk(chunk, seen, report)
+        if progress is not None:
+            progress(report)
+
+    if report.created:
+        versioning.bump_on_commit(User, Profile)
+    # Row checks and uniqueness checks report separately; list by line
+    report.errors.sort(key=lambda error: (error['row'] is None, error['row'] or 0))
+    return report
+
+
+def _run_import(import_id):
+    close_old_connections()
+    jobs = StudentImport.objects.filter(pk=import_id)
+    try:
+        job = jobs.get()
+        jobs.update(status=StudentImport.STATUS_RUNNING)
+
+        def progress(report):
+            jobs.update(rows=report.rows, created=report.created)
+
+        rows = read_roster(io.BytesIO(job.roster), job.filename)
+        report = import_students(rows, progress=progress)
+        jobs.update(
+            status=StudentImport.STATUS_DONE, rows=report.rows, created=report.created,
+            errors=report.errors, roster=None, finished_at=timezone.now(),
+        )
+    except Exception as e:
+        logger.exception("Student import %s failed", import_id)
+        jobs.update(
+            status=StudentImport.STATUS_FAILED, error=str(e), roster=None, finished_at=timezone.now()
+        )
+    finally:
+        close_old_connections()
+
+
+def start_import(roster, name, user=None):
+    """Store ``roster`` in a StudentImport and import it in the background after commit."""
+    roster.seek(0)
+    job = StudentImport.objects.create(filename=name, roster=roster.read(), created_by=user)
+    transaction.on_commit(lambda: _executor.submit(_run_import, job.pk))
+    return job
@@ -0,0 +1,117 @@
+"""
+Management command measuring registration throughput per hasher profile.
+
+For each profile in PASSWORD_HASHER_PROFILES (argon2 only when argon2-cffi
+is installed) it times:
+
+- one password hash (best of --repeat);
+- --registrations sequential POSTs through RegisterView, hashing in the
+  request thread, i.e. registrations per second on one core. Users are
+  created inside a transaction that is rolled back.
+
+Then it pushes --hashes hashes through the hashing pool
+(dasa_users.hashers) from several threads, for the configured profile
+only, since pool workers read their settings at startup.
+
+Usage:
+    python manage.py benchmark_registration
+    python manage.py benchmark_registration --registrations 50 --hashes 200
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+
+from dasa_users import hashers
+from dasa_users.serializers import ALLOWED_STUDENT_DOMAIN
+from dasa_users.views import RegisterView
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark registration throughput for each password hasher profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--registrations', type=int, default=20, help='Registrations per profile (default 20)')
+        parser.add_argument('--hashes', type=int, default=100, help='Hashes pushed through the pool (default 100)')
+        parser.add_argument('--repeat', type=int, default=5, help='Best of N single hashes (default 5)')
+
+    def profiles(self):
+        for name, path in settings.PASSWORD_HASHER_PROFILES.items():
+            hasher_list = [path, *(p for p in settings.PASSWORD_HASHERS if p != path)]
+            with override_settings(PASSWORD_HASHERS=hasher_list):
+                try:
+                    make_password('probe')
+                except ValueError:
+                    self.stdout.write(self.style.WARNING(f'  {name:<8} skipped (library not installed)'))
+                    continue
+            yield name, hasher_list
+
+    def time_hash(self, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            make_password('Kumasi-Freshers-2025')
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def time_registrations(self, count):
+        view = RegisterView.as_view()
+        factory = APIRequestFactory()
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                for i in range(count):
+                    request = factory.post('/api/auth/register/', {
+                        'username': f'benchmark-fresher-{i}',
+                        'email': f'benchmark-fresher-{i}{ALLOWED_STUDENT_DOMAIN}',
+                        'password': 'Kumasi-Freshers-2025',
+                        'password_confirm': 'Kumasi-Freshers-2025',
+                    }, format='json', HTTP_HOST='localhost')
+                    response = view(request)
+                    if response.status_code != 201:
+                        raise CommandError(f'Registration failed: {response.status_code} {response.data}')
+                raise Rollback
+        except Rollback:
+            pass
+        return time.perf_counter() - start
+
+    def time_pool(self, count):
+        workers = settings.PASSWORD_HASH_WORKERS
+        hashers.make_password('warm-up')  # start the pool outside the timing
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, workers) * 2) as threads:
+            list(threads.map(hashers.make_password, ['Kumasi-Freshers-2025'] * count))
+        return time.perf_counter() - start
+
+    def handle(self, *args, **options):
+        registrations = options['registrations']
+
+        self.stdout.write(f'Per profile, hashing in the request thread ({registrations} registrations):')
+        for name, hasher_list in self.profiles():
+            with override_settings(PASSWORD_HASHERS=hasher_list, PASSWORD_HASH_WORKERS=0):
+                hash_seconds = self.time_hash(options['repeat'])
+                elapsed = self.time_registrations(registrations)
+            self.stdout.write(
+                f'  {name:<8} hash {hash_seconds * 1000:7.1f} ms   '
+                f'{registrations / elapsed:6.1f} registrations/s per core'
+            )
+
+        workers = settings.PASSWORD_HASH_WORKERS
+        if workers:
+            elapsed = self.time_pool(options['hashes'])
+            self.stdout.write(
+                f'Pool ({settings.PASSWORD_HASHER_PROFILE}, {workers} workers): '
+                f'{options["hashes"] / elapsed:6.1f} hashes/s, {options["hashes"] / elapsed / workers:6.1f} per worker'
+            )
+        self.stdout.write(self.style.SUCCESS('Benchmark users rolled back.'))
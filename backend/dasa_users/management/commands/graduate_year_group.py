@@ -0,0 +1,34 @@
+"""
+Management command to mark a year group as alumni.
+
+Same rollover as POST /api/users/graduate/ (see dasa_users.rollover), run
+in the foreground: one UPDATE for the whole year group, caches and token
+versions invalidated after commit.
+
+Usage:
+    python manage.py graduate_year_group 2025 --dry-run
+    python manage.py graduate_year_group 2025
+"""
+
+from django.core.management.base import BaseCommand
+from dasa_users.rollover import count_graduating, graduate_year_group
+
+
+class Command(BaseCommand):
+    help = 'Mark every student in a year group as alumni'
+
+    def add_arguments(self, parser):
+        parser.add_argument('year_group', type=int, help='Profile year group, e.g. 2025')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the users who would graduate')
+
+    def handle(self, *args, **options):
+        year_group = options['year_group']
+        if options['dry_run']:
+            count = count_graduating(year_group)
+            self.stdout.write(f'{count} user(s) of year group {year_group} would be marked as alumni.')
+            return
+
+        graduated = graduate_year_group(year_group)
+        self.stdout.write(self.style.SUCCESS(
+            f'{graduated} user(s) of year group {year_group} marked as alumni.'
+        ))
@@ -0,0 +1,47 @@
+"""
+Management command to onboard students from a CSV or XLSX roster.
+
+Same pipeline as POST /api/users/bulk_import/ (see dasa_users.imports):
+rows are validated and inserted in chunks, passwords hashed in the
+PASSWORD_HASH_WORKERS pool (dasa_users.hashers), and invalid rows reported
+without stopping the import.
+
+Usage:
+    python manage.py import_students roster.csv
+    python manage.py import_students cohort.xlsx --chunk-size 1000
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from dasa_users.imports import RosterError, import_students, read_roster
+
+
+class Command(BaseCommand):
+    help = 'Create student accounts and profiles from a CSV or XLSX roster'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Roster file (.csv or .xlsx)')
+        parser.add_argument('--chunk-size', type=int, help='Rows validated and inserted together')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            with open(path, 'rb') as roster:
+                report = import_students(
+                    read_roster(roster, path),
+                    chunk_size=options['chunk_size'],
+                )
+        except OSError as e:
+            raise CommandError(f'Cannot open {path}: {e}')
+        except RosterError as e:
+            raise CommandError(str(e))
+
+        for error in report.errors:
+            line = f"row {error['row']}" if error['row'] else 'file'
+            messages = '; '.join(
+                f"{field}: {' '.join(map(str, problems))}" for field, problems in error['errors'].items()
+            )
+            self.stdout.write(self.style.ERROR(f'  {line}: {messages}'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Import finished: {report.created} created, {len(report.errors)} failed, {report.rows} rows read.'
+        ))
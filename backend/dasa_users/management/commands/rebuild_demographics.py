@@ -0,0 +1,21 @@
+"""
+Management command to recount the demographic summary table.
+
+The counts behind GET /api/users/admin/demographics/ are kept up to date
+by signals (see dasa_users.demographics); this recounts them from User and
+Profile to correct any drift, e.g. after a raw SQL fix.
+
+Run it periodically (e.g. nightly via cron):
+    python manage.py rebuild_demographics
+"""
+
+from django.core.management.base import BaseCommand
+from dasa_users import demographics
+
+
+class Command(BaseCommand):
+    help = 'Recount the demographic breakdowns from the users and profiles tables'
+
+    def handle(self, *args, **options):
+        buckets = demographics.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Demographic counts rebuilt: {buckets} bucket(s).'))
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:26
+
+from django.db import migrations, models
+
+
+def blank_to_null(apps, schema_editor):
+    Profile = apps.get_model("dasa_users", "Profile")
+    Profile.objects.filter(student_id="").update(student_id=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dasa_users", "0005_user_token_version"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="profile",
+            name="student_id",
+            field=models.CharField(
+                blank=True,
+                help_text="KNUST Student ID",
+                max_length=10,
+                null=True,
+                unique=True,
+            ),
+        ),
+        migrations.RunPython(blank_to_null, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:34
+
+from django.db import migrations, models
+
+
+def count_existing_users(apps, schema_editor):
+    from dasa_users import demographics
+
+    demographics.rebuild(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dasa_users", "0007_graduation_rollover"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DemographicCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("dimension", models.CharField(max_length=20)),
+                ("value", models.CharField(max_length=50)),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "unique_together": {("dimension", "value")},
+            },
+        ),
+        migrations.RunPython(count_existing_users, migrations.RunPython.noop),
+    ]
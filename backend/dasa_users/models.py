@@ -2,15 +2,57 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 
+from . import demographics, hashers
+
 class User(AbstractUser):
     """Custom user model to handle simplified login/auth"""
+    # Flags copied into access tokens as claims (dasa_users.tokens)
+    ROLE_FIELDS = ('is_active', 'is_staff', 'is_superuser', 'is_student', 'is_alumni')
+
     is_student = models.BooleanField(default=True)
     is_alumni = models.BooleanField(default=False)
     phone_number = models.CharField(max_length=15, unique=True, null=True)
+    token_version = models.PositiveIntegerField(
+        default=0, editable=False,
+        help_text="Bumped whenever a role flag changes; tokens carrying an older version are rejected",
+    )
 
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_roles = instance.role_values()
+        instance._loaded_demographics = demographics.snapshot(instance)
+        return instance
+
+    def role_values(self):
+        return tuple(self.__dict__.get(name) for name in self.ROLE_FIELDS)
+
+    def set_password(self, raw_password):
+        self.password = hashers.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """Check in the hashing pool; upgrade outdated hashes on success."""
+        def setter(raw_password):
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=['password'])
+
+        return hashers.check_password(raw_password, self.password, setter)
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, '_loaded_roles', None)
+        if loaded is not None and loaded != self.role_values():
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._loaded_roles = self.role_values()
+
 class Profile(models.Model):
     # KNUST Context Enums
     HALLS = [
@@ -33,7 +75,8 @@ class Profile(models.Model):
     ]
 
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
-    student_id = models.CharField(max_length=10, unique=True, help_text="KNUST Student ID")
+    # NULL until known: registered users get a profile before they enter it
+    student_id = models.CharField(max_length=10, unique=True, null=True, blank=True, help_text="KNUST Student ID")
     
     # Personal Info
     other_names = models.CharField(max_length=100, blank=True)
@@ -52,6 +95,34 @@ class Profile(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.student_id}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_demographics = demographics.snapshot(instance)
+        return instance
+
+    def save(self, *args, **kwargs):
+        # '' would collide with every other profile lacking an ID
+        if not self.student_id:
+            self.student_id = None
+        super().save(*args, **kwargs)
+
+
+class DemographicCount(models.Model):
+    """
+    Number of users in one bucket of a breakdown, e.g. hall=Katanga.
+    Maintained by dasa_users.demographics.
+    """
+    dimension = models.CharField(max_length=20)
+    value = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('dimension', 'value')
+
+    def __str__(self):
+        return f"{self.dimension}={self.value}: {self.count}"
+
 
 class SystemConfig(models.Model):
     """
@@ -98,4 +169,75 @@ class SystemConfig(models.Model):
         return obj
 
     def __str__(self):
-        return f"System Config - {self.current_academic_year}"
\ No newline at end of file
+        return f"System Config - {self.current_academic_year}"
+
+class GraduationRollover(models.Model):
+    """
+    A year group marked as alumni by dasa_users.rollover, run in the
+    background. Kept as a record of when each class graduated.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    year_group = models.IntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    expected = models.PositiveIntegerField(help_text="Users matching when the rollover was requested")
+    graduated = models.PositiveIntegerField(default=0, help_text="Users marked as alumni")
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        'User', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Graduate year group {self.year_group} ({self.status})"
+
+
+class StudentImport(models.Model):
+    """
+    A roster imported in the background by dasa_users.imports.
+
+    The roster is kept in the row (not in media storage: it may hold
+    passwords) until the import has run, then cleared; the report stays.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    filename = models.CharField(max_length=255)
+    roster = models.BinaryField(null=True, editable=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    rows = models.PositiveIntegerField(default=0, help_text="Rows read so far")
+    created = models.PositiveIntegerField(default=0, help_text="Users created so far")
+    errors = models.JSONField(default=list, blank=True, help_text="Per-row errors, by line number")
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        'User', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Import {self.filename} ({self.status})"
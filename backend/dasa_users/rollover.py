@@ -0,0 +1,92 @@
+"""
+Graduation rollover: mark a whole year group as alumni.
+
+Doing this through ``AdminUserUpdateSerializer`` costs a request, a save
+and its signals per student. ``graduate_year_group`` instead flips
+``is_alumni``/``is_student`` for every user whose ``Profile.year_group``
+matches with one UPDATE, in a transaction, and bumps ``token_version`` in
+the same statement.
+
+``QuerySet.update()`` sends no signals, so what the save signals would
+have done is done here: the users' cached copies and token versions are
+dropped (``authentication.invalidate_users``), the User version stamp is
+bumped and the graduates move to the alumni demographic count. Access
+tokens issued before the rollover carry the old version and are rejected,
+so the role claims ``VoteViewSet.perform_create`` checks are never stale:
+a graduate's next refresh gets ``is_alumni`` set.
+
+``start_rollover`` runs it on a background thread and records the outcome
+in a GraduationRollover row; ``count_graduating`` is the dry run.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core import versioning
+from . import demographics
+from .authentication import invalidate_users
+from .models import GraduationRollover, User
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='graduation-rollover')
+
+
+def graduating_users(year_group):
+    """Users in ``year_group`` who aren't alumni yet."""
+    return User.objects.filter(profile__year_group=year_group, is_alumni=False)
+
+
+def count_graduating(year_group):
+    """How many users ``graduate_year_group`` would change."""
+    return graduating_users(year_group).count()
+
+
+def graduate_year_group(year_group):
+    """Mark every non-alumni user in ``year_group`` as alumni; return how many."""
+    with transaction.atomic():
+        ids = list(
+            graduating_users(year_group).select_for_update(of=('self',)).values_list('pk', flat=True)
+        )
+        if not ids:
+            return 0
+        graduates = User.objects.filter(pk__in=ids)
+        counts = demographics.count_rows(graduates, sign=-1)
+        graduated = graduates.update(
+            is_alumni=True, is_student=False, token_version=F('token_version') + 1
+        )
+        counts.update(demographics.count_rows(graduates))
+        demographics.apply(counts)
+        invalidate_users(ids)
+        versioning.bump_on_commit(User)
+    return graduated
+
+
+def _run_rollover(rollover_id):
+    close_old_connections()
+    rollovers = GraduationRollover.objects.filter(pk=rollover_id)
+    try:
+        rollover = rollovers.get()
+        rollovers.update(status=GraduationRollover.STATUS_RUNNING)
+        graduated = graduate_year_group(rollover.year_group)
+        rollovers.update(
+            status=GraduationRollover.STATUS_DONE, graduated=graduated, finished_at=timezone.now()
+        )
+    except Exception as e:
+        logger.exception("Graduation rollover %s failed", rollover_id)
+        rollovers.update(status=GraduationRollover.STATUS_FAILED, error=str(e), finished_at=timezone.now())
+    finally:
+        close_old_connections()
+
+
+def start_rollover(year_group, user=None):
+    """Record a rollover of ``year_group`` and run it in the background after commit."""
+    rollover = GraduationRollover.objects.create(
+        year_group=year_group, expected=count_graduating(year_group), created_by=user
+    )
+    transaction.on_commit(lambda: _executor.submit(_run_rollover, rollover.pk))
+    return rollover
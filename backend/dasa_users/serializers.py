@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
-from .models import User, Profile, SystemConfig
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from core.models import DeletionJob
+from .models import User, Profile, SystemConfig, GraduationRollover, StudentImport
 
 # Domain whitelist configuration
 # To change the allowed domain, update this constant
@@ -8,6 +10,18 @@ from .models import User, Profile, SystemConfig
 ALLOWED_STUDENT_DOMAIN = '@st.knust.edu.gh'
 
 
+def update_profile(profile, updates):
+    """Apply ``updates`` to ``profile``, saving only the fields that changed."""
+    changed = []
+    for attr, value in updates.items():
+        if getattr(profile, attr) != Profile._meta.get_field(attr).to_python(value):
+            setattr(profile, attr, value)
+            changed.append(attr)
+    if changed:
+        profile.save(update_fields=changed)
+    return changed
+
+
 class ProfileSerializer(serializers.ModelSerializer):
     """Serializer for the Profile model"""
     class Meta:
@@ -144,10 +158,7 @@ class UserSerializer(serializers.ModelSerializer):
         user.save()
         
         # Update profile
-        if profile_data and hasattr(user, 'profile'):
-            for k, v in profile_data.items():
-                setattr(user.profile, k, v)
-            user.profile.save()
+        update_profile(user.profile, profile_data)
             
         return user
 
@@ -169,11 +180,7 @@ class UserSerializer(serializers.ModelSerializer):
         instance.save()
 
         # Update Profile fields
-        if profile_updates and hasattr(instance, 'profile'):
-            profile = instance.profile
-            for attr, value in profile_updates.items():
-                setattr(profile, attr, value)
-            profile.save()
+        update_profile(instance.profile, profile_updates)
 
         return instance
 
@@ -231,11 +238,7 @@ class UserUpdateSerializer(serializers.ModelSerializer):
         instance.save()
 
         # Update Profile fields
-        if profile_updates and hasattr(instance, 'profile'):
-            profile = instance.profile
-            for attr, value in profile_updates.items():
-                setattr(profile, attr, value)
-            profile.save()
+        update_profile(instance.profile, profile_updates)
 
         return instance
 
@@ -428,8 +431,101 @@ class AdminUserCreationSerializer(serializers.ModelSerializer):
             password=password,
             **validated_data
         )
-
-        # Create associated profile
-        Profile.objects.create(user=user)
+        # The profile is created by the post_save signal
 
         return user
+
+
+class UserSummarySerializer(serializers.ModelSerializer):
+    """
+    Compact, read-only user representation embedded in other resources
+    (product sellers, lost item / welfare reporters, executives).
+
+    ``select_related`` lists the User relations its method fields read.
+    Viewsets using ``core.querysets.QueryPlanMixin`` join them in
+    automatically, prefixed with the field's source (e.g.
+    ``seller__profile``), so avatars don't cost a query per row.
+    """
+    select_related = ['profile']
+
+    full_name = serializers.SerializerMethodField()
+    avatar = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'email', 'first_name', 'last_name', 'full_name', 'avatar']
+        read_only_fields = fields
+
+    def get_full_name(self, obj):
+        if obj.first_name and obj.last_name:
+            return f"{obj.first_name} {obj.last_name}"
+        return obj.username
+
+    def get_avatar(self, obj):
+        if hasattr(obj, 'profile') and obj.profile.profile_picture:
+            return obj.profile.profile_picture.url
+        return None
+
+
+class StudentImportRowSerializer(serializers.Serializer):
+    """
+    One row of a bulk student import (dasa_users.imports).
+
+    Only checks the row itself; uniqueness against the database and the
+    rest of the file is checked per chunk by the importer.
+    """
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    email = serializers.EmailField()
+    password = serializers.CharField(required=False, allow_blank=True, trim_whitespace=False)
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    phone_number = serializers.CharField(max_length=15, required=False, allow_blank=True)
+
+    student_id = serializers.CharField(max_length=10)
+    other_names = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    gender = serializers.ChoiceField(choices=['M', 'F'], required=False, allow_blank=True)
+    college = serializers.ChoiceField(choices=Profile.COLLEGES, required=False, allow_blank=True)
+    program_of_study = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    hall_of_residence = serializers.ChoiceField(choices=Profile.HALLS, required=False, allow_blank=True)
+    year_group = serializers.IntegerField(required=False, allow_null=True)
+    hometown = serializers.CharField(max_length=100, required=False, allow_blank=True)
+
+    def to_internal_value(self, data):
+        # Empty spreadsheet cells mean "not given"
+        data = {k: v for k, v in data.items() if v not in ('', None)}
+        return super().to_internal_value(data)
+
+    def validate_email(self, value):
+        return value.lower()
+
+    def validate_password(self, value):
+        if value:
+            validate_password(value)
+        return value
+
+
+class DeletionJobSerializer(serializers.ModelSerializer):
+    """Progress of a background bulk deletion (core.deletion)."""
+
+    class Meta:
+        model = DeletionJob
+        fields = ['id', 'status', 'total', 'processed', 'deleted', 'error', 'created_at', 'finished_at']
+        read_only_fields = fields
+
+
+class GraduationRolloverSerializer(serializers.ModelSerializer):
+    """Outcome of a background graduation rollover (dasa_users.rollover)."""
+
+    class Meta:
+        model = GraduationRollover
+        fields = ['id', 'year_group', 'status', 'expected', 'graduated', 'error', 'created_at', 'finished_at']
+        read_only_fields = fields
+
+
+class StudentImportSerializer(serializers.ModelSerializer):
+    """Progress and report of a background roster import (dasa_users.imports)."""
+
+    class Meta:
+        model = StudentImport
+        fields = ['id', 'filename', 'status', 'rows', 'created', 'errors', 'error', 'created_at', 'finished_at']
+        read_only_fields = fields
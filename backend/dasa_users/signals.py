@@ -1,16 +1,54 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.conf import settings
-from .models import Profile
+from core.deletion import bulk_deleted, pre_bulk_delete
+from . import demographics
+from .authentication import invalidate_user
+from .tokens import forget_token_version
+from .models import Profile, User
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_user_profile(sender, instance, created, **kwargs):
-    if created:
+    # Profiles are saved by whoever changes them (see
+    # serializers.update_profile), not on every user save
+    if created and not kwargs.get('raw'):
         Profile.objects.create(user=instance)
 
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Password, is_active and staff changes all go through a save
+    invalidate_user(instance.pk)
+    forget_token_version(instance.pk)
+
+@receiver([post_save, post_delete], sender=Profile)
+def invalidate_cached_user_profile(sender, instance, **kwargs):
+    invalidate_user(instance.user_id)
+
+# bulk_deleted is a plain Signal: it needs the model, not its label
+@receiver(bulk_deleted, sender=User)
+def invalidate_bulk_deleted_users(sender, pks, **kwargs):
+    for pk in pks:
+        invalidate_user(pk)
+        forget_token_version(pk)
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+@receiver(pre_save, sender=Profile)
+def load_demographics_snapshot(sender, instance, raw=False, **kwargs):
+    if not raw:
+        demographics.load_snapshot(instance)
+
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
-def save_user_profile(sender, instance, **kwargs):
-    # Safety check: Create if it doesn't exist even on save
-    if not hasattr(instance, 'profile'):
-            Profile.objects.create(user=instance)
-    instance.profile.save()
+@receiver(post_save, sender=Profile)
+def count_saved_demographics(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        demographics.count_saved(instance, created, update_fields)
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=Profile)
+def count_deleted_demographics(sender, instance, **kwargs):
+    demographics.count_deleted(instance)
+
+@receiver(pre_bulk_delete, sender=User)
+def count_bulk_deleted_demographics(sender, pks, **kwargs):
+    demographics.apply(demographics.count_rows(User._base_manager.filter(pk__in=pks), sign=-1))
@@ -1,3 +1,597 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, get_hasher, identify_hasher, verify_password
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core import deletion
+from elections.models import Candidate, Election, Position, ResultSnapshot, Vote
+from leadership.models import Executive
+from lost_found.models import LostItem
+from market.models import Product
+from welfare.models import WelfareReport
+from . import demographics, hashers, imports, rollover
+from .authentication import user_cache
+from .imports import import_students, read_roster
+from .models import Profile, StudentImport, User
+from .tokens import TOKEN_VERSION_KEY, get_token_version
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """Authenticated requests resolve the user from the per-process cache."""
+
+    def setUp(self):
+        user_cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(username='student', password='pass12345')
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def get_me(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/users/me/')
+        return response, len(queries)
+
+    def test_repeat_request_needs_no_queries(self):
+        first, first_queries = self.get_me()
+        second, second_queries = self.get_me()
+
+        self.assertEqual(first.status_code, 200)
+        self.assertGreater(first_queries, 0)
+        self.assertEqual(second_queries, 0)
+        self.assertEqual(first.json(), second.json())
+
+    def test_profile_change_is_visible_on_next_request(self):
+        self.get_me()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile.hometown = 'Tamale'
+            self.user.profile.save()
+
+        response, queries = self.get_me()
+        self.assertGreater(queries, 0)
+        self.assertEqual(response.json()['profile']['hometown'], 'Tamale')
+
+    def test_deactivation_rejects_cached_user(self):
+        self.get_me()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        response, _ = self.get_me()
+        self.assertEqual(response.status_code, 401)
+
+
+class RoleClaimsTests(TestCase):
+    """Tokens carry role claims, revoked by bumping the user's token version."""
+
+    def setUp(self):
+        user_cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(username='officer', password='pass12345', is_staff=True)
+        self.client = APIClient(HTTP_HOST='localhost')
+
+    def login(self):
+        response = self.client.post(
+            '/api/auth/login/', {'username': 'officer', 'password': 'pass12345'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_only_role_changes_bump_token_version(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = 'Ama'
+            self.user.save()
+        self.assertEqual(self.user.token_version, 0)
+
+        user = User.objects.get(pk=self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.is_alumni = True
+            user.save(update_fields=['is_alumni'])
+        user.refresh_from_db()
+        self.assertEqual(user.token_version, 1)
+
+    def test_tokens_carry_role_claims(self):
+        access = AccessToken(self.login()['access'])
+
+        self.assertTrue(access['is_staff'])
+        self.assertTrue(access['is_student'])
+        self.assertFalse(access['is_alumni'])
+        self.assertEqual(access['ver'], 0)
+
+    def test_role_change_revokes_token_until_refreshed(self):
+        tokens = self.login()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 200)
+
+        user = User.objects.get(pk=self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.is_staff = False
+            user.save()
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 401)
+
+        self.client.credentials()
+        response = self.client.post('/api/auth/refresh/', {'refresh': tokens['refresh']}, format='json')
+        access = AccessToken(response.json()['access'])
+        self.assertFalse(access['is_staff'])
+        self.assertEqual(access['ver'], 1)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 200)
+
+
+class ProfileWriteTests(TestCase):
+    """Saving a user doesn't rewrite its profile."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='pass12345')
+
+    def test_user_save_is_a_single_update(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.profile  # loaded, as it is after authentication
+
+        with CaptureQueriesContext(connection) as queries:
+            user.first_name = 'Kofi'
+            user.save()
+
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]['sql'].startswith('UPDATE "dasa_users_user"'))
+
+    def test_admin_created_user_gets_one_profile(self):
+        # Profiles need distinct student IDs
+        self.user.profile.student_id = 'S0001'
+        self.user.profile.save()
+        admin = User.objects.create_user(username='admin', password='pass12345', is_staff=True)
+        admin.profile.student_id = 'A0001'
+        admin.profile.save()
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(admin)
+
+        response = client.post('/api/users/create_user/', {
+            'username': 'new', 'email': 'new@example.com', 'password': 'pass12345',
+        }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.get(username='new').profile)
+
+
+class BulkImportTests(TestCase):
+    """Rosters are imported in bulk, reporting bad rows without stopping."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pass12345', is_staff=True)
+        self.admin.profile.student_id = 'A0001'
+        self.admin.profile.save()
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, content):
+        roster = SimpleUploadedFile('roster.csv', content.encode(), content_type='text/csv')
+        return self.client.post('/api/users/bulk_import/', {'roster': roster}, format='multipart')
+
+    def test_import_creates_users_and_reports_bad_rows(self):
+        response = self.upload(
+            'Username,Email,Password,Student ID,Hall of Residence\n'
+            'ama,Ama@st.knust.edu.gh,Kumasi-2025!,20510001,Africa\n'
+            'kofi,kofi@st.knust.edu.gh,Kumasi-2025!,20510002,\n'
+            'admin,admin2@st.knust.edu.gh,,20510003,\n'
+            'yaw,not-an-email,,20510004,\n'
+            'esi,esi@st.knust.edu.gh,,20510001,\n'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual((report['rows'], report['created'], report['failed']), (5, 2, 3))
+        self.assertEqual([error['row'] for error in report['errors']], [4, 5, 6])
+
+        ama = User.objects.select_related('profile').get(username='ama')
+        self.assertEqual(ama.email, 'ama@st.knust.edu.gh')
+        self.assertEqual(ama.profile.hall_of_residence, 'Africa')
+        self.assertTrue(ama.check_password('Kumasi-2025!'))
+        self.assertFalse(User.objects.get(username='kofi').profile.hall_of_residence)
+
+    def test_missing_columns_reject_the_file(self):
+        response = self.upload('Username,Email\nama,ama@st.knust.edu.gh\n')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('student_id', response.json()['error'])
+
+    @override_settings(BULK_IMPORT_SYNC_LIMIT=1)
+    def test_large_rosters_become_imports(self):
+        response = self.upload(
+            'username,email,student_id\n'
+            'ama,ama@st.knust.edu.gh,20510001\n'
+            'kofi,kofi@st.knust.edu.gh,20510002\n'
+        )
+
+        self.assertEqual(response.status_code, 202)
+        job = response.json()['import']
+        self.assertEqual((job['filename'], job['status'], job['created']), ('roster.csv', 'pending', 0))
+        self.assertFalse(User.objects.filter(username='ama').exists())
+
+        response = self.client.get(f"/api/users/bulk_import/{job['id']}/")
+        self.assertEqual(response.json()['status'], 'pending')
+
+
+class BulkImportJobTests(TransactionTestCase):
+    """Background imports run after commit, report like the synchronous path and drop the roster."""
+
+    @override_settings(BULK_IMPORT_SYNC_LIMIT=1, BULK_IMPORT_CHUNK_SIZE=2)
+    def test_import_runs_in_background(self):
+        admin = User.objects.create_user(username='admin', password='pass12345', is_staff=True)
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(admin)
+        roster = SimpleUploadedFile('roster.csv', (
+            b'username,email,password,student_id\n'
+            b'ama,ama@st.knust.edu.gh,Kumasi-2025!,20510001\n'
+            b'kofi,kofi@st.knust.edu.gh,,20510002\n'
+            b'yaw,not-an-email,,20510003\n'
+        ), content_type='text/csv')
+
+        job = client.post('/api/users/bulk_import/', {'roster': roster}, format='multipart').json()['import']
+        imports._executor.submit(lambda: None).result()  # imports run one at a time, in order
+
+        job = client.get(f"/api/users/bulk_import/{job['id']}/").json()
+        self.assertEqual((job['status'], job['rows'], job['created']), ('done', 3, 2))
+        self.assertEqual([error['row'] for error in job['errors']], [4])
+        self.assertTrue(User.objects.get(username='ama').check_password('Kumasi-2025!'))
+        self.assertFalse(User.objects.get(username='kofi').has_usable_password())
+        self.assertIsNone(StudentImport.objects.get(pk=job['id']).roster)
+
+
+class PasswordHashingTests(TestCase):
+    """New passwords use the configured profile; older hashes upgrade on login."""
+
+    def register(self, username):
+        return APIClient(HTTP_HOST='localhost').post('/api/auth/register/', {
+            'username': username,
+            'email': f'{username}@st.knust.edu.gh',
+            'password': 'Kumasi-2025!',
+            'password_confirm': 'Kumasi-2025!',
+        }, format='json')
+
+    def test_registrations_use_preferred_hasher(self):
+        self.assertEqual(self.register('ama').status_code, 201)
+        self.assertEqual(self.register('kofi').status_code, 201)
+
+        user = User.objects.get(username='kofi')
+        self.assertTrue(user.password.startswith('scrypt$'))
+        self.assertIsNone(user.profile.student_id)
+
+    def test_login_upgrades_pbkdf2_hash(self):
+        user = User.objects.create_user(username='ama')
+        user.password = PBKDF2PasswordHasher().encode('Kumasi-2025!', PBKDF2PasswordHasher().salt())
+        user.save()
+
+        response = APIClient(HTTP_HOST='localhost').post(
+            '/api/auth/login/', {'username': 'ama', 'password': 'Kumasi-2025!'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('scrypt$'))
+        self.assertTrue(user.check_password('Kumasi-2025!'))
+
+    @override_settings(PASSWORD_HASH_WORKERS=1)
+    def test_pool_hashes_verify_in_process(self):
+        encoded = hashers.make_password('Kumasi-2025!')
+        self.assertIsNotNone(hashers.pool._executor)
+
+        # Spawned workers load the same profile and parameters as this process
+        self.assertEqual(identify_hasher(encoded).algorithm, get_hasher('default').algorithm)
+        self.assertTrue(encoded.startswith('scrypt$32768$'))
+        with override_settings(PASSWORD_HASH_WORKERS=0):
+            self.assertTrue(hashers.check_password('Kumasi-2025!', encoded))
+            self.assertFalse(hashers.check_password('Kumasi-2024!', encoded))
+        self.assertEqual(verify_password('Kumasi-2025!', encoded), (True, False))
+
+
+class BulkDeleteTests(TestCase):
+    """Bulk deletion removes users and what cascades from them, chunk by chunk."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pass12345', is_staff=True)
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(self.admin)
+        now = timezone.now()
+        election = Election.objects.create(
+            title='General Elections', start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=1), is_active=True,
+        )
+        self.position = Position.objects.create(election=election, name='President', rank=1)
+        self.graduates = [User.objects.create_user(username=f'graduate{i}', password='pass12345') for i in range(3)]
+
+        candidate = Candidate.objects.create(
+            position=self.position, user=self.graduates[0], manifesto='Vote for me', photo='candidates/c.png'
+        )
+        # A vote by someone staying, for a candidate who is leaving
+        Vote.objects.create(voter=self.admin, position=self.position, candidate=candidate)
+        for graduate in self.graduates:
+            Product.objects.create(
+                seller=graduate, title='Calculator', price='50.00', category='Electronics',
+                condition='Used - Good', image='market/p.jpg', description='Barely used',
+                whatsapp_number='0200000000',
+            )
+        Executive.objects.create(user=self.graduates[1], title='Treasurer', rank=2, academic_year='2024/2025')
+        ResultSnapshot.objects.create(election=election, results='{}', candidates='[]', published_by=self.graduates[2])
+
+    @override_settings(BULK_DELETE_CHUNK_SIZE=2)
+    def test_deletes_users_and_cascades(self):
+        ids = [graduate.pk for graduate in self.graduates]
+        response = self.client.post('/api/users/bulk_delete/', {'user_ids': ids}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['deleted_count'], 3)
+        self.assertFalse(User.objects.filter(pk__in=ids).exists())
+        self.assertFalse(Profile.objects.filter(user_id__in=ids).exists())
+        self.assertEqual(Product.objects.count(), 0)
+        self.assertEqual(Candidate.objects.count(), 0)
+        self.assertEqual(Vote.objects.count(), 0)
+        self.assertEqual(Executive.objects.count(), 0)
+        self.assertIsNone(ResultSnapshot.objects.get().published_by)
+        self.assertTrue(User.objects.filter(pk=self.admin.pk).exists())
+
+    def test_forgets_deleted_users_token_versions(self):
+        key = TOKEN_VERSION_KEY.format(user_id=self.graduates[0].pk)
+        get_token_version(self.graduates[0].pk)
+        self.assertIsNotNone(cache.get(key))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/users/bulk_delete/', {'user_ids': [self.graduates[0].pk]}, format='json')
+
+        self.assertIsNone(cache.get(key))
+
+    @override_settings(BULK_DELETE_SYNC_LIMIT=2)
+    def test_large_batches_become_jobs(self):
+        ids = [graduate.pk for graduate in self.graduates]
+        response = self.client.post('/api/users/bulk_delete/', {'user_ids': ids}, format='json')
+
+        self.assertEqual(response.status_code, 202)
+        job = response.json()['job']
+        self.assertEqual((job['status'], job['total'], job['processed']), ('pending', 3, 0))
+
+        response = self.client.get(f"/api/users/bulk_delete/jobs/{job['id']}/")
+        self.assertEqual(response.json()['status'], 'pending')
+
+    def test_requires_admin(self):
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(self.graduates[0])
+
+        response = client.post('/api/users/bulk_delete/', {'user_ids': [self.admin.pk]}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class BulkDeleteJobTests(TransactionTestCase):
+    """Background deletion jobs run after commit and record their progress."""
+
+    @override_settings(BULK_DELETE_SYNC_LIMIT=2, BULK_DELETE_CHUNK_SIZE=2)
+    def test_job_deletes_in_background(self):
+        admin = User.objects.create_user(username='admin', password='pass12345', is_staff=True)
+        ids = [User.objects.create_user(username=f'graduate{i}').pk for i in range(5)]
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(admin)
+
+        job = client.post('/api/users/bulk_delete/', {'user_ids': ids}, format='json').json()['job']
+        deletion._executor.submit(lambda: None).result()  # jobs run one at a time, in order
+
+        job = client.get(f"/api/users/bulk_delete/jobs/{job['id']}/").json()
+        self.assertEqual((job['status'], job['processed'], job['deleted']), ('done', 5, 5))
+        self.assertEqual(User.objects.count(), 1)
+
+
+class GraduationRolloverTests(TestCase):
+    """A year group is marked as alumni in one UPDATE, revoking old tokens."""
+
+    def setUp(self):
+        user_cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.graduates = [User.objects.create_user(username=f'final{i}', password='pass12345') for i in range(3)]
+            self.fresher = User.objects.create_user(username='fresher', password='pass12345')
+        Profile.objects.filter(user__in=self.graduates).update(year_group=2025)
+        Profile.objects.filter(user=self.fresher).update(year_group=2028)
+
+    def test_dry_run_only_counts(self):
+        admin = User.objects.create_user(username='admin', password='pass12345', is_staff=True)
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(admin)
+
+        response = client.post('/api/users/graduate/', {'year_group': 2025, 'dry_run': True}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 3)
+        self.assertFalse(User.objects.filter(is_alumni=True).exists())
+
+    def test_rollover_updates_year_group_in_one_statement(self):
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(rollover.graduate_year_group(2025), 3)
+
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "dasa_users_user"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            set(User.objects.filter(is_alumni=True, is_student=False).values_list('username', flat=True)),
+            {'final0', 'final1', 'final2'},
+        )
+        self.assertTrue(User.objects.get(username='fresher').is_student)
+        self.assertEqual(rollover.graduate_year_group(2025), 0)
+
+    def test_rollover_revokes_tokens_until_refreshed(self):
+        client = APIClient(HTTP_HOST='localhost')
+        tokens = client.post(
+            '/api/auth/login/', {'username': 'final0', 'password': 'pass12345'}, format='json'
+        ).json()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.assertEqual(client.get('/api/users/me/').status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rollover.graduate_year_group(2025)
+
+        self.assertEqual(client.get('/api/users/me/').status_code, 401)
+        refreshed = client.post('/api/auth/refresh/', {'refresh': tokens['refresh']}, format='json')
+        access = AccessToken(refreshed.json()['access'])
+        self.assertTrue(access['is_alumni'])
+        self.assertFalse(access['is_student'])
+
+
+class GraduationRolloverJobTests(TransactionTestCase):
+    """Rollovers requested through the API run in the background."""
+
+    def test_rollover_runs_in_background(self):
+        admin = User.objects.create_user(username='admin', password='pass12345', is_staff=True)
+        graduate = User.objects.create_user(username='final')
+        Profile.objects.filter(user=graduate).update(year_group=2025)
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(admin)
+
+        response = client.post('/api/users/graduate/', {'year_group': 2025}, format='json')
+        self.assertEqual(response.status_code, 202)
+        rollover._executor.submit(lambda: None).result()
+
+        result = client.get(f"/api/users/graduate/{response.json()['rollover']['id']}/").json()
+        self.assertEqual((result['status'], result['expected'], result['graduated']), ('done', 1, 1))
+        self.assertTrue(User.objects.get(pk=graduate.pk).is_alumni)
+
+
+class DemographicsTests(TestCase):
+    """The breakdown counts follow saves, deletions and set-based writes."""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'member{i}') for i in range(4)]
+        for user, hall in zip(self.users, ['Katanga', 'Katanga', 'Conti', 'Africa']):
+            user.profile.hall_of_residence = hall
+            user.profile.year_group = 2025
+            user.profile.save()
+
+    def assertMatchesRebuild(self):
+        counted = demographics.breakdowns()
+        demographics.rebuild()
+        self.assertEqual(counted, demographics.breakdowns())
+
+    def test_saves_move_users_between_buckets(self):
+        profile = Profile.objects.get(user=self.users[0])
+        profile.hall_of_residence = 'Conti'
+        profile.save(update_fields=['hall_of_residence'])
+        profile.college = 'CoE'
+        profile.save(update_fields=['hometown'])  # college not saved: not counted
+        alumnus = User.objects.only('username').get(pk=self.users[1].pk)
+        alumnus.is_alumni = True
+        alumnus.save()
+
+        counts = demographics.breakdowns()
+        self.assertEqual(counts['hall'], {'Africa': 1, 'Conti': 2, 'Katanga': 1})
+        self.assertEqual(counts['status'], {'alumni': 1, 'student': 3})
+        self.assertEqual(counts['college'], {'unknown': 4})
+        self.assertMatchesRebuild()
+
+    def test_bulk_paths_keep_counts(self):
+        rows = read_roster(SimpleUploadedFile('roster.csv', (
+            b'username,email,student_id,hall_of_residence,year_group\n'
+            b'fresher,fresher@st.knust.edu.gh,20990001,Queens,2029\n'
+        )), 'roster.csv')
+        import_students(rows)
+        with self.captureOnCommitCallbacks(execute=True):
+            rollover.graduate_year_group(2025)
+        User.objects.get(pk=self.users[0].pk).delete()
+        deletion.delete_in_chunks(User, [self.users[1].pk])
+
+        counts = demographics.breakdowns()
+        self.assertEqual(counts['status'], {'alumni': 2, 'student': 1})
+        self.assertEqual(counts['year_group'], {'2025': 2, '2029': 1})
+        self.assertMatchesRebuild()
+
+    def test_endpoint_reads_summary_table(self):
+        admin = User.objects.create_user(username='admin', is_staff=True)
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(admin)
+
+        with CaptureQueriesContext(connection) as queries:
+            data = client.get('/api/users/admin/demographics/').json()
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(data['total_users'], 5)
+        self.assertEqual(data['status'], {'student': 5})
+        self.assertEqual(data['hall'], {'Africa': 1, 'Conti': 1, 'Katanga': 2, 'unknown': 1})
+
+
+def create_product(user, number):
+    return Product.objects.create(
+        seller=user, title=f'Item {number}', price='10.00', category='Books', condition='New',
+        image='market/item.png', description='Test item', whatsapp_number='0200000000',
+    )
+
+
+def create_lost_item(user, number):
+    return LostItem.objects.create(
+        reporter=user, type='Lost', category='Other', description=f'Item {number}', contact_info='0200000000',
+    )
+
+
+def create_welfare_report(user, number):
+    return WelfareReport.objects.create(
+        reporter=user, category='Other', description=f'Report {number}', is_anonymous=False,
+    )
+
+
+def create_executive(user, number):
+    # One post across several academic years keeps each row's user independent
+    return Executive.objects.create(
+        user=user, title='President', rank=number,
+        academic_year=f'{2000 + number}/{2001 + number}', is_current=True,
+    )
+
+
+class UserSummaryListTests(TestCase):
+    """Lists embedding UserSummarySerializer join the profile instead of querying it per row."""
+
+    # (list URL, user field, row factory)
+    endpoints = [
+        ('/api/market/products/', 'seller_details', create_product),
+        ('/api/lost-found/items/', 'reporter_details', create_lost_item),
+        ('/api/welfare/reports/', 'reporter_details', create_welfare_report),
+        ('/api/leadership/', 'user_details', create_executive),
+    ]
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.admin = User.objects.create_user(username='admin', first_name='Ama', last_name='Mensah', is_staff=True)
+        self.admin.profile.profile_picture = 'profiles/admin.png'
+        self.admin.profile.save()
+        self.client.force_authenticate(self.admin)
+        self.student = User.objects.create_user(username='student')
+        self.created = 0
+
+    def create_rows(self, factory, count):
+        # Committing moves the list's version, so cached lists are dropped
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(count):
+                self.created += 1
+                factory(self.admin if self.created % 2 else self.student, self.created)
+
+    def get_list(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+    def test_query_count_is_constant_and_avatars_are_served(self):
+        expected = {
+            self.admin.pk: ('/media/profiles/admin.png', 'Ama Mensah'),
+            self.student.pk: (None, 'student'),
+        }
+        for url, field, factory in self.endpoints:
+            with self.subTest(url=url):
+                self.create_rows(factory, 2)
+                small, _ = self.get_list(url)
+
+                self.create_rows(factory, 8)
+                large, rows = self.get_list(url)
+
+                self.assertEqual(small, large)
+                self.assertEqual(len(rows), 10)
+                for row in rows:
+                    user = row[field]
+                    self.assertEqual((user['avatar'], user['full_name']), expected[user['id']])
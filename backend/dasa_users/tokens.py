@@ -0,0 +1,86 @@
+"""
+Role claims in JWTs.
+
+Tokens issued at login carry the user's role flags (``User.ROLE_FIELDS``),
+username and ``token_version``. The signature makes the claims trustworthy, so
+permission and eligibility checks (staff-only writes, "only active students
+may vote") can read them from the token instead of the user row.
+
+What the signature can't tell is whether the flags changed since the token
+was issued. ``User.save()`` bumps ``token_version`` whenever a role flag
+changes, and authentication compares the token's version with the current
+one: a cache read (``get_token_version``), falling back to a single-column
+query. Tokens with an older version are rejected, and refreshing re-issues
+the claims from the current user.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+TOKEN_VERSION_CLAIM = 'ver'
+# Lets a user's own writes (a vote) be echoed back without loading the row
+USERNAME_CLAIM = 'username'
+TOKEN_VERSION_KEY = 'auth:token_version:{user_id}'
+
+
+def get_token_version(user_id):
+    """The current token version of an active user, or None."""
+    from .models import User
+
+    key = TOKEN_VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}, is_active=True)
+            .values_list('token_version', flat=True)
+            .first()
+        )
+        if version is not None:
+            cache.set(key, version, getattr(settings, 'AUTH_USER_CACHE_SECONDS', 60))
+    return version
+
+
+def forget_token_version(user_id):
+    """Drop the cached token version of a user once the transaction commits."""
+    key = TOKEN_VERSION_KEY.format(user_id=user_id)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def add_role_claims(token, user):
+    for name in user.ROLE_FIELDS:
+        token[name] = getattr(user, name)
+    token[USERNAME_CLAIM] = user.get_username()
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+
+
+class RoleRefreshToken(RefreshToken):
+    """Refresh token carrying role claims, copied into its access tokens."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        add_role_claims(token, user)
+        return token
+
+    @property
+    def access_token(self):
+        user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+        if TOKEN_VERSION_CLAIM in self.payload and self[TOKEN_VERSION_CLAIM] != get_token_version(user_id):
+            from .models import User
+
+            user = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+            if user is not None:
+                add_role_claims(self, user)
+        return super().access_token
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RoleRefreshToken
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RoleRefreshToken
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import UserViewSet, ProfileViewSet, CurrentUserView, AdminDashboardStatsView, AdminActivityView, SystemConfigView, UserExportView
+from .views import UserViewSet, ProfileViewSet, CurrentUserView, AdminDashboardStatsView, AdminDemographicsView, AdminActivityView, SystemConfigView, UserExportView
 
 # Create a router and register viewsets
 router = DefaultRouter()
@@ -10,6 +10,8 @@ router.register(r'profiles', ProfileViewSet, basename='profile')
 urlpatterns = [
     # Admin Stats
     path('admin/stats/', AdminDashboardStatsView.as_view(), name='admin-stats'),
+    # Admin Analytics
+    path('admin/demographics/', AdminDemographicsView.as_view(), name='admin-demographics'),
     # Admin Activity
     path('admin/activity/', AdminActivityView.as_view(), name='admin-activity'),
     # System Configuration
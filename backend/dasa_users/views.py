@@ -2,12 +2,21 @@ from rest_framework import viewsets, permissions, generics, status
 from rest_framework.views import APIView
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import User, Profile, SystemConfig
-from .serializers import UserSerializer, ProfileSerializer, UserRegistrationSerializer, UserUpdateSerializer, AdminUserUpdateSerializer, SystemConfigSerializer, AdminUserCreationSerializer
+from .models import User, Profile, SystemConfig, GraduationRollover, StudentImport
+from .imports import RosterError, import_students, read_roster
+from . import demographics, imports, rollover
+from .serializers import UserSerializer, ProfileSerializer, UserRegistrationSerializer, UserUpdateSerializer, AdminUserUpdateSerializer, SystemConfigSerializer, AdminUserCreationSerializer, DeletionJobSerializer, GraduationRolloverSerializer, StudentImportSerializer
 from rest_framework import status, parsers
 from rest_framework.response import Response
+from django.conf import settings
 from django.http import HttpResponse
+from core import deletion
+from core.caching import get_api_cache
+from core.models import DeletionJob
+from core.singleflight import get_or_compute
+from core.versioning import cache_key
 import csv
+from itertools import islice
 from resources.models import AcademicResource
 from opportunities.models import Opportunity
 from events.models import Event
@@ -33,7 +42,7 @@ class UserViewSet(viewsets.ModelViewSet):
         """
         if self.action == 'create':
             permission_classes = [permissions.AllowAny]
-        elif self.action in ['list', 'update', 'partial_update', 'destroy']:
+        elif self.action in ['list', 'update', 'partial_update', 'destroy', 'bulk_import', 'bulk_import_status', 'bulk_delete', 'bulk_delete_job', 'graduate', 'graduate_status']:
             permission_classes = [permissions.IsAdminUser]
         else:
             permission_classes = [permissions.IsAuthenticated]
@@ -76,6 +85,59 @@ class UserViewSet(viewsets.ModelViewSet):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(
+        detail=False, methods=['post'], permission_classes=[permissions.IsAdminUser],
+        parser_classes=[parsers.MultiPartParser],
+    )
+    def bulk_import(self, request):
+        """
+        Admin endpoint to onboard students from a CSV or XLSX roster.
+        Accessible at: POST /api/users/bulk_import/ (multipart, file field "roster")
+
+        Required columns: username, email, student_id. Optional: password,
+        first_name, last_name, phone_number and the profile fields.
+
+        Invalid rows are skipped and reported by line number; the rest are
+        created. Rosters of up to BULK_IMPORT_SYNC_LIMIT rows are imported
+        right away and the counts and per-row errors returned; larger ones
+        become a background import (202 Accepted) whose progress and report
+        are at GET /api/users/bulk_import/<import_id>/.
+        """
+        roster = request.FILES.get('roster')
+        if roster is None:
+            return Response({'error': 'Upload the roster as the "roster" file field'}, status=status.HTTP_400_BAD_REQUEST)
+
+        limit = getattr(settings, 'BULK_IMPORT_SYNC_LIMIT', imports.SYNC_LIMIT)
+        try:
+            rows = list(islice(read_roster(roster, roster.name), limit + 1))
+        except RosterError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # A cohort takes minutes to hash: import it in the background
+        if len(rows) > limit:
+            job = imports.start_import(roster, roster.name, user=request.user)
+            return Response(
+                {
+                    'message': f'Importing {roster.name} in the background',
+                    'import': StudentImportSerializer(job).data,
+                },
+                status=status.HTTP_202_ACCEPTED
+            )
+
+        report = import_students(rows)
+        return Response(report.as_dict(), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path=r'bulk_import/(?P<import_id>[0-9]+)')
+    def bulk_import_status(self, request, import_id=None):
+        """
+        Progress and report of a background roster import.
+        Accessible at: GET /api/users/bulk_import/<import_id>/
+        """
+        job = StudentImport.objects.filter(pk=import_id).first()
+        if job is None:
+            return Response({'error': 'Import not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(StudentImportSerializer(job).data)
+
     @action(detail=False, methods=['post'], permission_classes=[permissions.IsAdminUser])
     def bulk_delete(self, request):
         """
@@ -87,7 +149,10 @@ class UserViewSet(viewsets.ModelViewSet):
             "user_ids": [1, 2, 3, 4]
         }
 
-        Returns count of deleted users.
+        Users are deleted in chunks (core.deletion). Up to
+        BULK_DELETE_SYNC_LIMIT users are deleted right away and the count is
+        returned; larger batches become a background job (202 Accepted)
+        whose progress is at GET /api/users/bulk_delete/jobs/<job_id>/.
         """
         user_ids = request.data.get('user_ids', [])
 
@@ -97,6 +162,12 @@ class UserViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        if not all(isinstance(user_id, int) and not isinstance(user_id, bool) for user_id in user_ids):
+            return Response(
+                {'error': 'user_ids must contain integer ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         # Prevent admin from deleting themselves
         if request.user.id in user_ids:
             return Response(
@@ -104,8 +175,19 @@ class UserViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        # Large batches (a graduating class) run in the background
+        if len(set(user_ids)) > getattr(settings, 'BULK_DELETE_SYNC_LIMIT', 200):
+            job = deletion.start_job(User, user_ids, user=request.user)
+            return Response(
+                {
+                    'message': f'Deleting {job.total} user(s) in the background',
+                    'job': DeletionJobSerializer(job).data,
+                },
+                status=status.HTTP_202_ACCEPTED
+            )
+
         # Delete users and get count
-        deleted_count, _ = User.objects.filter(id__in=user_ids).delete()
+        deleted_count = deletion.delete_in_chunks(User, user_ids)
 
         return Response(
             {
@@ -115,6 +197,72 @@ class UserViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK
         )
 
+    @action(detail=False, methods=['get'], url_path=r'bulk_delete/jobs/(?P<job_id>[0-9]+)')
+    def bulk_delete_job(self, request, job_id=None):
+        """
+        Progress of a background bulk deletion.
+        Accessible at: GET /api/users/bulk_delete/jobs/<job_id>/
+        """
+        job = DeletionJob.objects.filter(pk=job_id, model=User._meta.label).first()
+        if job is None:
+            return Response({'error': 'Deletion job not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(DeletionJobSerializer(job).data)
+
+    @action(detail=False, methods=['post'])
+    def graduate(self, request):
+        """
+        Admin endpoint to mark a whole year group as alumni.
+        Accessible at: POST /api/users/graduate/
+
+        Expected payload:
+        {
+            "year_group": 2025,
+            "dry_run": true
+        }
+
+        A dry run only returns how many users would graduate. Otherwise the
+        rollover (dasa_users.rollover) runs in the background (202 Accepted)
+        and its outcome is at GET /api/users/graduate/<rollover_id>/.
+        """
+        year_group = request.data.get('year_group')
+        try:
+            year_group = int(year_group)
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'year_group must be a year, e.g. 2025'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if str(request.data.get('dry_run', False)).lower() in ('true', '1'):
+            return Response(
+                {
+                    'year_group': year_group,
+                    'dry_run': True,
+                    'count': rollover.count_graduating(year_group),
+                },
+                status=status.HTTP_200_OK
+            )
+
+        graduation = rollover.start_rollover(year_group, user=request.user)
+        return Response(
+            {
+                'message': f'Marking {graduation.expected} user(s) of year group {year_group} as alumni',
+                'rollover': GraduationRolloverSerializer(graduation).data,
+            },
+            status=status.HTTP_202_ACCEPTED
+        )
+
+    @action(detail=False, methods=['get'], url_path=r'graduate/(?P<rollover_id>[0-9]+)')
+    def graduate_status(self, request, rollover_id=None):
+        """
+        Outcome of a graduation rollover.
+        Accessible at: GET /api/users/graduate/<rollover_id>/
+        """
+        graduation = GraduationRollover.objects.filter(pk=rollover_id).first()
+        if graduation is None:
+            return Response({'error': 'Rollover not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(GraduationRolloverSerializer(graduation).data)
+
 
 class ProfileViewSet(viewsets.ModelViewSet):
     """
@@ -282,10 +430,32 @@ class RegisterView(generics.CreateAPIView):
 class AdminDashboardStatsView(APIView):
     """
     API endpoint for Admin Dashboard statistics.
+
+    Every open dashboard polls this, so the counts are cached until one of
+    the counted models changes (at most a minute, since "active" and
+    "upcoming" depend on the time) and recomputed by one request at a time.
     """
     permission_classes = [permissions.IsAdminUser]
 
     def get(self, request):
+        from elections.models import Election
+        from announcements.models import Announcement
+        from market.models import Product
+        from welfare.models import WelfareReport
+        from django.utils import timezone
+
+        targets = [User, Election, Announcement, AcademicResource, Opportunity, Event, Product, WelfareReport]
+        minute = timezone.now().replace(second=0, microsecond=0).isoformat()
+        data = get_or_compute(
+            get_api_cache(),
+            cache_key('dashboard:stats', targets, minute),
+            self.compute_stats,
+            settings.API_CACHE_TIMEOUT,
+            stale_key=cache_key('dashboard:stats', []),
+        )
+        return Response(data)
+
+    def compute_stats(self):
         from elections.models import Election
         from announcements.models import Announcement
         from django.utils import timezone
@@ -339,6 +509,23 @@ class AdminDashboardStatsView(APIView):
             "total_opportunities": active_opportunities,
             "total_events": upcoming_events,
         }
+        return data
+
+
+class AdminDemographicsView(APIView):
+    """
+    API endpoint for membership breakdowns (admin analytics).
+    Accessible at: GET /api/users/admin/demographics/
+
+    Returns user counts per status (student/alumni/other), hall, college,
+    year group and gender, read from the summary table kept by
+    dasa_users.demographics, so the cost doesn't grow with membership.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        data = demographics.breakdowns()
+        data['total_users'] = sum(data['status'].values())
         return Response(data)
 
 
@@ -360,7 +547,21 @@ class AdminActivityView(APIView):
         from market.models import Product
         from welfare.models import WelfareReport
         from lost_found.models import LostItem
-        from django.utils import timezone
+
+        # Cached until a new user, product, report or item comes in
+        data = get_or_compute(
+            get_api_cache(),
+            cache_key('dashboard:activity', [User, Product, WelfareReport, LostItem]),
+            self.compute_activities,
+            settings.API_CACHE_TIMEOUT,
+            stale_key=cache_key('dashboard:activity', []),
+        )
+        return Response(data)
+
+    def compute_activities(self):
+        from market.models import Product
+        from welfare.models import WelfareReport
+        from lost_found.models import LostItem
 
         activities = []
 
@@ -438,7 +639,7 @@ class AdminActivityView(APIView):
         for activity in activities:
             del activity['timestamp']
 
-        return Response({'activities': activities})
+        return {'activities': activities}
 
 
 class SystemConfigView(APIView):
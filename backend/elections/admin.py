@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Election, Position, Candidate, Vote
+from .models import Election, Position, Candidate, Vote, ResultSnapshot
 
 
 @admin.register(Election)
@@ -44,3 +44,13 @@ class VoteAdmin(admin.ModelAdmin):
     def has_change_permission(self, request, obj=None):
         # Prevent vote modification
         return False
+
+
+@admin.register(ResultSnapshot)
+class ResultSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['election', 'version', 'published_by', 'published_at']
+    readonly_fields = ['election', 'version', 'results', 'candidates', 'published_by', 'published_at']
+
+    def has_add_permission(self, request):
+        # Snapshots are taken by publishing results
+        return False
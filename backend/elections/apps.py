@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class ElectionsConfig(AppConfig):
     name = "elections"
+
+    def ready(self):
+        """
+        Import signals when the app is ready.
+        This keeps the turnout counts (elections.turnout) in step with votes.
+        """
+        import elections.signals
@@ -0,0 +1,25 @@
+"""
+Management command to recount election turnout from the votes.
+
+The per-segment turnout behind GET /api/elections/{id}/turnout/ is kept up
+to date as votes are cast (see elections.turnout); this recounts it from
+the votes, e.g. to correct drift after a manual fix.
+
+Usage:
+    python manage.py rebuild_turnout
+    python manage.py rebuild_turnout 3 4
+"""
+
+from django.core.management.base import BaseCommand
+from elections import turnout
+
+
+class Command(BaseCommand):
+    help = 'Recount distinct voters per segment from the votes of each election'
+
+    def add_arguments(self, parser):
+        parser.add_argument('election_ids', nargs='*', type=int, help='Elections to rebuild (default: all)')
+
+    def handle(self, *args, **options):
+        rebuilt = turnout.rebuild(options['election_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Turnout rebuilt for {rebuilt} election(s).'))
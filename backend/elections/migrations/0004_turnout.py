@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def count_existing_voters(apps, schema_editor):
+    from elections import turnout
+
+    turnout.rebuild(registry=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("elections", "0003_result_snapshot"),
+        ("dasa_users", "0003_alter_profile_year_group"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ElectionVoter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hall", models.CharField(max_length=50)),
+                ("college", models.CharField(max_length=50)),
+                ("year_group", models.CharField(max_length=50)),
+                ("gender", models.CharField(max_length=50)),
+                ("voted_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "election",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="voters",
+                        to="elections.election",
+                    ),
+                ),
+                (
+                    "voter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("election", "voter")},
+            },
+        ),
+        migrations.CreateModel(
+            name="TurnoutCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("dimension", models.CharField(max_length=20)),
+                ("value", models.CharField(max_length=50)),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "election",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="turnout_counts",
+                        to="elections.election",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("election", "dimension", "value")},
+            },
+        ),
+        migrations.RunPython(count_existing_voters, migrations.RunPython.noop),
+    ]
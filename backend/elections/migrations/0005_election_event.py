@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def record_existing_counts(apps, schema_editor):
+    from elections import stream
+
+    stream.backfill(registry=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("elections", "0004_turnout"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ElectionEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("vote", "Vote"), ("voter", "Voter")], max_length=10
+                    ),
+                ),
+                ("data", models.JSONField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "election",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="events",
+                        to="elections.election",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(record_existing_counts, migrations.RunPython.noop),
+    ]
@@ -47,4 +47,86 @@ class Vote(models.Model):
         unique_together = ('voter', 'position') 
 
     def __str__(self):
-        return f"Vote by {self.voter} for {self.position}"
\ No newline at end of file
+        return f"Vote by {self.voter} for {self.position}"
+
+class ResultSnapshot(models.Model):
+    """
+    Results frozen when an election is published (see elections.results).
+
+    Holds the rendered JSON of the results summary and of the candidate
+    list, so published results are served without counting votes or
+    serializing anything. Only rebuilt when an admin publishes again.
+    """
+    election = models.OneToOneField(Election, on_delete=models.CASCADE, related_name='result_snapshot')
+    version = models.PositiveIntegerField(default=1)
+    results = models.TextField()
+    candidates = models.TextField()
+    published_at = models.DateTimeField(auto_now=True)
+    published_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+
+    def __str__(self):
+        return f"Results of {self.election.title} (v{self.version})"
+
+
+class ElectionVoter(models.Model):
+    """
+    One row per user who has voted in an election (see elections.turnout).
+
+    The voter's hall, college, year group and gender are copied from their
+    profile when they cast their first vote, so turnout per segment doesn't
+    shift if the profile changes later in the election.
+    """
+    election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name='voters')
+    voter = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    hall = models.CharField(max_length=50)
+    college = models.CharField(max_length=50)
+    year_group = models.CharField(max_length=50)
+    gender = models.CharField(max_length=50)
+    voted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('election', 'voter')
+
+    def __str__(self):
+        return f"{self.voter} voted in {self.election}"
+
+
+class TurnoutCount(models.Model):
+    """Distinct voters of an election in one segment, e.g. hall=Katanga."""
+    election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name='turnout_counts')
+    dimension = models.CharField(max_length=20)
+    value = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('election', 'dimension', 'value')
+
+    def __str__(self):
+        return f"{self.election}: {self.dimension}={self.value}: {self.count}"
+
+
+class ElectionEvent(models.Model):
+    """
+    A change to an election's tallies or turnout, for live streams
+    (see elections.stream). The primary key is the event id clients resume
+    from, so events are only ever appended.
+
+    ``kind`` is "vote" (``data``: position_id, candidate_id, delta) or
+    "voter" (``data``: segments, delta).
+    """
+    KIND_VOTE = 'vote'
+    KIND_VOTER = 'voter'
+    KIND_CHOICES = [
+        (KIND_VOTE, 'Vote'),
+        (KIND_VOTER, 'Voter'),
+    ]
+
+    election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name='events')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    data = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.kind} event {self.pk} of {self.election}"
@@ -0,0 +1,138 @@
+"""
+Election results: live statistics and the snapshot frozen at publish time.
+
+While an election runs, ``build_stats`` counts votes for the admin
+dashboard. Once ``publish`` has marked it published the results are final,
+so the summary and the candidate list (as ``CandidateSerializer`` renders
+it, vote counts included) are rendered to JSON once and stored in a
+ResultSnapshot row. The result views serve that JSON as it is.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from core.querysets import plan_for_serializer
+from core.renderers import FastJSONRenderer
+from . import turnout
+from .models import Candidate, Position, ResultSnapshot, Vote
+from .serializers import CandidateSerializer
+
+
+def build_stats(election, request):
+    """Vote counts, turnout and results by position for ``election``."""
+    # Get all positions for this election
+    positions = Position.objects.filter(election=election).order_by('rank')
+
+    # Total votes cast across all positions
+    total_votes_cast = Vote.objects.filter(position__election=election).count()
+
+    # Unique voters (distinct users who voted in any position), counted as
+    # they cast their first vote
+    total_voters = turnout.total_voters(election.pk)
+
+    # Total registered users (students only)
+    total_registered_users = turnout.registered_students()
+
+    # Turnout percentage
+    turnout_percentage = (total_voters / total_registered_users * 100) if total_registered_users > 0 else 0
+
+    # Results by position
+    results_by_position = []
+    for position in positions:
+        # Get all candidates for this position with their vote counts
+        candidates = Candidate.objects.filter(position=position).select_related('user').annotate(
+            vote_count=Count('vote')
+        ).order_by('-vote_count')
+
+        candidate_results = []
+        for candidate in candidates:
+            candidate_results.append({
+                'candidate_id': candidate.id,
+                'candidate_name': f"{candidate.user.first_name} {candidate.user.last_name}",
+                'candidate_username': candidate.user.username,
+                'photo': request.build_absolute_uri(candidate.photo.url) if candidate.photo else None,
+                'vote_count': candidate.vote_count,
+            })
+
+        # Total votes for this position
+        position_total_votes = sum(c['vote_count'] for c in candidate_results)
+
+        results_by_position.append({
+            'position_id': position.id,
+            'position_name': position.name,
+            'rank': position.rank,
+            'total_votes': position_total_votes,
+            'candidates': candidate_results,
+        })
+
+    return {
+        'election_id': election.id,
+        'election_title': election.title,
+        'is_active': election.is_active,
+        'is_published': election.is_published,
+        'total_votes_cast': total_votes_cast,
+        'total_voters': total_voters,
+        'total_registered_users': total_registered_users,
+        'turnout_percentage': round(turnout_percentage, 2),
+        'results_by_position': results_by_position,
+    }
+
+
+def candidate_queryset(election_id):
+    """The candidate list of one election, as CandidateViewSet serves it."""
+    queryset = Candidate.objects.annotate(
+        total_votes=Count('vote')
+    ).filter(position__election_id=election_id).order_by('position__rank', 'id')
+    return plan_for_serializer(CandidateSerializer).apply(queryset)
+
+
+def publish(election, request):
+    """
+    Mark ``election`` published and freeze its results.
+
+    Publishing again rebuilds the snapshot under a new version.
+    """
+    renderer = FastJSONRenderer()
+    with transaction.atomic():
+        election.is_published = True
+        election.save()
+
+        stats = build_stats(election, request)
+        candidates = CandidateSerializer(
+            candidate_queryset(election.pk), many=True, context={'request': request}
+        ).data
+
+        snapshot, created = ResultSnapshot.objects.select_for_update().get_or_create(
+            election=election,
+            defaults={'results': '', 'candidates': '', 'published_by': request.user},
+        )
+        if not created:
+            snapshot.version = F('version') + 1
+            snapshot.save(update_fields=['version'])
+            snapshot.refresh_from_db(fields=['version'])
+
+        stats['version'] = snapshot.version
+        snapshot.results = renderer.render(stats).decode()
+        snapshot.candidates = renderer.render(candidates).decode()
+        snapshot.published_by = request.user
+        snapshot.save(update_fields=['results', 'candidates', 'published_by', 'published_at'])
+    return snapshot
+
+
+def get_published_snapshot(election_id, fields=('results',)):
+    """
+    The snapshot of a published election, or None.
+
+    Unpublishing an election (is_published=False) hides its snapshot
+    without deleting it. Only ``fields`` and the version are loaded.
+    """
+    return (
+        ResultSnapshot.objects
+        .filter(election_id=election_id, election__is_published=True)
+        .only('id', 'election_id', 'version', *fields)
+        .first()
+    )
+
+
+def etag_for(snapshot):
+    return f'"results-{snapshot.election_id}-{snapshot.version}"'
@@ -130,7 +130,9 @@ class CandidateSerializer(serializers.ModelSerializer):
 
 class VoteSerializer(serializers.ModelSerializer):
     """Serializer for the Vote model"""
-    voter_username = serializers.CharField(source='voter.username', read_only=True)
+    select_related = ['voter']
+
+    voter_username = serializers.SerializerMethodField()
     position_name = serializers.CharField(source='position.name', read_only=True)
     candidate_name = serializers.CharField(source='candidate.user.get_full_name', read_only=True)
 
@@ -148,6 +150,13 @@ class VoteSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'voter', 'timestamp']
 
+    def get_voter_username(self, obj):
+        # A voter's own votes take it from their token, without loading the user
+        request = self.context.get('request')
+        if request is not None and request.user.is_authenticated and request.user.pk == obj.voter_id:
+            return request.user.username
+        return obj.voter.username
+
     def validate(self, data):
         """
         Validate that:
@@ -0,0 +1,48 @@
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core.deletion import pre_bulk_delete
+from . import stream, turnout
+from .models import ElectionVoter, Position, Vote
+
+@receiver(post_save, sender=Vote)
+def count_voter(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        segments = turnout.record_vote(instance)
+        election_id = instance.position.election_id
+        events = [stream.vote_event(election_id, instance.position_id, instance.candidate_id, 1)]
+        if segments is not None:
+            events.append(stream.voter_event(election_id, segments, 1))
+        stream.record(events)
+
+@receiver(post_delete, sender=Vote)
+def stream_deleted_vote(sender, instance, **kwargs):
+    election_id = Position.objects.filter(pk=instance.position_id).values_list('election_id', flat=True).first()
+    if election_id is not None:
+        stream.record_on_commit([stream.vote_event(election_id, instance.position_id, instance.candidate_id, -1)])
+
+@receiver(pre_bulk_delete, sender=Vote)
+def stream_deleted_votes(sender, pks, **kwargs):
+    rows = Vote.objects.filter(pk__in=pks).order_by().values(
+        'position__election_id', 'position_id', 'candidate_id'
+    ).annotate(votes=Count('pk'))
+    stream.record_on_commit([
+        stream.vote_event(row['position__election_id'], row['position_id'], row['candidate_id'], -row['votes'])
+        for row in rows
+    ])
+
+@receiver(post_delete, sender=ElectionVoter)
+def uncount_voter(sender, instance, **kwargs):
+    turnout.uncount_voter(instance)
+    segments = {segment: getattr(instance, segment) for segment in turnout.SEGMENTS}
+    stream.record_on_commit([stream.voter_event(instance.election_id, segments, -1)])
+
+@receiver(pre_bulk_delete, sender=ElectionVoter)
+def uncount_voters_before_bulk_delete(sender, pks, **kwargs):
+    rows = turnout.uncount_voters(ElectionVoter.objects.filter(pk__in=pks))
+    stream.record_on_commit([
+        stream.voter_event(
+            row['election_id'], {segment: row[segment] for segment in turnout.SEGMENTS}, -row['rows']
+        )
+        for row in rows
+    ])
@@ -0,0 +1,432 @@
+"""
+Live election results and turnout as server-sent events.
+
+Admin screens following an election used to poll the stats endpoint,
+recounting on every poll. Instead, every change to an election's tallies
+or turnout is appended to the ElectionEvent table as a delta:
+
+- "vote": a vote was cast (delta 1) or removed (negative delta) for
+  ``candidate_id`` in ``position_id``;
+- "voter": a voter turned out (delta 1) or left the count, with their
+  segments (hall, college, year group, gender; see elections.turnout).
+
+Votes write their events in the voting transaction, so an event exists
+if and only if its vote committed. Removals are written after commit, as
+they happen inside cascades (an election being deleted takes its events
+with it).
+
+Reading side, per server process:
+
+- one poller (``_Broker``) reads new events for all elections, one query
+  per ``ELECTION_STREAM_POLL_SECONDS`` while anyone is listening, and
+  sooner when a vote commits in the same process (``notify``);
+- per election a ``_Feed`` keeps the current tallies and turnout in
+  memory, loaded once from the election's events, plus the last
+  ``ELECTION_STREAM_REPLAY_EVENTS`` events;
+- each connection gets a "snapshot" event from the feed, or the events
+  it missed if it resumes with ``Last-Event-ID`` still in the replay
+  buffer, then the live events, with a heartbeat comment every
+  ``ELECTION_STREAM_HEARTBEAT_SECONDS`` of silence.
+
+So the database load is the same with one admin screen or a hundred.
+
+Event ids are the table's primary keys and are delivered in order. A
+transaction still in flight can commit a lower id after a higher one, so
+the poller stops at a gap and waits up to ``ELECTION_STREAM_GAP_SECONDS``
+for it to fill before skipping it (a rolled-back vote never fills it).
+
+The stream is an async view and needs an ASGI server
+(e.g. ``uvicorn core.asgi:application``) to hold many connections.
+
+Browsers' EventSource can't send an Authorization header, and URLs end up
+in access logs, so the JWT never goes in the stream URL. Admins ask for a
+stream token (``make_token``) instead: signed, valid for one election and
+``ELECTION_STREAM_TOKEN_SECONDS``, checked only when connecting.
+"""
+
+import asyncio
+import json
+import logging
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core import signing
+from django.db import close_old_connections, transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = 1
+HEARTBEAT_SECONDS = 15
+REPLAY_EVENTS = 1000
+GAP_SECONDS = 5
+QUEUE_SIZE = 1000
+TOKEN_SECONDS = 60
+BATCH_SIZE = 500
+TOKEN_SALT = 'elections.stream'
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='election-stream')
+
+
+def _setting(name, default):
+    return getattr(settings, f'ELECTION_STREAM_{name}', default)
+
+
+# Access
+
+def make_token(user, election_id):
+    """A short-lived token letting ``user`` open ``election_id``'s stream."""
+    return signing.dumps({'user': user.pk, 'election': election_id}, salt=TOKEN_SALT)
+
+
+def read_token(token, election_id):
+    """
+    The id of the user a stream token was issued to, or None if it is
+    forged, expired or for another election.
+    """
+    try:
+        claims = signing.loads(token, salt=TOKEN_SALT, max_age=_setting('TOKEN_SECONDS', TOKEN_SECONDS))
+    except signing.BadSignature:  # SignatureExpired included
+        return None
+    if claims.get('election') != election_id:
+        return None
+    return claims.get('user')
+
+
+# Writing
+
+def vote_event(election_id, position_id, candidate_id, delta):
+    from .models import ElectionEvent
+
+    return ElectionEvent(
+        election_id=election_id, kind=ElectionEvent.KIND_VOTE,
+        data={'position_id': position_id, 'candidate_id': candidate_id, 'delta': delta},
+    )
+
+
+def voter_event(election_id, segments, delta):
+    from .models import ElectionEvent
+
+    return ElectionEvent(
+        election_id=election_id, kind=ElectionEvent.KIND_VOTER,
+        data={'segments': segments, 'delta': delta},
+    )
+
+
+def record(events):
+    """Append ``events`` in the current transaction; wake the stream after commit."""
+    from .models import ElectionEvent
+
+    if events:
+        ElectionEvent.objects.bulk_create(events)
+        transaction.on_commit(notify)
+
+
+def record_on_commit(events):
+    """Append ``events`` once the current transaction commits, skipping deleted elections."""
+    from .models import Election, ElectionEvent
+
+    def append():
+        existing = set(Election.objects.filter(
+            pk__in={event.election_id for event in events}
+        ).values_list('pk', flat=True))
+        ElectionEvent.objects.bulk_create([event for event in events if event.election_id in existing])
+        notify()
+
+    if events:
+        transaction.on_commit(append)
+
+
+def backfill(registry=apps):
+    """
+    Events for the votes and voters already counted, so streams of
+    elections started before the event table existed add up. Migrations
+    pass their historical ``registry``.
+    """
+    ElectionEvent = registry.get_model('elections', 'ElectionEvent')
+    ElectionVoter = registry.get_model('elections', 'ElectionVoter')
+    Vote = registry.get_model('elections', 'Vote')
+    from .turnout import SEGMENTS
+
+    events = [
+        ElectionEvent(election_id=row['position__election_id'], kind='vote', data={
+            'position_id': row['position_id'], 'candidate_id': row['candidate_id'], 'delta': row['votes'],
+        })
+        for row in Vote.objects.order_by().values(
+            'position__election_id', 'position_id', 'candidate_id'
+        ).annotate(votes=Count('pk'))
+    ]
+    events += [
+        ElectionEvent(election_id=row['election_id'], kind='voter', data={
+            'segments': {segment: row[segment] for segment in SEGMENTS}, 'delta': row['voters'],
+        })
+        for row in ElectionVoter.objects.order_by().values('election_id', *SEGMENTS).annotate(voters=Count('pk'))
+    ]
+    ElectionEvent.objects.bulk_create(events, batch_size=BATCH_SIZE)
+
+
+# Reading
+
+def _in_thread(fn, *args):
+    close_old_connections()
+    try:
+        return fn(*args)
+    finally:
+        close_old_connections()
+
+
+async def _run(fn, *args):
+    """Run database work off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_executor, _in_thread, fn, *args)
+
+
+def _start_cursor():
+    """The id to start polling after: events older than the gap window are settled."""
+    from .models import ElectionEvent
+
+    settled = timezone.now() - timedelta(seconds=_setting('GAP_SECONDS', GAP_SECONDS))
+    return ElectionEvent.objects.filter(created_at__lt=settled).aggregate(last=Max('id'))['last'] or 0
+
+
+def _events_after(cursor, limit):
+    from .models import ElectionEvent
+
+    return list(
+        ElectionEvent.objects.filter(id__gt=cursor).order_by('id')
+        .values_list('id', 'election_id', 'kind', 'data', 'created_at')[:limit]
+    )
+
+
+def _history(election_id, cursor):
+    from .models import ElectionEvent
+
+    return list(
+        ElectionEvent.objects.filter(election_id=election_id, id__lte=cursor)
+        .values_list('kind', 'data').iterator()
+    )
+
+
+def format_event(event_id, kind, data):
+    """One server-sent event."""
+    return f'id: {event_id}\nevent: {kind}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+class _Subscriber:
+    def __init__(self):
+        self.queue = asyncio.Queue(maxsize=_setting('QUEUE_SIZE', QUEUE_SIZE))
+        self.overflowed = False
+
+
+class _Feed:
+    """Tallies, turnout and recent events of one election, in memory."""
+
+    def __init__(self, cursor):
+        self.tallies = defaultdict(Counter)
+        self.total_voters = 0
+        self.segments = defaultdict(Counter)
+        self.recent = deque()
+        # Events up to this id are folded into the state, not replayable
+        self.floor = cursor
+        self.subscribers = set()
+
+    def fold(self, kind, data):
+        delta = data['delta']
+        if kind == 'vote':
+            self.tallies[data['position_id']][data['candidate_id']] += delta
+        else:
+            self.total_voters += delta
+            for segment, value in data['segments'].items():
+                self.segments[segment][value] += delta
+
+    def apply(self, event):
+        event_id, kind, data = event
+        self.fold(kind, data)
+        if len(self.recent) >= _setting('REPLAY_EVENTS', REPLAY_EVENTS):
+            self.floor = self.recent.popleft()[0]
+        self.recent.append(event)
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too slow: it is closed and reconnects with Last-Event-ID
+                subscriber.overflowed = True
+                self.subscribers.discard(subscriber)
+
+    def snapshot(self):
+        return {
+            'tallies': {
+                str(position): {str(candidate): votes for candidate, votes in candidates.items() if votes > 0}
+                for position, candidates in self.tallies.items()
+            },
+            'turnout': {
+                'total_voters': self.total_voters,
+                'segments': {
+                    segment: {value: count for value, count in values.items() if count > 0}
+                    for segment, values in self.segments.items()
+                },
+            },
+        }
+
+    def replay(self, last_event_id, cursor):
+        """Events after ``last_event_id``, or None if they are no longer all here."""
+        if last_event_id is None or not self.floor <= last_event_id <= cursor:
+            return None
+        return [event for event in self.recent if event[0] > last_event_id]
+
+
+class _Broker:
+    """Polls new events for every election and hands them to the feeds."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.cursor = None
+        self.feeds = {}
+        self.lock = asyncio.Lock()
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    async def poll(self):
+        """Deliver the events committed since the last poll (call with the lock held)."""
+        limit = _setting('BATCH_SIZE', BATCH_SIZE)
+        grace = timedelta(seconds=_setting('GAP_SECONDS', GAP_SECONDS))
+        while True:
+            rows = await _run(_events_after, self.cursor, limit)
+            now = timezone.now()
+            for event_id, election_id, kind, data, created_at in rows:
+                if event_id != self.cursor + 1 and now - created_at < grace:
+                    return  # wait for the gap to fill
+                self.cursor = event_id
+                feed = self.feeds.get(election_id)
+                if feed is not None:
+                    feed.apply((event_id, kind, data))
+            if len(rows) < limit:
+                return
+
+    async def subscribe(self, election_id, last_event_id):
+        """A new subscriber and what to send it first: a snapshot or missed events."""
+        async with self.lock:
+            if self.cursor is None:
+                self.cursor = await _run(_start_cursor)
+            await self.poll()
+            feed = self.feeds.get(election_id)
+            if feed is None:
+                feed = _Feed(self.cursor)
+                for kind, data in await _run(_history, election_id, self.cursor):
+                    feed.fold(kind, data)
+                self.feeds[election_id] = feed
+
+            subscriber = _Subscriber()
+            feed.subscribers.add(subscriber)
+            missed = feed.replay(last_event_id, self.cursor)
+            if missed is None:
+                first = [format_event(self.cursor, 'snapshot', feed.snapshot())]
+            else:
+                first = [format_event(*event) for event in missed]
+        if self.task is None:
+            self.task = self.loop.create_task(self.run())
+        return feed, subscriber, first
+
+    async def run(self):
+        interval = _setting('POLL_SECONDS', POLL_SECONDS)
+        try:
+            while any(feed.subscribers for feed in self.feeds.values()):
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), interval)
+                except asyncio.TimeoutError:
+                    pass
+                self.wakeup.clear()
+                try:
+                    async with self.lock:
+                        await self.poll()
+                except Exception:
+                    logger.exception("Election stream poll failed")
+        finally:
+            self.task = None
+
+
+_broker = None
+
+
+def _get_broker():
+    global _broker
+    loop = asyncio.get_running_loop()
+    if _broker is None or _broker.loop is not loop:
+        _broker = _Broker(loop)
+    return _broker
+
+
+def _call_in_loop(broker, callback, *args):
+    """Run ``callback`` in ``broker``'s event loop, from any thread; no-op once it has closed."""
+    if broker.loop.is_closed():
+        return
+    try:
+        broker.loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        pass  # closed meanwhile
+
+
+def notify():
+    """Wake this process's poller, e.g. after a vote commits."""
+    broker = _broker
+    if broker is not None and broker.task is not None:
+        _call_in_loop(broker, broker.wakeup.set)
+
+
+class EventStream:
+    """
+    The server-sent events of one connection to an election's stream.
+
+    The response calls ``close`` when the connection ends (whatever the
+    thread), which unsubscribes it at once instead of whenever the
+    suspended iterator is garbage collected.
+    """
+
+    def __init__(self, election_id, last_event_id=None):
+        self.election_id = election_id
+        self.last_event_id = last_event_id
+        self.broker = self.feed = self.subscriber = None
+        self.closed = False
+        self._chunks = self._generate()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self._chunks.__anext__()
+
+    async def _generate(self):
+        self.broker = _get_broker()
+        self.feed, self.subscriber, first = await self.broker.subscribe(self.election_id, self.last_event_id)
+        heartbeat = _setting('HEARTBEAT_SECONDS', HEARTBEAT_SECONDS)
+        try:
+            if self.closed:
+                return
+            for chunk in first:
+                yield chunk
+            while not (self.subscriber.overflowed and self.subscriber.queue.empty()):
+                try:
+                    event = await asyncio.wait_for(self.subscriber.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ': heartbeat\n\n'
+                    continue
+                if event is None:
+                    return  # closed
+                yield format_event(*event)
+        finally:
+            self.feed.subscribers.discard(self.subscriber)
+
+    def _unsubscribe(self):
+        self.feed.subscribers.discard(self.subscriber)
+        try:
+            self.subscriber.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            self.subscriber.overflowed = True
+
+    def close(self):
+        self.closed = True
+        if self.feed is not None:
+            _call_in_loop(self.broker, self._unsubscribe)
@@ -1,3 +1,417 @@
-from django.test import TestCase
+import asyncio
+import json
+import re
+from datetime import timedelta
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core import deletion
+from dasa_users.authentication import user_cache
+from dasa_users.models import User
+from dasa_users.tokens import RoleRefreshToken
+from . import stream, turnout
+from .models import Election, Position, Candidate, Vote
 
-# Create your tests here.
+
+class ElectionListQueryCountTests(TestCase):
+    """Position, candidate and vote lists must not issue queries per row."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pass12345', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        now = timezone.now()
+        self.election = Election.objects.create(
+            title='General Elections',
+            start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=1),
+            is_active=True,
+        )
+        self.created = 0
+
+    def create_positions(self, count):
+        # Every position gets one candidate and one vote from the same user
+        for _ in range(count):
+            self.created += 1
+            position = Position.objects.create(election=self.election, name=f'Post {self.created}', rank=self.created)
+            candidate = Candidate.objects.create(
+                position=position, user=self.admin, manifesto='Vote for me', photo='candidates/c.png'
+            )
+            Vote.objects.create(voter=self.admin, position=position, candidate=candidate)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+    def assert_constant_queries(self, url):
+        self.create_positions(2)
+        small, _ = self.count_queries(url)
+        self.create_positions(8)
+        large, data = self.count_queries(url)
+        self.assertEqual(small, large)
+        self.assertEqual(len(data), self.created)
+        return data
+
+    def test_position_list(self):
+        data = self.assert_constant_queries('/api/elections/positions/')
+        self.assertEqual(data[0]['election_title'], 'General Elections')
+
+    def test_candidate_list(self):
+        data = self.assert_constant_queries('/api/elections/candidates/')
+        self.assertEqual(data[0]['user_details']['username'], 'admin')
+
+    def test_vote_list(self):
+        data = self.assert_constant_queries('/api/elections/votes/')
+        self.assertEqual(data[0]['voter_username'], 'admin')
+
+
+class VoteClaimsTests(TestCase):
+    """Voting with a role-claims token never loads the voter's row."""
+
+    def setUp(self):
+        self.student = User.objects.create_user(username='student')
+        now = timezone.now()
+        election = Election.objects.create(
+            title='General Elections', start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=1), is_active=True,
+        )
+        self.positions, self.candidates = [], []
+        for rank in (1, 2):
+            position = Position.objects.create(election=election, name=f'Post {rank}', rank=rank)
+            self.positions.append(position)
+            self.candidates.append(Candidate.objects.create(
+                position=position, user=User.objects.create_user(username=f'candidate{rank}'),
+                manifesto='Vote for me', photo='candidates/c.png',
+            ))
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RoleRefreshToken.for_user(self.student).access_token}')
+        user_cache.clear()
+
+    def vote(self, index):
+        return self.client.post('/api/elections/votes/', {
+            'position': self.positions[index].pk, 'candidate': self.candidates[index].pk,
+        }, format='json')
+
+    def assert_voter_not_loaded(self, queries):
+        # Candidates' users are still read for candidate_name
+        voter = re.compile(rf'FROM "dasa_users_user".* WHERE .*"dasa_users_user"\."id" = {self.student.pk}\b')
+        self.assertFalse([q['sql'] for q in queries if voter.search(q['sql'])])
+
+    def test_vote_and_my_votes_read_claims_only(self):
+        # The first request caches the token version check
+        self.assertEqual(self.vote(0).status_code, 201)
+
+        user_cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.vote(1)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['voter_username'], 'student')
+        self.assert_voter_not_loaded(queries)
+
+        user_cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/elections/votes/my_votes/')
+        self.assertEqual([vote['voter_username'] for vote in response.json()], ['student', 'student'])
+        self.assert_voter_not_loaded(queries)
+
+
+class PublishedResultsSnapshotTests(TestCase):
+    """Published results are frozen and served without counting votes."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pass12345', is_staff=True)
+        # Profiles need distinct student IDs
+        self.admin.profile.student_id = 'A0001'
+        self.admin.profile.save()
+        self.student = User.objects.create_user(username='student', password='pass12345')
+        self.admin_client = APIClient(HTTP_HOST='localhost')
+        self.admin_client.force_authenticate(self.admin)
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(self.student)
+        now = timezone.now()
+        self.election = Election.objects.create(
+            title='General Elections',
+            start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=1),
+            is_active=True,
+        )
+        self.position = Position.objects.create(election=self.election, name='President', rank=1)
+        self.candidate = Candidate.objects.create(
+            position=self.position, user=self.admin, manifesto='Vote for me', photo='candidates/c.png'
+        )
+        Vote.objects.create(voter=self.student, position=self.position, candidate=self.candidate)
+
+    def publish(self):
+        response = self.admin_client.post(f'/api/elections/elections/{self.election.id}/publish_results/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['version']
+
+    def test_results_hidden_until_published(self):
+        response = self.client.get(f'/api/elections/elections/{self.election.id}/results/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_results_need_a_login_and_stay_private(self):
+        version = self.publish()
+        anonymous = APIClient(HTTP_HOST='localhost')
+        self.assertEqual(anonymous.get(f'/api/elections/elections/{self.election.id}/results/').status_code, 401)
+
+        for url in [
+            f'/api/elections/elections/{self.election.id}/results/',
+            f'/api/elections/elections/{self.election.id}/results/?v={version}',
+            f'/api/elections/candidates/?election={self.election.id}',
+        ]:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('private', response['Cache-Control'])
+                self.assertNotIn('public', response['Cache-Control'])
+                self.assertIn('Authorization', response['Vary'])
+
+    def test_results_served_from_snapshot(self):
+        self.publish()
+        # A vote arriving after publication doesn't change the frozen results
+        Vote.objects.filter(position=self.position).delete()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/elections/elections/{self.election.id}/results/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+        results = response.json()
+        self.assertEqual(results['total_votes_cast'], 1)
+        self.assertEqual(results['results_by_position'][0]['candidates'][0]['vote_count'], 1)
+
+        candidates = self.client.get(f'/api/elections/candidates/?election={self.election.id}').json()
+        self.assertEqual(candidates[0]['total_votes'], 1)
+
+    def test_republish_rebuilds_snapshot(self):
+        first = self.publish()
+        etag = self.client.get(f'/api/elections/elections/{self.election.id}/results/')['ETag']
+        Vote.objects.filter(position=self.position).delete()
+        second = self.publish()
+
+        self.assertEqual(second, first + 1)
+        response = self.client.get(
+            f'/api/elections/elections/{self.election.id}/results/?v={second}', HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_votes_cast'], 0)
+        self.assertIn('immutable', response['Cache-Control'])
+
+
+class TurnoutTests(TestCase):
+    """Turnout is counted per segment as voters cast their first vote."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', is_staff=True)
+        self.students = []
+        for i, hall in enumerate(['Katanga', 'Katanga', 'Conti']):
+            student = User.objects.create_user(username=f'student{i}')
+            student.profile.hall_of_residence = hall
+            student.profile.save()
+            self.students.append(student)
+        now = timezone.now()
+        self.election = Election.objects.create(
+            title='General Elections', start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=1), is_active=True,
+        )
+        self.positions, self.candidates = [], []
+        for rank, name in enumerate(['President', 'Secretary'], start=1):
+            position = Position.objects.create(election=self.election, name=name, rank=rank)
+            self.positions.append(position)
+            self.candidates.append(Candidate.objects.create(
+                position=position, user=self.admin, manifesto='Vote for me', photo='candidates/c.png'
+            ))
+
+    def vote(self, student, index):
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(student)
+        response = client.post('/api/elections/votes/', {
+            'position': self.positions[index].pk, 'candidate': self.candidates[index].pk,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def get_turnout(self):
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(f'/api/elections/elections/{self.election.pk}/turnout/')
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(queries)
+
+    def test_counts_distinct_voters_per_segment(self):
+        self.vote(self.students[0], 0)
+        self.vote(self.students[0], 1)
+        self.vote(self.students[2], 0)
+        data, few_votes = self.get_turnout()
+
+        self.assertEqual(data['total_voters'], 2)
+        self.assertEqual(data['segments']['hall'], {'Conti': 1, 'Katanga': 1})
+
+        self.vote(self.students[1], 0)
+        self.vote(self.students[2], 1)
+        data, more_votes = self.get_turnout()
+        self.assertEqual(data['segments']['hall'], {'Conti': 1, 'Katanga': 2})
+        self.assertEqual(few_votes, more_votes)
+
+    def test_deleted_voters_leave_the_count(self):
+        for student in self.students:
+            self.vote(student, 0)
+        self.vote(self.students[0], 1)
+
+        # A withdrawn candidate voids ballots, not turnout
+        deletion.delete_in_chunks(Candidate, [self.candidates[0].pk])
+        self.assertEqual(self.get_turnout()[0]['total_voters'], 3)
+        deletion.delete_in_chunks(User, [self.students[0].pk])
+        self.students[2].delete()
+        data, _ = self.get_turnout()
+        self.assertEqual((data['total_voters'], data['segments']['hall']), (1, {'Katanga': 1}))
+
+        turnout.rebuild([self.election.pk])
+        self.assertEqual(self.get_turnout()[0], data)
+
+    def test_matches_stats_turnout(self):
+        self.vote(self.students[0], 0)
+        # Deactivated accounts can't vote, so they aren't registered voters
+        User.objects.create_user(username='left', is_active=False)
+
+        data, _ = self.get_turnout()
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(self.admin)
+        stats = client.get(f'/api/elections/elections/{self.election.pk}/stats/').json()
+
+        self.assertEqual(data['registered_students'], stats['total_registered_users'])
+        self.assertEqual(data['registered_students'], User.objects.filter(is_student=True, is_active=True).count())
+        self.assertEqual(data['turnout_percentage'], stats['turnout_percentage'])
+
+    def test_requires_admin(self):
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(self.students[0])
+        response = client.get(f'/api/elections/elections/{self.election.pk}/turnout/')
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(ELECTION_STREAM_POLL_SECONDS=0.05, ELECTION_STREAM_GAP_SECONDS=0)
+class ElectionStreamTests(TransactionTestCase):
+    """Admins follow tallies and turnout as server-sent events."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', is_staff=True)
+        self.students = []
+        for i in range(2):
+            student = User.objects.create_user(username=f'student{i}')
+            student.profile.hall_of_residence = 'Katanga'
+            student.profile.save()
+            self.students.append(student)
+        now = timezone.now()
+        self.election = Election.objects.create(
+            title='General Elections', start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=1), is_active=True,
+        )
+        self.position = Position.objects.create(election=self.election, name='President', rank=1)
+        self.candidate = Candidate.objects.create(
+            position=self.position, user=self.admin, manifesto='Vote for me', photo='candidates/c.png'
+        )
+        self.url = f'/api/elections/elections/{self.election.pk}/stream/'
+        # Each test runs in its own event loop
+        stream._broker = None
+
+    def tearDown(self):
+        stream._broker = None
+
+    def vote(self, student):
+        Vote.objects.create(voter=student, position=self.position, candidate=self.candidate)
+
+    def token(self, user):
+        return str(RoleRefreshToken.for_user(user).access_token)
+
+    async def read_event(self, content):
+        chunk = await asyncio.wait_for(anext(content), 5)
+        fields = dict(line.split(': ', 1) for line in chunk.decode().strip().split('\n'))
+        return fields['id'], fields['event'], json.loads(fields['data'])
+
+    async def stream_token(self, user):
+        jwt = await sync_to_async(self.token)(user)
+        return await self.async_client.post(
+            f'/api/elections/elections/{self.election.pk}/stream_token/',
+            headers={'Authorization': f'Bearer {jwt}'},
+        )
+
+    async def open_stream(self, **headers):
+        token = (await self.stream_token(self.admin)).json()['token']
+        response = await self.async_client.get(f'{self.url}?token={token}', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        return response, aiter(response.streaming_content)
+
+    async def close_stream(self, response):
+        # As the ASGI handler does when the stream ends
+        await sync_to_async(response.close)()
+
+    async def test_snapshot_then_deltas_then_resume(self):
+        await sync_to_async(self.vote)(self.students[0])
+
+        response, content = await self.open_stream()
+        snapshot_id, kind, data = await self.read_event(content)
+        self.assertEqual(kind, 'snapshot')
+        self.assertEqual(data['tallies'], {str(self.position.pk): {str(self.candidate.pk): 1}})
+        self.assertEqual(data['turnout']['total_voters'], 1)
+        self.assertEqual(data['turnout']['segments']['hall'], {'Katanga': 1})
+
+        await sync_to_async(self.vote)(self.students[1])
+        vote_id, kind, data = await self.read_event(content)
+        self.assertEqual((kind, data['candidate_id'], data['delta']), ('vote', self.candidate.pk, 1))
+        voter_id, kind, data = await self.read_event(content)
+        self.assertEqual((kind, data['segments']['hall'], data['delta']), ('voter', 'Katanga', 1))
+        await self.close_stream(response)
+
+        # Reconnecting with the snapshot's id replays what came after it
+        response, content = await self.open_stream(**{'Last-Event-ID': snapshot_id})
+        poller = stream._broker.task
+        self.assertEqual([(await self.read_event(content))[0] for _ in range(2)], [vote_id, voter_id])
+        await self.close_stream(response)
+        # Closed streams unsubscribe, so the poller stops
+        await asyncio.wait_for(poller, 5)
+
+    async def test_admins_only(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+        response = await self.stream_token(self.students[0])
+        self.assertEqual(response.status_code, 403)
+        jwt = await sync_to_async(self.token)(self.students[0])
+        response = await self.async_client.get(self.url, headers={'Authorization': f'Bearer {jwt}'})
+        self.assertEqual(response.status_code, 403)
+
+    async def test_session_login(self):
+        await self.async_client.aforce_login(self.students[0])
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+        await self.async_client.aforce_login(self.admin)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        _, kind, data = await self.read_event(aiter(response.streaming_content))
+        self.assertEqual((kind, data['turnout']['total_voters']), ('snapshot', 0))
+        await self.close_stream(response)
+
+    async def test_query_string_takes_stream_tokens_only(self):
+        # JWTs don't belong in URLs (access logs)
+        jwt = await sync_to_async(self.token)(self.admin)
+        response = await self.async_client.get(f'{self.url}?token={jwt}')
+        self.assertEqual(response.status_code, 401)
+
+        other = await Election.objects.acreate(
+            title='By-election', start_date=timezone.now(), end_date=timezone.now() + timedelta(days=1),
+        )
+        token = stream.make_token(self.admin, other.pk)
+        response = await self.async_client.get(f'{self.url}?token={token}')
+        self.assertEqual(response.status_code, 401)
+
+        with override_settings(ELECTION_STREAM_TOKEN_SECONDS=-1):
+            token = stream.make_token(self.admin, self.election.pk)
+            response = await self.async_client.get(f'{self.url}?token={token}')
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,193 @@
+"""
+Live turnout per segment (hall, college, year group, gender).
+
+Turnout is distinct voters, and counting those per segment on request
+means a DISTINCT over every vote of the election joined to the voters'
+profiles. Instead:
+
+- a voter's first vote in an election inserts an ElectionVoter row (unique
+  per election and voter) carrying their segments, copied from the
+  profile, and adds one to the election's TurnoutCount row for each
+  segment and to the "total" row; later votes in the same election only
+  check that the row exists;
+- deleting an ElectionVoter row (with the voter's account, by signal or
+  through core.deletion's ``pre_bulk_delete``) takes it back out.
+
+A voter who turned out stays counted if their ballot for one position is
+voided (a candidate withdrawn): ElectionVoter, not the votes, is the
+record of who voted. ``turnout`` reads a few dozen TurnoutCount rows,
+however many votes have been cast, and takes its denominator from
+``registered_students``, as the election stats do, so both report the
+same percentage. ``rebuild`` recounts from ElectionVoter,
+first adding rows for voters who have votes but no row (elections that
+had votes before this table existed); see the ``rebuild_turnout``
+management command.
+"""
+
+from collections import Counter, defaultdict
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+
+from core import counters
+from dasa_users import demographics
+
+# ElectionVoter fields, named after the dasa_users.demographics dimensions
+SEGMENTS = ('hall', 'college', 'year_group', 'gender')
+TOTAL = ('total', 'all')
+
+
+def voter_segments(profile_values):
+    """``{segment: value}`` for a voter whose profile has ``profile_values``."""
+    from dasa_users.models import Profile
+
+    return {
+        dimension: value
+        for dimension, value in demographics.buckets(Profile, profile_values)
+        if dimension in SEGMENTS
+    }
+
+
+def _profile_values(registry, voter_ids):
+    Profile = registry.get_model('dasa_users', 'Profile')
+    fields = demographics.counted_fields(Profile)
+    found = {
+        row.pop('user_id'): row
+        for row in Profile._base_manager.filter(user_id__in=voter_ids).values('user_id', *fields)
+    }
+    # Profile-less users count as unknown everywhere
+    return {voter_id: found.get(voter_id, dict.fromkeys(fields)) for voter_id in voter_ids}
+
+
+def _counts(rows, sign=1):
+    """Deltas per election for ``rows`` of ``{'election_id', segments..., 'rows'}``."""
+    deltas = defaultdict(Counter)
+    for row in rows:
+        counts = deltas[row['election_id']]
+        counts[TOTAL] += sign * row['rows']
+        for segment in SEGMENTS:
+            counts[(segment, row[segment])] += sign * row['rows']
+    return deltas
+
+
+def _apply(deltas, registry=apps):
+    TurnoutCount = registry.get_model('elections', 'TurnoutCount')
+    for election_id, counts in deltas.items():
+        counters.add_counts(TurnoutCount, counts, election_id=election_id)
+
+
+def record_vote(vote):
+    """
+    Count ``vote``'s voter if it is their first vote in the election.
+
+    Returns the voter's segments if they were counted, None otherwise.
+    """
+    from .models import ElectionVoter
+
+    election_id = vote.position.election_id
+    if ElectionVoter.objects.filter(election_id=election_id, voter_id=vote.voter_id).exists():
+        return None
+    segments = voter_segments(_profile_values(apps, [vote.voter_id])[vote.voter_id])
+    try:
+        with transaction.atomic():
+            ElectionVoter.objects.create(election_id=election_id, voter_id=vote.voter_id, **segments)
+    except IntegrityError:
+        # Their first vote for another position got there first
+        return None
+    _apply(_counts([{'election_id': election_id, 'rows': 1, **segments}]))
+    return segments
+
+
+def uncount_voter(election_voter):
+    """Take a deleted ElectionVoter out of the counts."""
+    row = {segment: getattr(election_voter, segment) for segment in SEGMENTS}
+    _apply(_counts([{'election_id': election_voter.election_id, 'rows': 1, **row}], sign=-1))
+
+
+def uncount_voters(election_voters):
+    """
+    Take the rows of the ElectionVoter queryset ``election_voters`` out of
+    the counts. Returns them grouped, as ``{'election_id', segments..., 'rows'}``.
+    """
+    rows = list(election_voters.order_by().values('election_id', *SEGMENTS).annotate(rows=Count('pk')))
+    _apply(_counts(rows, sign=-1))
+    return rows
+
+
+def registered_students():
+    """Students who can vote (active accounts): the turnout denominator."""
+    from dasa_users.models import User
+
+    return User.objects.filter(is_student=True, is_active=True).count()
+
+
+def turnout(election):
+    """Distinct voters of ``election``, in total and per segment."""
+    from .models import TurnoutCount
+
+    segments = {segment: {} for segment in SEGMENTS}
+    total_voters = 0
+    rows = TurnoutCount.objects.filter(election=election, count__gt=0).order_by('dimension', 'value')
+    for dimension, value, count in rows.values_list('dimension', 'value', 'count'):
+        if (dimension, value) == TOTAL:
+            total_voters = count
+        else:
+            segments.setdefault(dimension, {})[value] = count
+
+    registered = registered_students()
+    return {
+        'election_id': election.pk,
+        'total_voters': total_voters,
+        'registered_students': registered,
+        'turnout_percentage': round(total_voters / registered * 100, 2) if registered else 0,
+        'segments': segments,
+    }
+
+
+def total_voters(election_id):
+    """Distinct voters of an election, from its "total" count."""
+    from .models import TurnoutCount
+
+    dimension, value = TOTAL
+    return (
+        TurnoutCount.objects.filter(election_id=election_id, dimension=dimension, value=value)
+        .values_list('count', flat=True).first()
+    ) or 0
+
+
+def rebuild(election_ids=None, registry=apps):
+    """
+    Recount the voters of ``election_ids`` (default: all).
+
+    Voters with votes but no ElectionVoter row get one with their current
+    segments. Returns the number of elections rebuilt.
+    ``registry`` is the app registry to take the models from (migrations
+    pass their historical one).
+    """
+    Election = registry.get_model('elections', 'Election')
+    ElectionVoter = registry.get_model('elections', 'ElectionVoter')
+    TurnoutCount = registry.get_model('elections', 'TurnoutCount')
+    Vote = registry.get_model('elections', 'Vote')
+
+    elections = Election.objects.all()
+    if election_ids is not None:
+        elections = elections.filter(pk__in=election_ids)
+    rebuilt = 0
+    for election_id in elections.values_list('pk', flat=True):
+        with transaction.atomic():
+            voted = set(
+                Vote.objects.filter(position__election_id=election_id).values_list('voter_id', flat=True).distinct()
+            )
+            voters = ElectionVoter.objects.filter(election_id=election_id)
+            missing = voted - set(voters.values_list('voter_id', flat=True))
+            ElectionVoter.objects.bulk_create([
+                ElectionVoter(election_id=election_id, voter_id=voter_id, **voter_segments(values))
+                for voter_id, values in _profile_values(registry, missing).items()
+            ])
+
+            TurnoutCount.objects.filter(election_id=election_id).delete()
+            rows = voters.order_by().values('election_id', *SEGMENTS).annotate(rows=Count('pk'))
+            _apply(_counts(rows), registry)
+        rebuilt += 1
+    return rebuilt
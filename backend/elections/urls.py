@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ElectionViewSet, PositionViewSet, CandidateViewSet, VoteViewSet
+from .views import ElectionViewSet, PositionViewSet, CandidateViewSet, VoteViewSet, election_stream
 
 # Create a router and register viewsets
 router = DefaultRouter()
@@ -10,5 +10,6 @@ router.register(r'candidates', CandidateViewSet, basename='candidate')
 router.register(r'votes', VoteViewSet, basename='vote')
 
 urlpatterns = [
+    path('elections/<int:pk>/stream/', election_stream, name='election-stream'),
     path('', include(router.urls)),
 ]
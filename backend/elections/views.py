@@ -1,10 +1,25 @@
+from asgiref.sync import sync_to_async
 from rest_framework import viewsets, permissions, status, serializers
 from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
+from django.conf import settings
 from django.db import models
 from django.db.models import Count
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
 from .models import Election, Position, Candidate, Vote
+from core.caching import get_api_cache
+from core.conditional import etag_matches
+from core.querysets import QueryPlanMixin
+from core.singleflight import get_or_compute
+from core.versioning import cache_key
+from dasa_users.authentication import CachedJWTAuthentication
+from . import stream
 from .permissions import IsAdminOrReadOnly
+from .turnout import turnout as election_turnout
+from .results import build_stats, etag_for, get_published_snapshot, publish
 from .serializers import (
     ElectionSerializer,
     PositionSerializer,
@@ -13,7 +28,30 @@ from .serializers import (
 )
 
 
-class ElectionViewSet(viewsets.ModelViewSet):
+def snapshot_response(request, snapshot, body):
+    """
+    Serve frozen results JSON, or a 304 if the client already has it.
+
+    Snapshots are only served to signed-in users (the candidate list embeds
+    their contact details), so only the browser may cache them, never a
+    shared cache or CDN.
+    """
+    etag = etag_for(snapshot)
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    patch_vary_headers(response, ('Authorization',))
+    if request.query_params.get('v') == str(snapshot.version):
+        # The URL names this exact version, which never changes
+        patch_cache_control(response, private=True, max_age=60 * 60 * 24 * 365, immutable=True)
+    else:
+        patch_cache_control(response, private=True, max_age=settings.ELECTION_RESULTS_CACHE_SECONDS)
+    return response
+
+
+class ElectionViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     ViewSet for Election model
     Admin users can manage elections, authenticated users can view
@@ -41,7 +79,7 @@ class ElectionViewSet(viewsets.ModelViewSet):
         Get all currently active elections
         Accessible at: /api/elections/active/
         """
-        active_elections = Election.objects.filter(is_active=True)
+        active_elections = self.plan_queryset(Election.objects.filter(is_active=True))
         serializer = self.get_serializer(active_elections, many=True)
         return Response(serializer.data)
 
@@ -50,11 +88,26 @@ class ElectionViewSet(viewsets.ModelViewSet):
         """
         Publish election results to all users.
         Only admins can perform this action.
+
+        Freezes the results into a snapshot; publishing again rebuilds it.
         """
         election = self.get_object()
-        election.is_published = True
-        election.save()
-        return Response({'status': 'results published', 'is_published': True})
+        snapshot = publish(election, request)
+        return Response({'status': 'results published', 'is_published': True, 'version': snapshot.version})
+
+    @action(detail=True, methods=['get'])
+    def results(self, request, pk=None):
+        """
+        Published results, served from the snapshot taken at publish time.
+        Accessible at: /api/elections/{id}/results/
+
+        Pass ?v=<version> (from publish_results or a previous response) to
+        get a URL that can be cached indefinitely.
+        """
+        snapshot = get_published_snapshot(pk)
+        if snapshot is None:
+            return Response({'error': 'Results have not been published.'}, status=status.HTTP_404_NOT_FOUND)
+        return snapshot_response(request, snapshot, snapshot.results)
 
     @action(detail=True, methods=['get'])
     def stats(self, request, pk=None):
@@ -62,69 +115,121 @@ class ElectionViewSet(viewsets.ModelViewSet):
         Get comprehensive election statistics for admin dashboard.
         Returns vote counts, turnout, and results by position.
         Accessible at: /api/elections/{id}/stats/
+
+        The dashboard polls this while votes come in, so the result is
+        cached until the next vote and computed by one request at a time;
+        concurrent requests get the previous result meanwhile.
         """
         from dasa_users.models import User
 
         election = self.get_object()
+        targets = [Election, Position, Candidate, Vote, User]
+        # Photo URLs are absolute, so the host is part of the key
+        variant = (election.pk, request.build_absolute_uri('/'))
+        data = get_or_compute(
+            get_api_cache(),
+            cache_key('elections:stats', targets, *variant),
+            lambda: build_stats(election, request),
+            settings.API_CACHE_TIMEOUT,
+            stale_key=cache_key('elections:stats', [], *variant),
+        )
+        return Response(data)
+
+    @action(detail=True, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def turnout(self, request, pk=None):
+        """
+        Live turnout: distinct voters in total and per hall, college, year
+        group and gender, for admins following an election.
+        Accessible at: /api/elections/{id}/turnout/
 
-        # Get all positions for this election
-        positions = Position.objects.filter(election=election).order_by('rank')
-
-        # Total votes cast across all positions
-        total_votes_cast = Vote.objects.filter(position__election=election).count()
-
-        # Unique voters (distinct users who voted in any position)
-        total_voters = Vote.objects.filter(position__election=election).values('voter').distinct().count()
-
-        # Total registered users (students only)
-        total_registered_users = User.objects.filter(is_student=True, is_active=True).count()
-
-        # Turnout percentage
-        turnout_percentage = (total_voters / total_registered_users * 100) if total_registered_users > 0 else 0
-
-        # Results by position
-        results_by_position = []
-        for position in positions:
-            # Get all candidates for this position with their vote counts
-            candidates = Candidate.objects.filter(position=position).annotate(
-                vote_count=Count('vote')
-            ).order_by('-vote_count')
-
-            candidate_results = []
-            for candidate in candidates:
-                candidate_results.append({
-                    'candidate_id': candidate.id,
-                    'candidate_name': f"{candidate.user.first_name} {candidate.user.last_name}",
-                    'candidate_username': candidate.user.username,
-                    'photo': request.build_absolute_uri(candidate.photo.url) if candidate.photo else None,
-                    'vote_count': candidate.vote_count,
-                })
-
-            # Total votes for this position
-            position_total_votes = sum(c['vote_count'] for c in candidate_results)
-
-            results_by_position.append({
-                'position_id': position.id,
-                'position_name': position.name,
-                'rank': position.rank,
-                'total_votes': position_total_votes,
-                'candidates': candidate_results,
-            })
+        Read from counters updated as voters cast their first vote
+        (elections.turnout), so the cost doesn't grow with the votes cast.
+        """
+        election = self.get_object()
+        return Response(election_turnout(election))
 
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAdminUser])
+    def stream_token(self, request, pk=None):
+        """
+        A short-lived token for the live stream of this election, to pass
+        as ?token= where an Authorization header can't be sent (EventSource).
+        Accessible at: /api/elections/elections/{id}/stream_token/
+        """
+        election = self.get_object()
         return Response({
-            'election_id': election.id,
-            'election_title': election.title,
-            'is_active': election.is_active,
-            'is_published': election.is_published,
-            'total_votes_cast': total_votes_cast,
-            'total_voters': total_voters,
-            'total_registered_users': total_registered_users,
-            'turnout_percentage': round(turnout_percentage, 2),
-            'results_by_position': results_by_position,
+            'token': stream.make_token(request.user, election.pk),
+            'expires_in': getattr(settings, 'ELECTION_STREAM_TOKEN_SECONDS', stream.TOKEN_SECONDS),
         })
 
 
-class PositionViewSet(viewsets.ModelViewSet):
+def _authenticate_stream(request, election_id):
+    """
+    The user of a stream request: JWT from the Authorization header, or a
+    stream token (elections.stream.make_token) in the ``token`` query
+    parameter. None if the request carries neither (the caller then falls
+    back to the session, with ``request.auser()``).
+    """
+    from dasa_users.models import User
+
+    authenticator = CachedJWTAuthentication()
+    header = authenticator.get_header(request)
+    if header is not None:
+        raw_token = authenticator.get_raw_token(header)
+        if raw_token is not None:
+            return authenticator.get_user(authenticator.get_validated_token(raw_token))
+    token = request.GET.get('token')
+    if token:
+        user_id = stream.read_token(token, election_id)
+        user = User.objects.filter(pk=user_id, is_active=True).first() if user_id is not None else None
+        if user is None:
+            raise AuthenticationFailed('Stream token is invalid or expired.')
+        return user
+    return None
+
+
+async def election_stream(request, pk):
+    """
+    Live tallies and turnout of an election as server-sent events, for
+    admins following it (see elections.stream).
+    Accessible at: /api/elections/elections/{id}/stream/
+
+    Starts with a "snapshot" event, or with the events missed since the
+    Last-Event-ID header (or ?last_event_id=) when resuming, then sends
+    "vote" and "voter" deltas as they are committed. Needs an ASGI server.
+
+    EventSource can't send headers: pass ?token= from stream_token, never
+    the JWT, since query strings are written to access logs. Stream tokens
+    expire after ELECTION_STREAM_TOKEN_SECONDS, so get a new one to
+    reconnect.
+    """
+    try:
+        user = await sync_to_async(_authenticate_stream)(request, pk)
+    except (AuthenticationFailed, InvalidToken, TokenError) as e:
+        return JsonResponse({'detail': str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+    if user is None:
+        # request.user is lazy and would query synchronously here
+        user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse(
+            {'detail': 'Authentication credentials were not provided.'}, status=status.HTTP_401_UNAUTHORIZED
+        )
+    if not user.is_staff:
+        return JsonResponse(
+            {'detail': 'You do not have permission to perform this action.'}, status=status.HTTP_403_FORBIDDEN
+        )
+    if not await Election.objects.filter(pk=pk).aexists():
+        return JsonResponse({'error': 'Election not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id', '')
+    last_event_id = int(last_event_id) if last_event_id.isdigit() else None
+    response = StreamingHttpResponse(stream.EventStream(pk, last_event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Don't let proxies (nginx) hold events back
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+class PositionViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     ViewSet for Position model
     Admin users can manage positions, authenticated users can view
@@ -153,7 +258,7 @@ class PositionViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class CandidateViewSet(viewsets.ModelViewSet):
+class CandidateViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     ViewSet for Candidate model
     Admin users can manage candidates, authenticated users can view
@@ -188,6 +293,19 @@ class CandidateViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        """
+        The candidates of a published election come from its results
+        snapshot (vote counts included) instead of being counted again.
+        """
+        election_id = request.query_params.get('election')
+        only_election = set(request.query_params) <= {'election', 'v'}
+        if election_id and election_id.isdigit() and only_election and not request.user.is_staff:
+            snapshot = get_published_snapshot(election_id, fields=('candidates',))
+            if snapshot is not None:
+                return snapshot_response(request, snapshot, snapshot.candidates)
+        return super().list(request, *args, **kwargs)
+
     @action(detail=True, methods=['get'])
     def vote_count(self, request, pk=None):
         """
@@ -199,7 +317,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
         return Response({'candidate_id': candidate.id, 'vote_count': count})
 
 
-class VoteViewSet(viewsets.ModelViewSet):
+class VoteViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     ViewSet for Vote model
     Authenticated users can vote, admin can view all votes
@@ -222,7 +340,7 @@ class VoteViewSet(viewsets.ModelViewSet):
         """
         if self.request.user.is_staff:
             return Vote.objects.all()
-        return Vote.objects.filter(voter=self.request.user)
+        return Vote.objects.filter(voter_id=self.request.user.pk)
 
     def perform_create(self, serializer):
         """
@@ -245,7 +363,7 @@ class VoteViewSet(viewsets.ModelViewSet):
             })
 
         # Rule 1: Check for double voting
-        if Vote.objects.filter(voter=user, position=position).exists():
+        if Vote.objects.filter(voter_id=user.pk, position=position).exists():
             raise serializers.ValidationError({
                 'position': 'You have already voted for this position.'
             })
@@ -262,14 +380,15 @@ class VoteViewSet(viewsets.ModelViewSet):
                 'election': 'This election is not open for voting at this time.'
             })
 
-        # Rule 3: Check if user is an active student (not alumni)
+        # Rule 3: Check if user is an active student (not alumni); read
+        # from the token's role claims when it has them
         if user.is_alumni or not user.is_student:
             raise serializers.ValidationError({
                 'voter': 'Only active students are eligible to vote. Alumni records show you have graduated.'
             })
 
-        # All validations passed, save the vote
-        serializer.save(voter=user)
+        # All validations passed, save the vote (by id: the token has it)
+        serializer.save(voter_id=user.pk)
 
     @action(detail=False, methods=['get'])
     def my_votes(self, request):
@@ -277,6 +396,6 @@ class VoteViewSet(viewsets.ModelViewSet):
         Get all votes by the current user
         Accessible at: /api/votes/my_votes/
         """
-        votes = Vote.objects.filter(voter=request.user)
+        votes = self.plan_queryset(Vote.objects.filter(voter_id=request.user.pk))
         serializer = self.get_serializer(votes, many=True)
         return Response(serializer.data)
@@ -16,6 +16,13 @@ class EventSerializer(serializers.ModelSerializer):
     is_upcoming = serializers.ReadOnlyField()
     event_image_url = serializers.SerializerMethodField()
 
+    # Columns the computed fields read, for the values() list fast path
+    row_dependencies = {
+        'time_display': ['start_time', 'end_time'],
+        'is_upcoming': ['date'],
+        'event_image_url': ['event_image'],
+    }
+
     class Meta:
         model = Event
         fields = [
@@ -1,3 +1,141 @@
-from django.test import TestCase
+import datetime
+import time
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core import caching
+from core.testing import ProjectionParityMixin
+from dasa_users.models import User
+from .models import Event
+from .serializers import EventSerializer
+
+
+class EventListCacheTests(TestCase):
+    """The public event list is cached until an event changes."""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.create_event('Orientation')
+
+    def create_event(self, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Event.objects.create(
+                title=title,
+                description='Test event',
+                date=timezone.now().date() + datetime.timedelta(days=7),
+                start_time=datetime.time(10),
+                end_time=datetime.time(12),
+                location='Great Hall',
+            )
+
+    def get_list(self, client=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = (client or self.client).get('/api/events/')
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_repeat_request_is_served_from_cache(self):
+        first, _ = self.get_list()
+        second, queries = self.get_list()
+
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(queries, 0)
+        self.assertEqual(first.content, second.content)
+
+    def test_cached_responses_keep_their_headers(self):
+        first, _ = self.get_list()
+        second, _ = self.get_list()
+
+        self.assertEqual(second['X-Cache'], 'HIT')
+        for header in ['Content-Type', 'Vary', 'Allow']:
+            self.assertEqual(second[header], first[header])
+        self.assertIn('Accept', second['Vary'])
+
+    def test_write_invalidates_cached_list(self):
+        self.get_list()
+        self.create_event('Cultural Night')
+
+        response, _ = self.get_list()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.json()), 2)
+
+    def test_hosts_are_cached_apart(self):
+        self.get_list()
+        other = APIClient(HTTP_HOST='dasa.ngrok-free.app')
+
+        response, queries = self.get_list(other)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertGreater(queries, 0)
+
+    def test_staff_requests_bypass_cache(self):
+        self.get_list()
+        staff = APIClient(HTTP_HOST='localhost')
+        staff.force_authenticate(User.objects.create_user(username='admin', password='pass12345', is_staff=True))
+
+        response, queries = self.get_list(staff)
+        self.assertNotIn('X-Cache', response)
+        self.assertGreater(queries, 0)
+
+
+class EventListRefreshTests(TransactionTestCase):
+    """Entries past the soft timeout are served stale while a worker refreshes them."""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.event = Event.objects.create(
+            title='Orientation', description='Test event',
+            date=timezone.now().date() + datetime.timedelta(days=7),
+            start_time=datetime.time(10), end_time=datetime.time(12), location='Great Hall',
+        )
+
+    def titles(self, response):
+        return [event['title'] for event in response.json()]
+
+    def test_stale_entry_is_refreshed_in_the_background(self):
+        self.assertEqual(self.client.get('/api/events/')['X-Cache'], 'MISS')
+        # No signals: the version, and so the cache key, stays the same
+        Event.objects.filter(pk=self.event.pk).update(title='Freshers Orientation')
+
+        time.sleep(0.1)
+        with override_settings(API_CACHE_SOFT_TIMEOUT=0.05):
+            response = self.client.get('/api/events/')
+        self.assertEqual(response['X-Cache'], 'STALE')
+        self.assertEqual(self.titles(response), ['Orientation'])
+        self.assertIn('Accept', response['Vary'])
+        caching._executor.submit(lambda: None).result()  # refreshes run one at a time, in order
+
+        response = self.client.get('/api/events/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(self.titles(response), ['Freshers Orientation'])
+
+
+class EventListProjectionTests(ProjectionParityMixin, TestCase):
+    """The values() event list matches EventSerializer field for field."""
+
+    def test_list_matches_serializer(self):
+        today = timezone.now().date()
+        with self.captureOnCommitCallbacks(execute=True):
+            for title, days, image in [
+                ('Orientation', 7, 'events/orientation.png'), ('Cultural Night', 14, ''), ('Past Gala', -7, ''),
+            ]:
+                Event.objects.create(
+                    title=title, description='Test event', date=today + datetime.timedelta(days=days),
+                    start_time=datetime.time(9, 30), end_time=datetime.time(17), location='Great Hall',
+                    event_image=image,
+                )
+
+        data = self.assertListMatchesSerializer(
+            '/api/events/', EventSerializer, Event.objects.filter(date__gte=today)
+        )
+
+        self.assertEqual([event['title'] for event in data], ['Orientation', 'Cultural Night'])
+        self.assertEqual(data[0]['event_image'], 'http://localhost/media/events/orientation.png')
+        self.assertEqual(data[0]['event_image_url'], 'http://localhost/media/events/orientation.png')
+        self.assertIsNone(data[1]['event_image_url'])
+        self.assertEqual((data[0]['time_display'], data[0]['is_upcoming']), ('09:30 AM - 05:00 PM', True))
+        self.assertEqual(data[0]['start_time'], '09:30:00')
+        self.assertTrue(data[0]['created_at'].endswith('Z'))
@@ -1,10 +1,12 @@
 from rest_framework import viewsets, permissions
 from django.utils import timezone
+from core.caching import CachedResponseMixin
+from core.projection import ValuesListMixin
 from .models import Event
 from .serializers import EventSerializer
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(CachedResponseMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     API endpoint for DASA events.
 
@@ -26,6 +28,10 @@ class EventViewSet(viewsets.ModelViewSet):
             permission_classes = [permissions.IsAdminUser]
         return [permission() for permission in permission_classes]
 
+    def get_cache_variant(self):
+        # The public list hides past events, so it changes with the date
+        return (timezone.now().date(),)
+
     def get_queryset(self):
         """
         Optionally filter events.
@@ -15,6 +15,13 @@ class GalleryItemSerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
     video_url = serializers.SerializerMethodField()
 
+    # Columns the computed fields read, for the values() list fast path
+    row_dependencies = {
+        'thumbnail_url': ['media_type', 'image', 'video_thumbnail'],
+        'image_url': ['media_type', 'image'],
+        'video_url': ['media_type', 'video'],
+    }
+
     class Meta:
         model = GalleryItem
         fields = [
@@ -1,3 +1,36 @@
 from django.test import TestCase
 
-# Create your tests here.
+from core.testing import ProjectionParityMixin
+from .models import GalleryItem
+from .serializers import GalleryItemSerializer
+
+
+class GalleryListProjectionTests(ProjectionParityMixin, TestCase):
+    """The values() gallery list matches GalleryItemSerializer field for field."""
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            GalleryItem.objects.create(title='Durbar', category='Cultural', media_type='Image', image='gallery/durbar.jpg')
+            GalleryItem.objects.create(
+                title='Match highlights', category='Sports', media_type='Video',
+                video='gallery/videos/match.mp4', video_thumbnail='gallery/thumbs/match.jpg',
+            )
+            GalleryItem.objects.create(
+                title='Rehearsal', category='Cultural', media_type='Video', video='gallery/videos/rehearsal.mp4',
+            )
+
+    def test_list_matches_serializer(self):
+        data = self.assertListMatchesSerializer('/api/gallery/', GalleryItemSerializer, GalleryItem.objects.all())
+
+        items = {item['title']: item for item in data}
+        self.assertEqual(items['Durbar']['image'], 'http://localhost/media/gallery/durbar.jpg')
+        self.assertEqual(items['Durbar']['thumbnail_url'], 'http://localhost/media/gallery/durbar.jpg')
+        self.assertIsNone(items['Durbar']['video'])
+        self.assertEqual(items['Match highlights']['thumbnail_url'], 'http://localhost/media/gallery/thumbs/match.jpg')
+        self.assertEqual(items['Match highlights']['video_url'], 'http://localhost/media/gallery/videos/match.mp4')
+        self.assertIsNone(items['Rehearsal']['thumbnail_url'])
+
+    def test_filtered_list_matches_serializer(self):
+        self.assertListMatchesSerializer(
+            '/api/gallery/?category=Cultural', GalleryItemSerializer, GalleryItem.objects.filter(category='Cultural')
+        )
@@ -1,9 +1,12 @@
 from rest_framework import viewsets, permissions
+from core.caching import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
+from core.projection import ValuesListMixin
 from .models import GalleryItem
 from .serializers import GalleryItemSerializer
 
 
-class GalleryViewSet(viewsets.ModelViewSet):
+class GalleryViewSet(ConditionalGetMixin, CachedResponseMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     API endpoint for DASA gallery media items.
 
@@ -11,6 +14,7 @@ class GalleryViewSet(viewsets.ModelViewSet):
     - Public can view
     - Admins can create, update, delete
     - Supports filtering by category via query parameter
+    - ETag / 304 revalidation from the gallery version stamp
     """
 
     queryset = GalleryItem.objects.all().order_by('-created_at')
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import Executive
 from dasa_users.models import User
+from dasa_users.serializers import UserSummarySerializer
 
 
 class ExecutiveSerializer(serializers.ModelSerializer):
@@ -21,7 +22,7 @@ class ExecutiveSerializer(serializers.ModelSerializer):
     )
 
     # Read field: nested user details
-    user_details = serializers.SerializerMethodField()
+    user_details = UserSummarySerializer(source='user', read_only=True)
 
     # Nested user data (backward compatibility)
     full_name = serializers.SerializerMethodField()
@@ -57,20 +58,6 @@ class ExecutiveSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id']
 
-    def get_user_details(self, obj):
-        """
-        Returns nested user details for UI display.
-        """
-        return {
-            'id': obj.user.id,
-            'username': obj.user.username,
-            'email': obj.user.email,
-            'first_name': obj.user.first_name,
-            'last_name': obj.user.last_name,
-            'full_name': f"{obj.user.first_name} {obj.user.last_name}" if obj.user.first_name and obj.user.last_name else obj.user.username,
-            'avatar': obj.user.profile.profile_picture.url if hasattr(obj.user, 'profile') and obj.user.profile.profile_picture else None,
-        }
-
     def get_full_name(self, obj):
         """
         Returns the full name of the executive.
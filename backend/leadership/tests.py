@@ -1,3 +1,79 @@
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from dasa_users.models import User
+from .models import Executive
 
-# Create your tests here.
+
+class ExecutiveListQueryCountTests(TestCase):
+    """The executive list must not issue a query per user/avatar."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='exec', password='pass12345')
+        self.user.profile.profile_picture = 'profiles/exec.png'
+        self.user.profile.save()
+        self.created = 0
+
+    def create_executives(self, count):
+        # One user holding a post across several academic years keeps the
+        # rows independent (each row loads its own user/profile). Running
+        # the commit hooks moves the version on, so the cached list is dropped.
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(count):
+                self.created += 1
+                Executive.objects.create(
+                    user=self.user,
+                    title='President',
+                    rank=self.created,
+                    academic_year=f'{2000 + self.created}/{2001 + self.created}',
+                    is_current=True,
+                )
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/leadership/', HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+    def test_list_query_count_is_constant(self):
+        self.create_executives(2)
+        small, _ = self.count_list_queries()
+
+        self.create_executives(8)
+        large, data = self.count_list_queries()
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(data), 10)
+        self.assertEqual(data[0]['user_details']['avatar'], '/media/profiles/exec.png')
+
+
+class ExecutiveListCacheTests(TestCase):
+    """The cached list follows the users it shows, not their logins."""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.user = User.objects.create_user(username='exec', password='pass12345', first_name='Ama')
+        with self.captureOnCommitCallbacks(execute=True):
+            Executive.objects.create(
+                user=self.user, title='President', rank=1, academic_year='2024/2025', is_current=True,
+            )
+        self.client.get('/api/leadership/')
+
+    def save_user(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            for name, value in fields.items():
+                setattr(self.user, name, value)
+            self.user.save(update_fields=list(fields))
+
+    def test_login_keeps_cached_list(self):
+        self.save_user(last_login=timezone.now())
+        self.assertEqual(self.client.get('/api/leadership/')['X-Cache'], 'HIT')
+
+    def test_name_change_drops_cached_list(self):
+        self.save_user(first_name='Akosua')
+        response = self.client.get('/api/leadership/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()[0]['user_details']['first_name'], 'Akosua')
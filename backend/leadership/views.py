@@ -1,9 +1,12 @@
 from rest_framework import viewsets, permissions
+from core.caching import CachedResponseMixin
+from core.querysets import QueryPlanMixin
+from dasa_users.models import User, Profile
 from .models import Executive
 from .serializers import ExecutiveSerializer
 
 
-class ExecutiveViewSet(viewsets.ModelViewSet):
+class ExecutiveViewSet(CachedResponseMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint for viewing and managing DASA KNUST Executive Council members.
 
@@ -13,6 +16,8 @@ class ExecutiveViewSet(viewsets.ModelViewSet):
 
     queryset = Executive.objects.filter(is_current=True).select_related('user', 'user__profile').order_by('rank')
     serializer_class = ExecutiveSerializer
+    # user_details reads the executive's user and profile rows
+    cache_models = [Executive, User, Profile]
     
     def get_permissions(self):
         """
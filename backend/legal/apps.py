@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LegalConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "legal"
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import legal.signals
@@ -0,0 +1,81 @@
+"""
+Precompiled constitution document.
+
+The constitution changes a few times a year but is read constantly, so the
+full serialized document (every chapter with its nested articles) and one
+fragment per chapter are rendered to JSON once and kept in the cache under a
+versioned key. The version is the ``constitution`` collection version
+(``core.versioning``), which a committed Chapter/Article change bumps once per
+transaction; the new blob is built as soon as it moves (see
+``legal.signals``), so an import or a chapter delete cascading to its
+articles rebuilds it once. Reads are served straight from the cache and never
+touch the database.
+
+Blobs live for ``CONSTITUTION_DOCUMENT_TIMEOUT`` seconds. With a
+process-local cache (the default LocMemCache) other processes never see a
+bump; the timeout bounds how long they serve the old document. ETags are
+digests of the rendered bytes, not the version, so a process can't answer
+304 for content it no longer serves.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from core import versioning
+from core.renderers import FastJSONRenderer
+
+COLLECTION = 'constitution'
+DOCUMENT_KEY = 'legal:constitution:document:{version}'
+DOCUMENT_TIMEOUT = 60 * 60
+
+
+def get_version():
+    """Return the current document version."""
+    return versioning.get_version(COLLECTION)
+
+
+def _etag(body):
+    return f'"constitution-{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def etag_for(blob, chapter_id=None):
+    """The ETag of the whole document in ``blob``, or of one chapter."""
+    return blob['etags'][chapter_id]
+
+
+def build_document(version):
+    """Serialize the whole constitution and store it under ``version``."""
+    from .models import Chapter
+    from .serializers import ChapterSerializer
+
+    chapters = Chapter.objects.prefetch_related('articles').all()
+    data = ChapterSerializer(chapters, many=True).data
+
+    renderer = FastJSONRenderer()
+    document = renderer.render(data)
+    chapters = {chapter['id']: renderer.render(chapter) for chapter in data}
+    blob = {
+        'version': version,
+        'document': document,
+        'chapters': chapters,
+        'etags': {None: _etag(document), **{pk: _etag(body) for pk, body in chapters.items()}},
+    }
+    timeout = getattr(settings, 'CONSTITUTION_DOCUMENT_TIMEOUT', DOCUMENT_TIMEOUT)
+    cache.set(DOCUMENT_KEY.format(version=version), blob, timeout=timeout)
+    return blob
+
+
+def get_document():
+    """Return the cached document blob, building it on a cold cache."""
+    version = get_version()
+    blob = cache.get(DOCUMENT_KEY.format(version=version))
+    if blob is None:
+        blob = build_document(version)
+    return blob
+
+
+def rebuild_document(version):
+    """Precompute the document for a new version and drop the previous one."""
+    build_document(version)
+    cache.delete(DOCUMENT_KEY.format(version=version - 1))
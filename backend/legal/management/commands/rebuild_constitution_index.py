@@ -0,0 +1,23 @@
+"""
+Management command to rebuild the constitution full-text search index.
+
+Only needed if articles were changed without going through the ORM
+(raw SQL, loaddata with signals disabled, etc.).
+
+Usage:
+    python manage.py rebuild_constitution_index
+"""
+
+from django.core.management.base import BaseCommand
+from legal.models import Article
+from legal.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index over constitution articles'
+
+    def handle(self, *args, **options):
+        rebuild_index()
+        self.stdout.write(
+            self.style.SUCCESS(f'Reindexed {Article.objects.count()} article(s).')
+        )
@@ -0,0 +1,197 @@
+"""
+Full-text index over constitution articles.
+
+- SQLite: an FTS5 table (``legal_article_fts``) whose rowid is the Article id,
+  kept in sync by the signals in ``legal.signals``.
+- Postgres: a GIN index on ``to_tsvector(title || ' ' || content)``; no extra
+  table is needed, Postgres keeps the index current itself.
+- Any other backend falls back to an icontains scan.
+
+``search_articles`` returns ranked hits with highlighted title/snippet and
+the chapter context in a single query.
+"""
+
+from django.db import connection
+
+from core.fts import (
+    MARK_END, MARK_START, fts5_match_query, headline_options, highlighted_html, tsquery,
+    is_sqlite, is_postgres,
+)
+
+FTS_TABLE = 'legal_article_fts'
+PG_INDEX = 'legal_article_search_idx'
+PG_VECTOR = "to_tsvector('english', a.title || ' ' || a.content)"
+
+SNIPPET_WORDS = 32
+
+# Title matches weigh ten times more than content matches
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+
+
+def create_index(schema_editor):
+    """Create (and fill) the search index for the current database backend."""
+    conn = schema_editor.connection
+    if is_sqlite(conn):
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            f"USING fts5(title, content, tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, content) "
+            f"SELECT id, title, content FROM legal_article"
+        )
+    elif is_postgres(conn):
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON legal_article "
+            f"USING GIN (to_tsvector('english', title || ' ' || content))"
+        )
+
+
+def drop_index(schema_editor):
+    conn = schema_editor.connection
+    if is_sqlite(conn):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif is_postgres(conn):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {PG_INDEX}")
+
+
+def index_article(article):
+    """Insert or refresh one article in the FTS table."""
+    if not is_sqlite(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [article.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (%s, %s, %s)",
+            [article.pk, article.title, article.content],
+        )
+
+
+def remove_article(article_id):
+    """Remove one article from the FTS table."""
+    if not is_sqlite(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [article_id])
+
+
+def rebuild_index():
+    """Re-fill the FTS table from legal_article (e.g. after raw SQL imports)."""
+    if not is_sqlite(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, content) "
+            f"SELECT id, title, content FROM legal_article"
+        )
+
+
+def search_articles(text, limit=20):
+    """
+    Search articles and return ranked hits with chapter context.
+
+    Each hit is a dict with the article fields, a highlighted title, a
+    highlighted content snippet (escaped HTML whose only tags are
+    ``<mark>``), a relevance ``rank`` (higher is better) and the owning
+    chapter.
+    """
+    if is_sqlite(connection):
+        rows = _search_sqlite(text, limit)
+    elif is_postgres(connection):
+        rows = _search_postgres(text, limit)
+    else:
+        rows = _search_fallback(text, limit)
+
+    return [
+        {
+            'id': row[0],
+            'article_number': row[1],
+            'title': row[2],
+            'title_highlighted': highlighted_html(row[6]),
+            'snippet': highlighted_html(row[7]),
+            'rank': row[8],
+            'chapter': {
+                'id': row[3],
+                'number': row[4],
+                'title': row[5],
+            },
+        }
+        for row in rows
+    ]
+
+
+def _search_sqlite(text, limit):
+    match = fts5_match_query(text)
+    if not match:
+        return []
+    # bm25() is lower-is-better, so it is negated to a higher-is-better rank
+    sql = f"""
+        SELECT a.id, a.article_number, a.title, c.id, c.number, c.title,
+               highlight({FTS_TABLE}, 0, %s, %s),
+               snippet({FTS_TABLE}, 1, %s, %s, '…', %s),
+               -bm25({FTS_TABLE}, %s, %s) AS score
+        FROM {FTS_TABLE}
+        JOIN legal_article a ON a.id = {FTS_TABLE}.rowid
+        JOIN legal_chapter c ON c.id = a.chapter_id
+        WHERE {FTS_TABLE} MATCH %s
+        ORDER BY score DESC
+        LIMIT %s
+    """
+    params = [
+        MARK_START, MARK_END,
+        MARK_START, MARK_END, SNIPPET_WORDS,
+        TITLE_WEIGHT, CONTENT_WEIGHT,
+        match, limit,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _search_postgres(text, limit):
+    query = tsquery(text)
+    if not query:
+        return []
+    sql = f"""
+        SELECT a.id, a.article_number, a.title, c.id, c.number, c.title,
+               ts_headline('english', a.title, q, %s),
+               ts_headline('english', a.content, q, %s),
+               ts_rank(
+                   setweight(to_tsvector('english', a.title), 'A') ||
+                   setweight(to_tsvector('english', a.content), 'D'),
+                   q
+               ) AS score
+        FROM legal_article a
+        JOIN legal_chapter c ON c.id = a.chapter_id,
+             to_tsquery('english', %s) q
+        WHERE {PG_VECTOR} @@ q
+        ORDER BY score DESC
+        LIMIT %s
+    """
+    params = [
+        headline_options(HighlightAll='true'),
+        headline_options(MaxWords=SNIPPET_WORDS, MinWords=10, MaxFragments=2),
+        query, limit,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _search_fallback(text, limit):
+    from django.db.models import Q
+    from .models import Article
+
+    articles = Article.objects.select_related('chapter').filter(
+        Q(title__icontains=text) | Q(content__icontains=text)
+    )[:limit]
+    return [
+        (
+            a.id, a.article_number, a.title,
+            a.chapter.id, a.chapter.number, a.chapter.title,
+            a.title, a.content[:200], 0.0,
+        )
+        for a in articles
+    ]
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.versioning import version_changed
+from .models import Chapter, Article
+from . import search
+from .document import COLLECTION, rebuild_document
+
+
+@receiver(post_save, sender=Article)
+def index_article(sender, instance, **kwargs):
+    """
+    Keep the constitution search index in sync when an article is saved.
+    """
+    search.index_article(instance)
+
+
+@receiver(post_delete, sender=Article)
+def unindex_article(sender, instance, **kwargs):
+    """
+    Remove a deleted article (including chapter cascades) from the search index.
+    """
+    search.remove_article(instance.pk)
+
+
+@receiver(version_changed)
+def refresh_constitution_document(sender, version, **kwargs):
+    """
+    Rebuild the precompiled constitution document when a committed
+    Chapter/Article change moves the constitution version on; bumps are
+    coalesced per transaction, so a batch of edits rebuilds it once.
+    """
+    if sender == COLLECTION:
+        rebuild_document(version)
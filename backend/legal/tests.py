@@ -1,3 +1,134 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from core.versioning import version_changed
+from . import document
+from .models import Article, Chapter
+
+
+class ConstitutionDocumentTests(TestCase):
+    """The precompiled document is rebuilt once per commit and served by content ETag."""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.chapter = Chapter.objects.create(number=1, title='Name and Objectives')
+            self.article = Article.objects.create(
+                chapter=self.chapter, article_number='1', title='Name', content='The association shall be DASA.'
+            )
+        self.rebuilds = []
+        version_changed.connect(self.record, dispatch_uid='legal.tests')
+        self.addCleanup(version_changed.disconnect, dispatch_uid='legal.tests')
+
+    def record(self, sender, version, **kwargs):
+        if sender == document.COLLECTION:
+            self.rebuilds.append(version)
+
+    def get_list(self, **headers):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/constitution/chapters/', **headers)
+        return response, len(queries)
+
+    def test_transaction_rebuilds_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for number in range(2, 5):
+                Article.objects.create(
+                    chapter=self.chapter, article_number=str(number), title=f'Article {number}', content='Text'
+                )
+            self.chapter.title = 'Name, Objectives and Seal'
+            self.chapter.save()
+        self.assertEqual(len(self.rebuilds), 1)
+
+        response, queries = self.get_list()
+        self.assertEqual(queries, 0)
+        self.assertEqual(response.json()[0]['title'], 'Name, Objectives and Seal')
+        self.assertEqual(len(response.json()[0]['articles']), 4)
+
+        # Deleting the chapter cascades to its articles: still one rebuild
+        with self.captureOnCommitCallbacks(execute=True):
+            self.chapter.delete()
+        self.assertEqual(len(self.rebuilds), 2)
+        self.assertEqual(self.get_list()[0].json(), [])
+
+    def test_rolled_back_changes_keep_the_document(self):
+        first, _ = self.get_list()
+        with self.captureOnCommitCallbacks(execute=False):
+            Article.objects.create(chapter=self.chapter, article_number='2', title='Seal', content='Text')
+        Article.objects.filter(article_number='2').delete()  # as if the transaction rolled back
+
+        self.assertEqual(self.rebuilds, [])
+        self.assertEqual(self.get_list()[0]['ETag'], first['ETag'])
+
+    def test_etag_follows_content(self):
+        first, _ = self.get_list()
+        self.assertEqual(self.get_list(HTTP_IF_NONE_MATCH=first['ETag'])[0].status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.content = 'The association shall be known as DASA.'
+            self.article.save()
+
+        second, _ = self.get_list(HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        self.assertIn('known as DASA', second.json()[0]['articles'][0]['content'])
+
+    def test_document_expires(self):
+        # Another process's edit: the database changes, this process's version doesn't
+        Article.objects.filter(pk=self.article.pk).update(content='Amended elsewhere.')
+        first, _ = self.get_list()
+        self.assertNotIn('Amended', first.content.decode())
+
+        document.cache.delete(document.DOCUMENT_KEY.format(version=document.get_version()))  # expired
+        second, _ = self.get_list(HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertIn('Amended elsewhere.', second.content.decode())
+
+
+class ConstitutionSearchTests(TestCase):
+    """Search ranks title matches first and returns escaped, highlighted snippets."""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        chapter = Chapter.objects.create(number=4, title='Elections')
+        Article.objects.create(
+            chapter=chapter, article_number='4.2', title='Electoral Commission',
+            content='The commission shall <script>alert(1)</script> conduct every election & referendum.',
+        )
+        Article.objects.create(
+            chapter=chapter, article_number='4.1', title='Elections',
+            content='Elections shall be held in the second semester.',
+        )
+        Article.objects.create(
+            chapter=chapter, article_number='4.3', title='Dues', content='Members pay dues each semester.',
+        )
+
+    def search(self, query):
+        return self.client.get('/api/constitution/search/', {'q': query})
+
+    def test_title_matches_rank_first(self):
+        response = self.search('election')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([hit['article_number'] for hit in results], ['4.1', '4.2'])
+        self.assertGreater(results[0]['rank'], results[1]['rank'])
+        self.assertEqual((results[0]['chapter']['number'], results[0]['chapter']['title']), (4, 'Elections'))
+
+    def test_highlights_are_escaped(self):
+        hit = self.search('commission referendum').json()['results'][0]
+
+        self.assertEqual(hit['title_highlighted'], 'Electoral <mark>Commission</mark>')
+        self.assertIn('every election &amp; <mark>referendum</mark>', hit['snippet'])
+        self.assertIn('&lt;script&gt;alert(1)&lt;/script&gt;', hit['snippet'])
+        self.assertNotIn('<script>', hit['snippet'])
+
+    def test_empty_queries(self):
+        self.assertEqual(self.search('').status_code, 400)
+        self.assertEqual(self.search('   ').status_code, 400)
+
+        # No words left once operators and quotes are stripped
+        response = self.search('"*" OR -')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 0)
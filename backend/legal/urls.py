@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ChapterViewSet, ArticleViewSet
+from .views import ChapterViewSet, ArticleViewSet, ConstitutionSearchView
 
 router = DefaultRouter()
 router.register(r'chapters', ChapterViewSet, basename='chapters')
 router.register(r'articles', ArticleViewSet, basename='articles')
 
 urlpatterns = [
+    path('search/', ConstitutionSearchView.as_view(), name='constitution-search'),
     path('', include(router.urls)),
 ]
@@ -1,7 +1,16 @@
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
+from rest_framework.views import APIView
+from rest_framework.response import Response
 from rest_framework.filters import SearchFilter
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from core.caching import CachedResponseMixin
+from core.conditional import etag_matches
 from .models import Chapter, Article
 from .serializers import ChapterSerializer, ArticleSerializer
+from .search import search_articles
+from .document import get_document, etag_for
 
 
 class IsAdminOrReadOnly(permissions.BasePermission):
@@ -17,7 +26,7 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         return request.user and request.user.is_staff
 
 
-class ChapterViewSet(viewsets.ModelViewSet):
+class ChapterViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing constitution chapters with articles.
 
@@ -33,13 +42,45 @@ class ChapterViewSet(viewsets.ModelViewSet):
     - POST /api/constitution/chapters/ - Create chapter (admin only)
     - PUT/PATCH /api/constitution/chapters/{id}/ - Update chapter (admin only)
     - DELETE /api/constitution/chapters/{id}/ - Delete chapter (admin only)
+
+    Unfiltered list/retrieve requests are served from the precompiled
+    document in legal.document (zero queries, ETag + long-lived caching);
+    searches go through the response cache.
     """
     queryset = Chapter.objects.prefetch_related('articles').all()
     serializer_class = ChapterSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cache_models = ['constitution']
     filter_backends = [SearchFilter]
     search_fields = ['title', 'articles__title', 'articles__content']
 
+    def _document_response(self, request, body, etag):
+        """Return the cached JSON body, or a 304 if the client already has it."""
+        if etag_matches(request, etag):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=settings.CONSTITUTION_CACHE_SECONDS)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params:
+            return super().list(request, *args, **kwargs)
+        blob = get_document()
+        return self._document_response(request, blob['document'], etag_for(blob))
+
+    def retrieve(self, request, *args, **kwargs):
+        blob = get_document()
+        try:
+            chapter_id = int(kwargs[self.lookup_field])
+        except (KeyError, ValueError):
+            return super().retrieve(request, *args, **kwargs)
+        body = blob['chapters'].get(chapter_id)
+        if body is None:
+            return super().retrieve(request, *args, **kwargs)
+        return self._document_response(request, body, etag_for(blob, chapter_id))
+
 
 class ArticleViewSet(viewsets.ModelViewSet):
     """
@@ -64,3 +105,43 @@ class ArticleViewSet(viewsets.ModelViewSet):
     filter_backends = [SearchFilter]
     search_fields = ['title', 'content', 'article_number']
     filterset_fields = ['chapter']
+
+
+class ConstitutionSearchView(APIView):
+    """
+    Full-text search over the constitution.
+
+    Backed by the article search index (SQLite FTS5 / Postgres tsvector), so
+    results come back ranked, with highlighted snippets and chapter context,
+    in a single query. ``title_highlighted`` and ``snippet`` are escaped
+    HTML whose only tags are ``<mark>`` around the matches.
+
+    Endpoint:
+    - GET /api/constitution/search/?q=election&limit=20
+
+    Query parameters:
+    - q: Search text (required). Every word must match; words match as prefixes.
+    - limit: Maximum number of hits (default 20, max 100)
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'Query parameter q is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), 100)
+        except ValueError:
+            limit = 20
+
+        results = search_articles(query, limit=max(limit, 1))
+
+        return Response({
+            'query': query,
+            'count': len(results),
+            'results': results,
+        })
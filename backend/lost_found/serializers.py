@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from dasa_users.serializers import UserSummarySerializer
 from .models import LostItem
 
 
@@ -7,7 +8,7 @@ class LostItemSerializer(serializers.ModelSerializer):
     Serializer for lost and found items.
     """
     reporter_name = serializers.CharField(source='reporter.username', read_only=True)
-    reporter_details = serializers.SerializerMethodField()
+    reporter_details = UserSummarySerializer(source='reporter', read_only=True)
     image_url = serializers.SerializerMethodField()
     type_display = serializers.CharField(source='get_type_display', read_only=True)
     category_display = serializers.CharField(source='get_category_display', read_only=True)
@@ -33,19 +34,6 @@ class LostItemSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['reporter', 'created_at']
 
-    def get_reporter_details(self, obj):
-        """Return nested reporter details with avatar"""
-        if not obj.reporter:
-            return None
-
-        return {
-            'id': obj.reporter.id,
-            'username': obj.reporter.username,
-            'email': obj.reporter.email,
-            'full_name': f"{obj.reporter.first_name} {obj.reporter.last_name}" if obj.reporter.first_name and obj.reporter.last_name else obj.reporter.username,
-            'avatar': obj.reporter.profile.profile_picture.url if hasattr(obj.reporter, 'profile') and obj.reporter.profile.profile_picture else None,
-        }
-
     def get_image_url(self, obj):
         """Return full URL for the image"""
         if obj.image:
@@ -1,11 +1,12 @@
 from rest_framework import viewsets, permissions
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from core.querysets import QueryPlanMixin
 from .models import LostItem
 from .serializers import LostItemSerializer
 
 
-class LostItemViewSet(viewsets.ModelViewSet):
+class LostItemViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint for lost and found items.
     Automatically creates announcements when items are posted.
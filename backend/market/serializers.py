@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from dasa_users.serializers import UserSummarySerializer
 from .models import Product
 
 
@@ -7,7 +8,7 @@ class ProductSerializer(serializers.ModelSerializer):
     Serializer for marketplace products.
     """
     seller_name = serializers.CharField(source='seller.username', read_only=True)
-    seller_details = serializers.SerializerMethodField()
+    seller_details = UserSummarySerializer(source='seller', read_only=True)
     image_url = serializers.SerializerMethodField()
     contact_phone = serializers.SerializerMethodField()
     category_display = serializers.CharField(source='get_category_display', read_only=True)
@@ -36,19 +37,6 @@ class ProductSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['seller', 'created_at']
 
-    def get_seller_details(self, obj):
-        """Return nested seller details with avatar"""
-        if not obj.seller:
-            return None
-
-        return {
-            'id': obj.seller.id,
-            'username': obj.seller.username,
-            'email': obj.seller.email,
-            'full_name': f"{obj.seller.first_name} {obj.seller.last_name}" if obj.seller.first_name and obj.seller.last_name else obj.seller.username,
-            'avatar': obj.seller.profile.profile_picture.url if hasattr(obj.seller, 'profile') and obj.seller.profile.profile_picture else None,
-        }
-
     def get_image_url(self, obj):
         """Return full URL for the image"""
         if obj.image:
@@ -1,3 +1,43 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from dasa_users.models import User
+from .models import Product
 
-# Create your tests here.
+
+class ProductConditionalGetTests(TestCase):
+    """Unchanged lists are answered with 304 from the version stamp alone."""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.seller = User.objects.create_user(username='seller', password='pass12345')
+        self.product = Product.objects.create(
+            seller=self.seller,
+            title='Item',
+            price='10.00',
+            category='Books',
+            condition='New',
+            description='Test item',
+            whatsapp_number='0200000000',
+        )
+
+    def test_unchanged_list_returns_304_without_queries(self):
+        etag = self.client.get('/api/market/products/')['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/market/products/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 0)
+
+    def test_write_changes_etag(self):
+        etag = self.client.get('/api/market/products/')['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.title = 'Renamed'
+            self.product.save()
+
+        response = self.client.get('/api/market/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
@@ -1,6 +1,9 @@
 from rest_framework import viewsets, permissions
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from core.conditional import ConditionalGetMixin
+from core.querysets import QueryPlanMixin
+from dasa_users.models import User, Profile
 from .models import Product
 from .serializers import ProductSerializer
 
@@ -23,7 +26,7 @@ class IsOwnerOrAdminOrReadOnly(permissions.BasePermission):
         return obj.seller == request.user
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint for marketplace products.
 
@@ -42,6 +45,8 @@ class ProductViewSet(viewsets.ModelViewSet):
     """
     queryset = Product.objects.select_related('seller').all()
     serializer_class = ProductSerializer
+    # seller_details reads the seller's user and profile rows
+    etag_models = [Product, User, Profile]
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['category', 'is_sold', 'condition']
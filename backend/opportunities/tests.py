@@ -1,3 +1,64 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from rest_framework import viewsets
+from rest_framework.test import APIRequestFactory
+
+from core.projection import CompiledSerializer, NotCompilable, ValuesListMixin, compile_serializer
+from core.testing import ProjectionParityMixin
+from .models import Opportunity
+from .serializers import OpportunitySerializer
+
+
+class ShoutedOpportunitySerializer(OpportunitySerializer):
+    # A custom to_representation(): the compiler can't reproduce it
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['organization_upper'] = instance.organization.upper()
+        return data
+
+
+class ShoutedOpportunityViewSet(ValuesListMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Opportunity.objects.all()
+    serializer_class = ShoutedOpportunitySerializer
+
+
+class OpportunityListProjectionTests(ProjectionParityMixin, TestCase):
+    """The values() opportunity list matches OpportunitySerializer field for field."""
+
+    def setUp(self):
+        deadline = datetime.datetime(2026, 11, 30, 23, 59, 59, 123456, tzinfo=datetime.timezone.utc)
+        with self.captureOnCommitCallbacks(execute=True):
+            for number, kind in enumerate(['Internship', 'NSS']):
+                Opportunity.objects.create(
+                    title=f'Opportunity {number}', organization='Ghana Grid Company', location='Tema',
+                    type=kind, description='Apply early', application_link='https://example.com/apply',
+                    deadline=deadline + datetime.timedelta(days=number),
+                )
+
+    def test_list_matches_serializer(self):
+        data = self.assertListMatchesSerializer(
+            '/api/opportunities/opportunities/', OpportunitySerializer, Opportunity.objects.all()
+        )
+        self.assertEqual(data[0]['deadline'], '2026-11-30T23:59:59.123456Z')
+        self.assertEqual(data[0]['application_link'], 'https://example.com/apply')
+
+    @override_settings(TIME_ZONE='Africa/Lagos')
+    def test_datetimes_follow_the_current_timezone(self):
+        data = self.assertListMatchesSerializer(
+            '/api/opportunities/opportunities/?type=NSS', OpportunitySerializer, Opportunity.objects.filter(type='NSS')
+        )
+        self.assertEqual(data[0]['deadline'], '2026-12-02T00:59:59.123456+01:00')
+
+    def test_uncompilable_serializers_fall_back(self):
+        with self.assertRaises(NotCompilable):
+            CompiledSerializer(ShoutedOpportunitySerializer)
+        self.assertIsNone(compile_serializer(ShoutedOpportunitySerializer))
+
+        request = APIRequestFactory().get('/', HTTP_HOST='localhost')
+        response = ShoutedOpportunityViewSet.as_view({'get': 'list'})(request)
+        self.assertEqual(
+            response.data,
+            ShoutedOpportunitySerializer(Opportunity.objects.all(), many=True, context={'request': request}).data,
+        )
+        self.assertEqual(response.data[0]['organization_upper'], 'GHANA GRID COMPANY')
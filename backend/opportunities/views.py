@@ -1,10 +1,12 @@
 from rest_framework import viewsets, permissions
 from rest_framework.permissions import AllowAny, IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
+from core.caching import CachedResponseMixin
+from core.projection import ValuesListMixin
 from .models import Opportunity
 from .serializers import OpportunitySerializer
 
-class OpportunityViewSet(viewsets.ModelViewSet):
+class OpportunityViewSet(CachedResponseMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Opportunity.objects.all()
     serializer_class = OpportunitySerializer
     # permission_classes = [AllowAny]
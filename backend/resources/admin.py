@@ -8,12 +8,12 @@ class AcademicResourceAdmin(admin.ModelAdmin):
     Admin interface for managing academic resources.
     """
 
-    list_display = ('course_code', 'title', 'college', 'level', 'semester', 'downloads', 'uploaded_at')
-    list_filter = ('college', 'level', 'semester', 'uploaded_at')
+    list_display = ('course_code', 'title', 'college', 'level', 'semester', 'downloads', 'text_status', 'uploaded_at')
+    list_filter = ('college', 'level', 'semester', 'text_status', 'uploaded_at')
     search_fields = ('title', 'course_code')
     ordering = ('-uploaded_at',)
     date_hierarchy = 'uploaded_at'
-    readonly_fields = ('downloads', 'uploaded_at')
+    readonly_fields = ('downloads', 'uploaded_at', 'text_status', 'page_count')
 
     fieldsets = (
         ('Resource Details', {
@@ -23,7 +23,7 @@ class AcademicResourceAdmin(admin.ModelAdmin):
             'fields': ('college', 'level', 'semester')
         }),
         ('Statistics', {
-            'fields': ('downloads', 'uploaded_at'),
+            'fields': ('downloads', 'uploaded_at', 'text_status', 'page_count'),
             'classes': ('collapse',)
         }),
     )
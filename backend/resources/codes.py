@@ -0,0 +1,126 @@
+"""
+Course code normalisation and the in-memory autocomplete trie.
+
+Students type course codes as ``MATH 122``, ``math122`` or ``Math-122``;
+they all normalise to ``MATH122``, which is what
+``AcademicResource.course_code_normalized`` stores and what lookups compare
+against.
+
+The trie holds every distinct normalised code with its display form and
+resource count. It lives in process memory and is rebuilt lazily when the
+shared course-code version (bumped by ``resources.signals``) moves on, so
+autocomplete requests normally never touch the database.
+"""
+
+import re
+import threading
+
+from core import versioning
+
+# Free-standing version (core.versioning): only code changes move it
+VERSION_NAME = 'resources.course_codes'
+
+_NON_ALNUM = re.compile(r'[^0-9A-Za-z]')
+
+
+def normalize_course_code(code):
+    """'Math-122' / 'math 122' / 'MATH122' -> 'MATH122'."""
+    return _NON_ALNUM.sub('', code or '').upper()
+
+
+def prefix_range(prefix):
+    """
+    (lower, upper) bounds matching every string that starts with ``prefix``.
+
+    A range filter (``__gte`` / ``__lt``) can use the plain B-tree index on
+    the normalised column on every backend, unlike ``startswith`` which
+    SQLite turns into a case-insensitive LIKE that skips the index.
+    """
+    return prefix, prefix + '￿'
+
+
+class CourseCodeTrie:
+    """
+    Prefix tree over normalised course codes.
+
+    Each node keeps the codes below it ranked by resource count, so a lookup
+    is a walk of len(prefix) nodes followed by a slice.
+    """
+
+    def __init__(self, entries=(), max_suggestions=10):
+        self.max_suggestions = max_suggestions
+        self.root = {}
+        for normalized, display, count in entries:
+            self.insert(normalized, display, count)
+        self.freeze()
+
+    def insert(self, normalized, display, count):
+        entry = (normalized, display, count)
+        node = self.root
+        node.setdefault('$codes', []).append(entry)
+        for char in normalized:
+            node = node.setdefault(char, {})
+            node.setdefault('$codes', []).append(entry)
+
+    def freeze(self):
+        """Sort and cap every node's suggestions once, after all inserts."""
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            codes = node.get('$codes')
+            if codes:
+                codes.sort(key=lambda e: (-e[2], e[0]))
+                node['$codes'] = codes[:self.max_suggestions]
+            stack.extend(child for key, child in node.items() if key != '$codes')
+
+    def suggest(self, prefix, limit=None):
+        node = self.root
+        for char in normalize_course_code(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+        codes = node.get('$codes', [])
+        return codes[:limit] if limit else codes
+
+
+def get_version():
+    """Return the current course-code version."""
+    return versioning.get_version(VERSION_NAME)
+
+
+def bump_version():
+    """Mark every process's trie as stale."""
+    versioning.bump_version(VERSION_NAME)
+
+
+_trie = None
+_trie_version = None
+_lock = threading.Lock()
+
+
+def build_trie():
+    """Load every distinct course code with its resource count."""
+    from django.db.models import Count, Max
+    from .models import AcademicResource
+
+    rows = (
+        AcademicResource.objects
+        .values('course_code_normalized')
+        .annotate(display=Max('course_code'), total=Count('id'))
+        .order_by()
+    )
+    return CourseCodeTrie(
+        (row['course_code_normalized'], row['display'], row['total']) for row in rows
+    )
+
+
+def get_trie():
+    """Return the process-local trie, rebuilding it if the codes changed."""
+    global _trie, _trie_version
+    version = get_version()
+    if _trie is None or _trie_version != version:
+        with _lock:
+            if _trie is None or _trie_version != version:
+                _trie = build_trie()
+                _trie_version = version
+    return _trie
@@ -0,0 +1,239 @@
+"""
+PDF text extraction and content search for academic resources.
+
+Uploaded PDFs are read page by page with pypdf (pure Python, optional
+dependency) on a background worker once the upload is committed. Each page
+is stored as a ResourcePage row and written in small batches, so a large
+scanned file never has all of its text in memory at once.
+
+On SQLite an external-content FTS5 table (``resources_resourcepage_fts``)
+mirrors ResourcePage through triggers; other backends fall back to
+icontains on the page text. Snippets are escaped HTML whose only tags are
+``<mark>`` around the matches.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections, connection
+
+from core import versioning
+from core.fts import MARK_END, MARK_START, fts5_match_query, highlighted_html, is_sqlite, tokenize
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pragma: no cover - optional dependency
+    PdfReader = None
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'resources_resourcepage_fts'
+
+SNIPPET_WORDS = 24
+
+# Pages written per INSERT while extracting
+PAGE_BATCH_SIZE = 20
+
+# Best-matching pages returned per resource
+MAX_PAGES_PER_RESOURCE = 5
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='resource-text')
+
+
+def create_fts_table(schema_editor):
+    """Create the FTS5 mirror of ResourcePage and its sync triggers."""
+    if not is_sqlite(schema_editor.connection):
+        return
+    statements = [
+        f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+            text,
+            content='resources_resourcepage', content_rowid='id',
+            tokenize='porter unicode61 remove_diacritics 2'
+        )""",
+        f"""CREATE TRIGGER resources_resourcepage_ai AFTER INSERT ON resources_resourcepage BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+        END""",
+        f"""CREATE TRIGGER resources_resourcepage_ad AFTER DELETE ON resources_resourcepage BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.id, old.text);
+        END""",
+        f"""CREATE TRIGGER resources_resourcepage_au AFTER UPDATE ON resources_resourcepage BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.id, old.text);
+            INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+        END""",
+    ]
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_fts_table(schema_editor):
+    if not is_sqlite(schema_editor.connection):
+        return
+    for statement in [
+        "DROP TRIGGER IF EXISTS resources_resourcepage_ai",
+        "DROP TRIGGER IF EXISTS resources_resourcepage_ad",
+        "DROP TRIGGER IF EXISTS resources_resourcepage_au",
+        f"DROP TABLE IF EXISTS {FTS_TABLE}",
+    ]:
+        schema_editor.execute(statement)
+
+
+# ---------------------------------------------------------------------------
+# Extraction
+# ---------------------------------------------------------------------------
+
+def iter_pdf_pages(fileobj):
+    """
+    Yield ``(page_number, text)`` for each page of an open PDF file.
+
+    pypdf parses pages lazily from the stream, so only the current page's
+    objects and text are held at a time.
+    """
+    reader = PdfReader(fileobj)
+    for number, page in enumerate(reader.pages, 1):
+        try:
+            text = page.extract_text() or ''
+        except Exception:
+            logger.warning("Could not extract text from page %s", number, exc_info=True)
+            text = ''
+        # NUL bytes from broken encodings are rejected by some databases
+        yield number, text.replace('\x00', '')
+
+
+def _update(resources, **fields):
+    """QuerySet.update() skips post_save, so move the resource version here."""
+    from .models import AcademicResource
+
+    resources.update(**fields)
+    versioning.bump_on_commit(AcademicResource)
+
+
+def extract_resource_text(resource_id):
+    """
+    Extract and store the text of one resource's PDF, replacing old pages.
+
+    Status changes go through QuerySet.update() so they don't re-trigger
+    the post_save handler that schedules extraction.
+    """
+    from .models import AcademicResource, ResourcePage
+
+    resources = AcademicResource.objects.filter(pk=resource_id)
+    resource = resources.only('id', 'file').first()
+    if resource is None:
+        return None
+
+    if PdfReader is None:
+        _update(resources, text_status=AcademicResource.TEXT_UNAVAILABLE)
+        return AcademicResource.TEXT_UNAVAILABLE
+    if not resource.file:
+        _update(resources, text_status=AcademicResource.TEXT_DONE, page_count=0)
+        return AcademicResource.TEXT_DONE
+
+    _update(resources, text_status=AcademicResource.TEXT_PROCESSING)
+    # Pages are committed batch by batch rather than in one transaction, so
+    # a long extraction never holds a write lock on the database
+    ResourcePage.objects.filter(resource_id=resource_id).delete()
+    page_count = 0
+    try:
+        batch = []
+        with resource.file.open('rb') as fileobj:
+            for page_number, text in iter_pdf_pages(fileobj):
+                batch.append(ResourcePage(resource_id=resource_id, page_number=page_number, text=text))
+                page_count = page_number
+                if len(batch) >= PAGE_BATCH_SIZE:
+                    ResourcePage.objects.bulk_create(batch)
+                    batch = []
+        ResourcePage.objects.bulk_create(batch)
+    except Exception:
+        logger.exception("Text extraction failed for resource %s", resource_id)
+        ResourcePage.objects.filter(resource_id=resource_id).delete()
+        _update(resources, text_status=AcademicResource.TEXT_FAILED, page_count=0)
+        return AcademicResource.TEXT_FAILED
+
+    _update(resources, text_status=AcademicResource.TEXT_DONE, page_count=page_count)
+    return AcademicResource.TEXT_DONE
+
+
+def _run_in_background(resource_id):
+    close_old_connections()
+    try:
+        extract_resource_text(resource_id)
+    except Exception:
+        logger.exception("Text extraction failed for resource %s", resource_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_extraction(resource_id):
+    """Queue a resource for extraction on the background worker."""
+    _executor.submit(_run_in_background, resource_id)
+
+
+# ---------------------------------------------------------------------------
+# Querying
+# ---------------------------------------------------------------------------
+
+def search_pages(text, limit=20, resources=None):
+    """
+    Search resource content.
+
+    Returns up to ``limit`` ``(resource_id, pages)`` pairs, best resource
+    first, where pages is a list of ``{'page_number', 'snippet', 'rank'}``
+    (at most MAX_PAGES_PER_RESOURCE, best page first).
+
+    ``resources`` (an AcademicResource queryset, e.g. the filtered list
+    queryset) restricts the search to those resources inside the query
+    itself, so filters never push matching resources past the row cap.
+    """
+    if resources is not None:
+        resources = resources.order_by().values('pk')
+    if is_sqlite(connection):
+        rows = _search_sqlite(text, resources)
+    else:
+        rows = _search_fallback(text, resources)
+
+    hits = {}
+    for resource_id, page_number, snippet, rank in rows:
+        pages = hits.setdefault(resource_id, [])
+        if len(pages) < MAX_PAGES_PER_RESOURCE:
+            pages.append({'page_number': page_number, 'snippet': highlighted_html(snippet), 'rank': rank})
+    return list(hits.items())[:limit]
+
+
+def _search_sqlite(text, resources=None):
+    match = fts5_match_query(text)
+    if not match:
+        return []
+    where, params = '', []
+    if resources is not None:
+        subquery, params = resources.query.sql_with_params()
+        where = f"AND p.resource_id IN ({subquery})"
+    with connection.cursor() as cursor:
+        # bm25() is lower-is-better, so it is negated to a higher-is-better rank
+        cursor.execute(
+            f"""SELECT p.resource_id, p.page_number,
+                       snippet({FTS_TABLE}, 0, %s, %s, '…', %s),
+                       -bm25({FTS_TABLE}) AS score
+                FROM {FTS_TABLE} JOIN resources_resourcepage p ON p.id = {FTS_TABLE}.rowid
+                WHERE {FTS_TABLE} MATCH %s {where}
+                ORDER BY score DESC
+                LIMIT 500""",
+            [MARK_START, MARK_END, SNIPPET_WORDS, match, *params],
+        )
+        return cursor.fetchall()
+
+
+def _search_fallback(text, resources=None):
+    from .models import ResourcePage
+
+    tokens = tokenize(text)
+    if not tokens:
+        return []
+    pages = ResourcePage.objects.all()
+    if resources is not None:
+        pages = pages.filter(resource__in=resources)
+    for token in tokens:
+        pages = pages.filter(text__icontains=token)
+    return [
+        (page.resource_id, page.page_number, page.text[:200], 0.0)
+        for page in pages.order_by('resource_id', 'page_number')[:500]
+    ]
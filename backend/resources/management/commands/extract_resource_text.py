@@ -0,0 +1,42 @@
+"""
+Management command to extract PDF text for academic resource content search.
+
+Runs synchronously, one resource at a time. Use it to backfill resources
+uploaded before content search existed or to retry failed extractions.
+
+Usage:
+    python manage.py extract_resource_text            # pending/failed only
+    python manage.py extract_resource_text --all      # re-extract everything
+    python manage.py extract_resource_text --id 12 --id 15
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from resources.models import AcademicResource
+from resources.content import PdfReader, extract_resource_text
+
+
+class Command(BaseCommand):
+    help = 'Extract text from academic resource PDFs into the content search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Re-extract every resource')
+        parser.add_argument('--id', action='append', type=int, dest='ids', help='Resource id (repeatable)')
+
+    def handle(self, *args, **options):
+        if PdfReader is None:
+            raise CommandError('pypdf is not installed (pip install pypdf)')
+
+        resources = AcademicResource.objects.all()
+        if options['ids']:
+            resources = resources.filter(id__in=options['ids'])
+        elif not options['all']:
+            resources = resources.exclude(text_status=AcademicResource.TEXT_DONE)
+
+        results = {}
+        for resource_id in resources.values_list('id', flat=True).iterator():
+            status = extract_resource_text(resource_id)
+            results[status] = results.get(status, 0) + 1
+            self.stdout.write(f'  {resource_id}: {status}')
+
+        summary = ', '.join(f'{count} {status}' for status, count in results.items()) or 'nothing to do'
+        self.stdout.write(self.style.SUCCESS(f'Extraction finished: {summary}.'))
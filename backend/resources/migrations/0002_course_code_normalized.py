@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:53
+
+import re
+
+from django.db import migrations, models
+
+
+def backfill_course_code_normalized(apps, schema_editor):
+    AcademicResource = apps.get_model("resources", "AcademicResource")
+    resources = list(AcademicResource.objects.only("id", "course_code"))
+    for resource in resources:
+        resource.course_code_normalized = re.sub(
+            r"[^0-9A-Za-z]", "", resource.course_code or ""
+        ).upper()
+    AcademicResource.objects.bulk_update(
+        resources, ["course_code_normalized"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resources", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="academicresource",
+            name="course_code_normalized",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                editable=False,
+                help_text="Course code without spaces/punctuation, uppercased (e.g., 'MATH122')",
+                max_length=20,
+            ),
+        ),
+        migrations.RunPython(
+            backfill_course_code_normalized, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_fts_table(apps, schema_editor):
+    from resources.content import create_fts_table
+
+    create_fts_table(schema_editor)
+
+
+def drop_fts_table(apps, schema_editor):
+    from resources.content import drop_fts_table
+
+    drop_fts_table(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resources", "0002_course_code_normalized"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="academicresource",
+            name="page_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="academicresource",
+            name="text_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("processing", "Processing"),
+                    ("done", "Done"),
+                    ("failed", "Failed"),
+                    ("unavailable", "Extractor not installed"),
+                ],
+                default="pending",
+                editable=False,
+                help_text="State of PDF text extraction for content search",
+                max_length=20,
+            ),
+        ),
+        migrations.CreateModel(
+            name="ResourcePage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("page_number", models.PositiveIntegerField()),
+                ("text", models.TextField(blank=True)),
+                (
+                    "resource",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pages",
+                        to="resources.academicresource",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["resource", "page_number"],
+                "unique_together": {("resource", "page_number")},
+            },
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from .codes import normalize_course_code
+
 
 class AcademicResource(models.Model):
     """
@@ -20,6 +22,20 @@ class AcademicResource(models.Model):
         (2, 'Semester 2'),
     ]
 
+    TEXT_PENDING = 'pending'
+    TEXT_PROCESSING = 'processing'
+    TEXT_DONE = 'done'
+    TEXT_FAILED = 'failed'
+    TEXT_UNAVAILABLE = 'unavailable'
+
+    TEXT_STATUS_CHOICES = [
+        (TEXT_PENDING, 'Pending'),
+        (TEXT_PROCESSING, 'Processing'),
+        (TEXT_DONE, 'Done'),
+        (TEXT_FAILED, 'Failed'),
+        (TEXT_UNAVAILABLE, 'Extractor not installed'),
+    ]
+
     COLLEGE_CHOICES = [
         ('CoS', 'College of Science'),
         ('CoE', 'College of Engineering'),
@@ -31,12 +47,28 @@ class AcademicResource(models.Model):
 
     title = models.CharField(max_length=200, help_text="Resource title (e.g., 'Calculus I Past Questions 2023')")
     course_code = models.CharField(max_length=20, help_text="Course code (e.g., 'MATH 122')")
+    course_code_normalized = models.CharField(
+        max_length=20,
+        blank=True,
+        default='',
+        db_index=True,
+        editable=False,
+        help_text="Course code without spaces/punctuation, uppercased (e.g., 'MATH122')"
+    )
     file = models.FileField(upload_to='resources/pasco/', help_text="Upload PDF file")
     college = models.CharField(max_length=10, choices=COLLEGE_CHOICES)
     level = models.IntegerField(choices=LEVEL_CHOICES)
     semester = models.IntegerField(choices=SEMESTER_CHOICES)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     downloads = models.IntegerField(default=0, editable=False)
+    text_status = models.CharField(
+        max_length=20,
+        choices=TEXT_STATUS_CHOICES,
+        default=TEXT_PENDING,
+        editable=False,
+        help_text="State of PDF text extraction for content search"
+    )
+    page_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ['-uploaded_at']
@@ -46,7 +78,48 @@ class AcademicResource(models.Model):
     def __str__(self):
         return f"{self.course_code} - {self.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'file' in instance.__dict__:
+            # Remember the stored file so save() can tell when it is replaced
+            instance._loaded_file_name = instance.file.name
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.course_code_normalized = normalize_course_code(self.course_code)
+        if self._state.adding or (
+            hasattr(self, '_loaded_file_name') and self.file.name != self._loaded_file_name
+        ):
+            # New or replaced PDF: its text needs (re-)extracting
+            self.text_status = self.TEXT_PENDING
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'course_code' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'course_code_normalized'}
+        super().save(*args, **kwargs)
+        self._loaded_file_name = self.file.name
+
     def increment_downloads(self):
         """Increment download count"""
         self.downloads += 1
         self.save(update_fields=['downloads'])
+
+
+class ResourcePage(models.Model):
+    """
+    Text extracted from one page of an AcademicResource PDF.
+
+    Mirrored into a full-text index (see ``resources.content``) so resources
+    can be searched by what the questions are about, with page-level hits.
+    """
+
+    resource = models.ForeignKey(AcademicResource, on_delete=models.CASCADE, related_name='pages')
+    page_number = models.PositiveIntegerField()
+    text = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['resource', 'page_number']
+        unique_together = ['resource', 'page_number']
+
+    def __str__(self):
+        return f"{self.resource.course_code} - page {self.page_number}"
@@ -28,8 +28,10 @@ class AcademicResourceSerializer(serializers.ModelSerializer):
             'semester_display',
             'uploaded_at',
             'downloads',
+            'text_status',
+            'page_count',
         ]
-        read_only_fields = ['uploaded_at', 'downloads']
+        read_only_fields = ['uploaded_at', 'downloads', 'text_status', 'page_count']
 
     def get_file_url(self, obj):
         """Return full URL for the file"""
@@ -0,0 +1,36 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import AcademicResource
+from .codes import bump_version
+from .content import schedule_extraction
+
+
+@receiver(post_save, sender=AcademicResource)
+def refresh_course_codes_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Invalidate the course-code trie when a resource's code could have changed.
+    Download-count updates (update_fields=['downloads']) are ignored.
+    """
+    if update_fields is not None and 'course_code' not in update_fields:
+        return
+    transaction.on_commit(bump_version)
+
+
+@receiver(post_delete, sender=AcademicResource)
+def refresh_course_codes_on_delete(sender, instance, **kwargs):
+    """
+    Invalidate the course-code trie when a resource is deleted.
+    """
+    transaction.on_commit(bump_version)
+
+
+@receiver(post_save, sender=AcademicResource)
+def extract_text_on_save(sender, instance, update_fields=None, **kwargs):
+    """
+    Queue text extraction for a new or replaced PDF once the upload is committed.
+    """
+    if update_fields is not None and 'file' not in update_fields:
+        return
+    if instance.text_status == AcademicResource.TEXT_PENDING:
+        transaction.on_commit(lambda: schedule_extraction(instance.pk))
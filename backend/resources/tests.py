@@ -1,3 +1,178 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from . import codes, content
+from .codes import CourseCodeTrie, normalize_course_code, prefix_range
+from .models import AcademicResource, ResourcePage
+
+
+def create_resource(course_code, title='Past Questions', college='CoS', level=100, semester=1, **fields):
+    return AcademicResource.objects.create(
+        title=title, course_code=course_code, file='resources/pasco/questions.pdf',
+        college=college, level=level, semester=semester,
+        **fields,
+    )
+
+
+class CourseCodeTests(TestCase):
+    """Course codes are normalised, looked up by prefix range and suggested from the trie."""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        create_resource('MATH 122', 'Calculus II 2023')
+        create_resource('math-122', 'Calculus II 2024', semester=2)
+        create_resource('MATH 151', 'Algebra')
+        create_resource('MATH 251', 'Linear Algebra', level=200)
+        create_resource('PHY 122', 'Mechanics', college='CoE')
+        # Committing new uploads would also queue their text extraction
+        codes.bump_version()
+
+    def test_normalisation(self):
+        for code in ['Math-122', 'math 122', ' MATH122 ', 'MATH.122']:
+            self.assertEqual(normalize_course_code(code), 'MATH122')
+        self.assertEqual(normalize_course_code(None), '')
+        self.assertEqual(
+            set(AcademicResource.objects.values_list('course_code_normalized', flat=True)),
+            {'MATH122', 'MATH151', 'MATH251', 'PHY122'},
+        )
+
+    def test_prefix_range(self):
+        lower, upper = prefix_range('MATH1')
+        for code in ['MATH1', 'MATH122', 'MATH199Z']:
+            self.assertTrue(lower <= code < upper)
+        for code in ['MATH', 'MATH251', 'MATH2', 'PHY122']:
+            self.assertFalse(lower <= code < upper)
+
+    def test_lookup_matches_prefix_and_groups(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/resources/lookup/', {'code': 'Math-1'})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['code'], data['count']), ('MATH1', 3))
+        [college] = data['results']
+        [level] = college['levels']
+        self.assertEqual((college['college'], level['level']), ('CoS', 100))
+        self.assertEqual(
+            [[r['course_code'] for r in semester['resources']] for semester in level['semesters']],
+            [['MATH 122', 'MATH 151'], ['math-122']],
+        )
+        # A range on the indexed column, not a LIKE
+        lookup = next(q['sql'] for q in queries if 'course_code_normalized' in q['sql'])
+        self.assertIn('>=', lookup)
+        self.assertNotIn('LIKE', lookup)
+
+        self.assertEqual(self.client.get('/api/resources/lookup/', {'code': 'math 122'}).json()['count'], 2)
+        self.assertEqual(self.client.get('/api/resources/lookup/', {'code': '--'}).status_code, 400)
+
+    def test_trie_ranks_by_count_and_caps(self):
+        trie = CourseCodeTrie([
+            ('MATH151', 'MATH 151', 1),
+            ('MATH122', 'MATH 122', 4),
+            ('MATH101', 'MATH 101', 4),
+            ('PHY122', 'PHY 122', 9),
+        ], max_suggestions=2)
+
+        self.assertEqual([e[0] for e in trie.suggest('math')], ['MATH101', 'MATH122'])
+        self.assertEqual([e[0] for e in trie.suggest('Math-1', limit=1)], ['MATH101'])
+        self.assertEqual([e[0] for e in trie.suggest('')], ['PHY122', 'MATH101'])
+        self.assertEqual(trie.suggest('CHEM'), [])
+
+    def test_autocomplete_is_served_from_the_trie(self):
+        self.client.get('/api/resources/autocomplete/', {'q': 'ma'})  # builds the trie
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/resources/autocomplete/', {'q': 'Ma', 'limit': 2})
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(response.json(), [
+            {'code': 'math-122', 'normalized': 'MATH122', 'count': 2},
+            {'code': 'MATH 151', 'normalized': 'MATH151', 'count': 1},
+        ])
+        self.assertEqual(self.client.get('/api/resources/autocomplete/', {'q': '-'}).json(), [])
+        self.assertEqual(self.client.get('/api/resources/autocomplete/', {'limit': 'x', 'q': 'm'}).status_code, 400)
+
+    def test_trie_rebuilds_after_code_changes_only(self):
+        trie = codes.get_trie()
+        resource = AcademicResource.objects.get(title='Algebra')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resource.increment_downloads()
+        self.assertIs(codes.get_trie(), trie)
+
+        version = codes.get_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            resource.course_code = 'MATH 152'
+            resource.save(update_fields=['course_code'])
+        self.assertEqual(codes.get_version(), version + 1)
+        rebuilt = codes.get_trie()
+        self.assertIsNot(rebuilt, trie)
+        suggestions = self.client.get('/api/resources/autocomplete/', {'q': 'math15'}).json()
+        self.assertEqual(suggestions, [{'code': 'MATH 152', 'normalized': 'MATH152', 'count': 1}])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resource.delete()
+        self.assertIsNot(codes.get_trie(), rebuilt)
+        self.assertEqual(self.client.get('/api/resources/autocomplete/', {'q': 'math15'}).json(), [])
+
+
+class ContentSearchTests(TestCase):
+    """Page text search is filtered inside the query and returns escaped snippets."""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.linear = create_resource('MATH 251', 'Linear Algebra', level=200)
+        self.circuits = create_resource('EE 201', 'Circuits', college='CoE', level=200)
+        ResourcePage.objects.bulk_create([
+            ResourcePage(resource=self.linear, page_number=1, text='Find the <b>eigenvalues</b> & eigenvectors of A.'),
+            ResourcePage(resource=self.linear, page_number=2, text='Determinants and rank.'),
+        ])
+
+    def search(self, query, **params):
+        response = self.client.get('/api/resources/content-search/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_snippets_are_escaped(self):
+        data = self.search('eigenvalues')
+
+        [hit] = data['results']
+        self.assertEqual(hit['resource']['id'], self.linear.pk)
+        [page] = hit['pages']
+        self.assertEqual(page['page_number'], 1)
+        self.assertIn('&lt;b&gt;<mark>eigenvalues</mark>&lt;/b&gt; &amp;', page['snippet'])
+        self.assertNotIn('<b>', page['snippet'])
+
+    def test_pages_are_ranked_and_capped(self):
+        ResourcePage.objects.bulk_create([
+            ResourcePage(resource=self.circuits, page_number=number, text='Eigenvalues of the network matrix.')
+            for number in range(1, content.MAX_PAGES_PER_RESOURCE + 3)
+        ])
+
+        hits = content.search_pages('eigenvalues network')
+        self.assertEqual([resource_id for resource_id, _ in hits], [self.circuits.pk])
+        self.assertEqual(len(hits[0][1]), content.MAX_PAGES_PER_RESOURCE)
+
+        self.assertEqual(len(content.search_pages('eigenvalues')), 2)
+        self.assertEqual(len(content.search_pages('eigenvalues', limit=1)), 1)
+
+    def test_filters_apply_inside_the_search(self):
+        # Enough better-ranked CoE pages to fill the row cap on their own
+        ResourcePage.objects.bulk_create([
+            ResourcePage(resource=self.circuits, page_number=number, text='eigenvalues eigenvalues')
+            for number in range(1, 502)
+        ])
+
+        data = self.search('eigenvalues', college='CoS')
+        self.assertEqual([hit['resource']['id'] for hit in data['results']], [self.linear.pk])
+        self.assertEqual(self.search('eigenvalues', college='CoS', level=100)['count'], 0)
+
+        resources = AcademicResource.objects.filter(college='CoS')
+        self.assertEqual(
+            {row[0] for row in content._search_fallback('eigenvalues', resources)}, {self.linear.pk}
+        )
+
+    def test_query_is_required(self):
+        self.assertEqual(self.client.get('/api/resources/content-search/', {'q': ' '}).status_code, 400)
+        self.assertEqual(self.search('"*" OR -')['count'], 0)
@@ -3,11 +3,14 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from core.caching import CachedResponseMixin
 from .models import AcademicResource
 from .serializers import AcademicResourceSerializer
+from .codes import normalize_course_code, prefix_range, get_trie
+from .content import search_pages
 
 
-class AcademicResourceViewSet(viewsets.ModelViewSet):
+class AcademicResourceViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """
     API endpoint for viewing and downloading academic resources.
 
@@ -25,6 +28,9 @@ class AcademicResourceViewSet(viewsets.ModelViewSet):
     - PUT/PATCH /api/resources/{id}/ - Update resource (Admin only)
     - DELETE /api/resources/{id}/ - Delete resource (Admin only)
     - POST /api/resources/{id}/download/ - Download resource and increment count
+    - GET /api/resources/lookup/?code=math122 - Resources for a course code, grouped
+    - GET /api/resources/autocomplete/?q=mat - Course code suggestions
+    - GET /api/resources/content-search/?q=eigenvalues - Search inside the PDFs
     """
 
     queryset = AcademicResource.objects.all()
@@ -32,7 +38,7 @@ class AcademicResourceViewSet(viewsets.ModelViewSet):
     # permission_classes = [permissions.IsAuthenticatedOrReadOnly] # Old
     
     def get_permissions(self):
-        if self.action in ['list', 'retrieve', 'download']:
+        if self.action in ['list', 'retrieve', 'download', 'lookup', 'autocomplete', 'content_search']:
             permission_classes = [permissions.AllowAny]
         else:
             permission_classes = [permissions.IsAdminUser]
@@ -58,3 +64,127 @@ class AcademicResourceViewSet(viewsets.ModelViewSet):
             'downloads': resource.downloads,
             'file_url': request.build_absolute_uri(resource.file.url) if resource.file else None
         }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def lookup(self, request):
+        """
+        Resources for a course code, grouped by college, level and semester.
+        GET /api/resources/lookup/?code=MATH 122
+
+        The code is normalized ("math-122" == "MATH 122") and matched as a
+        prefix, so ?code=MATH1 returns every 100-level maths course.
+        """
+        code = normalize_course_code(request.query_params.get('code', ''))
+        if not code:
+            return Response(
+                {'error': 'Query parameter code is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        lower, upper = prefix_range(code)
+        resources = AcademicResource.objects.filter(
+            course_code_normalized__gte=lower,
+            course_code_normalized__lt=upper,
+        ).order_by('college', 'level', 'semester', 'course_code_normalized', '-uploaded_at')
+        data = self.get_serializer(resources, many=True).data
+
+        colleges = {}
+        for resource in data:
+            college = colleges.setdefault(resource['college'], {
+                'college': resource['college'],
+                'college_display': resource['college_display'],
+                'levels': {},
+            })
+            level = college['levels'].setdefault(resource['level'], {
+                'level': resource['level'],
+                'level_display': resource['level_display'],
+                'semesters': {},
+            })
+            semester = level['semesters'].setdefault(resource['semester'], {
+                'semester': resource['semester'],
+                'semester_display': resource['semester_display'],
+                'resources': [],
+            })
+            semester['resources'].append(resource)
+
+        for college in colleges.values():
+            college['levels'] = list(college['levels'].values())
+            for level in college['levels']:
+                level['semesters'] = list(level['semesters'].values())
+
+        return Response({
+            'code': code,
+            'count': len(data),
+            'results': list(colleges.values()),
+        })
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Course code suggestions for a typed prefix, most resources first.
+        GET /api/resources/autocomplete/?q=mat
+
+        Served from the in-memory course code trie; the database is only
+        read when a resource change has invalidated the trie.
+        """
+        query = request.query_params.get('q', '')
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 10)
+        except ValueError:
+            return Response(
+                {'error': 'limit must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not normalize_course_code(query):
+            return Response([])
+
+        return Response([
+            {'code': display, 'normalized': normalized, 'count': count}
+            for normalized, display, count in get_trie().suggest(query, limit)
+        ])
+
+    @action(detail=False, methods=['get'], url_path='content-search')
+    def content_search(self, request):
+        """
+        Search the extracted text of resource PDFs.
+        GET /api/resources/content-search/?q=eigenvalues&limit=20
+
+        Returns matching resources, best first, each with the pages that
+        matched (page number, highlighted snippet, rank). The usual
+        college/level/semester filters narrow the search itself. Snippets
+        are escaped HTML whose only tags are <mark> around the matches.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'Query parameter q is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response(
+                {'error': 'limit must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        hits = search_pages(query, limit=limit, resources=queryset)
+        resources = queryset.in_bulk([resource_id for resource_id, _ in hits])
+
+        results = []
+        for resource_id, pages in hits:
+            resource = resources.get(resource_id)
+            if resource is None:
+                continue
+            results.append({
+                'resource': self.get_serializer(resource).data,
+                'pages': pages,
+            })
+
+        return Response({
+            'query': query,
+            'count': len(results),
+            'results': results,
+        })
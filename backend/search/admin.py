@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import SearchEntry
+
+
+@admin.register(SearchEntry)
+class SearchEntryAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the search index, useful for checking what is indexed.
+    """
+    list_display = ('doc_type', 'object_id', 'title', 'updated_at')
+    list_filter = ('doc_type',)
+    search_fields = ('title',)
+    readonly_fields = ('doc_type', 'object_id', 'title', 'body', 'url', 'updated_at')
+
+    def has_add_permission(self, request):
+        return False
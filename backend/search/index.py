@@ -0,0 +1,285 @@
+"""
+Cross-app full-text index.
+
+SearchEntry rows hold the indexed text; on SQLite an external-content FTS5
+table (``search_searchentry_fts``) is kept in step with them by triggers,
+and an fts5vocab table (``search_searchentry_vocab``) exposes the indexed
+terms for typo-tolerant matching. Other backends fall back to icontains
+lookups on SearchEntry, which is still one table instead of a LIKE scan
+per app.
+"""
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import Count, Q
+
+from core.fts import MARK_END, MARK_START, tokenize, edit_distance, highlighted_html, is_sqlite
+from .models import SearchEntry
+from .registry import get_provider_for_model, get_providers
+
+FTS_TABLE = 'search_searchentry_fts'
+VOCAB_TABLE = 'search_searchentry_vocab'
+
+SNIPPET_WORDS = 24
+
+# Title matches weigh five times more than body matches
+TITLE_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+
+# Maximum number of vocabulary corrections tried per misspelled word
+MAX_CORRECTIONS = 5
+
+
+def create_fts_tables(schema_editor):
+    """Create the FTS5 mirror of SearchEntry, its sync triggers and vocab table."""
+    if not is_sqlite(schema_editor.connection):
+        return
+    statements = [
+        f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+            title, body,
+            content='search_searchentry', content_rowid='id',
+            tokenize='porter unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )""",
+        f"""CREATE TRIGGER search_searchentry_ai AFTER INSERT ON search_searchentry BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+        END""",
+        f"""CREATE TRIGGER search_searchentry_ad AFTER DELETE ON search_searchentry BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        END""",
+        f"""CREATE TRIGGER search_searchentry_au AFTER UPDATE ON search_searchentry BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+            INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+        END""",
+        f"CREATE VIRTUAL TABLE {VOCAB_TABLE} USING fts5vocab({FTS_TABLE}, 'row')",
+    ]
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_fts_tables(schema_editor):
+    if not is_sqlite(schema_editor.connection):
+        return
+    for statement in [
+        f"DROP TABLE IF EXISTS {VOCAB_TABLE}",
+        "DROP TRIGGER IF EXISTS search_searchentry_ai",
+        "DROP TRIGGER IF EXISTS search_searchentry_ad",
+        "DROP TRIGGER IF EXISTS search_searchentry_au",
+        f"DROP TABLE IF EXISTS {FTS_TABLE}",
+    ]:
+        schema_editor.execute(statement)
+
+
+# ---------------------------------------------------------------------------
+# Index maintenance
+# ---------------------------------------------------------------------------
+
+def index_object(obj):
+    """Add, refresh or remove one object depending on its provider's rules."""
+    provider = get_provider_for_model(type(obj))
+    if provider is None:
+        return
+    if not provider.is_searchable(obj):
+        remove_objects(provider.doc_type, [obj.pk])
+        return
+    SearchEntry.objects.update_or_create(
+        doc_type=provider.doc_type,
+        object_id=obj.pk,
+        defaults={
+            'title': provider.get_title(obj)[:300],
+            'body': provider.get_body(obj),
+            'url': provider.get_url(obj),
+        },
+    )
+
+
+def remove_objects(doc_type, object_ids):
+    """Drop entries, e.g. for deleted rows or rows hidden by a bulk update."""
+    SearchEntry.objects.filter(doc_type=doc_type, object_id__in=list(object_ids)).delete()
+
+
+def remove_for_model(model, object_ids):
+    """
+    Drop entries for rows of ``model`` hidden by a bulk ``QuerySet.update()``,
+    which does not send post_save.
+    """
+    provider = get_provider_for_model(model)
+    if provider is not None:
+        remove_objects(provider.doc_type, object_ids)
+
+
+def rebuild(doc_types=None, batch_size=500, registry=apps):
+    """
+    Rebuild the index for the given doc types (all by default).
+
+    Returns a dict of doc_type -> number of entries indexed.
+    ``registry`` is the app registry to take the models from (migrations
+    pass their historical one).
+    """
+    SearchEntry = registry.get_model('search', 'SearchEntry')
+    counts = {}
+    for provider in get_providers():
+        if doc_types and provider.doc_type not in doc_types:
+            continue
+        model = registry.get_model(provider.model._meta.label)
+        with transaction.atomic():
+            SearchEntry.objects.filter(doc_type=provider.doc_type).delete()
+            batch = []
+            count = 0
+            for obj in provider.get_queryset(model).iterator(chunk_size=batch_size):
+                if not provider.is_searchable(obj):
+                    continue
+                batch.append(SearchEntry(
+                    doc_type=provider.doc_type,
+                    object_id=obj.pk,
+                    title=provider.get_title(obj)[:300],
+                    body=provider.get_body(obj),
+                    url=provider.get_url(obj),
+                ))
+                if len(batch) >= batch_size:
+                    SearchEntry.objects.bulk_create(batch)
+                    count += len(batch)
+                    batch = []
+            SearchEntry.objects.bulk_create(batch)
+            counts[provider.doc_type] = count + len(batch)
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Querying
+# ---------------------------------------------------------------------------
+
+def search(text, doc_types=None, limit=20, offset=0):
+    """
+    Search the index.
+
+    Returns ``{'count', 'facets', 'results'}`` where facets maps every
+    doc_type with hits to its hit count (independent of the ``doc_types``
+    filter, so the UI can show counts for the other tabs) and results are
+    ranked best first. Snippets are escaped HTML whose only tags are
+    ``<mark>`` around the matches.
+    """
+    if is_sqlite(connection):
+        return _search_sqlite(text, doc_types, limit, offset)
+    return _search_fallback(text, doc_types, limit, offset)
+
+
+def _vocab_corrections(cursor, token):
+    """Indexed terms within a small edit distance of a word with no hits."""
+    max_distance = 1 if len(token) <= 5 else 2
+    cursor.execute(
+        f"SELECT term FROM {VOCAB_TABLE} WHERE term >= %s AND term < %s "
+        f"AND length(term) BETWEEN %s AND %s",
+        [token[0], chr(ord(token[0]) + 1), len(token) - max_distance, len(token) + max_distance],
+    )
+    scored = []
+    for (term,) in cursor.fetchall():
+        distance = edit_distance(token, term, max_distance)
+        if distance <= max_distance:
+            scored.append((distance, term))
+    scored.sort()
+    return [term for _, term in scored[:MAX_CORRECTIONS]]
+
+
+def _has_matches(cursor, clause):
+    cursor.execute(f"SELECT 1 FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s LIMIT 1", [clause])
+    return cursor.fetchone() is not None
+
+
+def build_match_query(cursor, text):
+    """
+    Build a typo-tolerant FTS5 MATCH expression.
+
+    Every word matches as a prefix. A word that matches nothing in the
+    vocabulary is OR-ed with the closest indexed terms instead, so
+    "electon" still finds "election".
+    """
+    clauses = []
+    for token in tokenize(text):
+        clause = f'"{token}"*'
+        if len(token) >= 3 and not _has_matches(cursor, clause):
+            corrections = _vocab_corrections(cursor, token)
+            if corrections:
+                clause = '(' + ' OR '.join([clause] + [f'"{term}"' for term in corrections]) + ')'
+        clauses.append(clause)
+    # FTS5 only ANDs bare phrases implicitly, not parenthesised groups
+    return ' AND '.join(clauses)
+
+
+def _search_sqlite(text, doc_types, limit, offset):
+    with connection.cursor() as cursor:
+        match = build_match_query(cursor, text)
+        if not match:
+            return {'count': 0, 'facets': {}, 'results': []}
+
+        base = (
+            f"FROM {FTS_TABLE} JOIN search_searchentry e ON e.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s"
+        )
+
+        cursor.execute(f"SELECT e.doc_type, COUNT(*) {base} GROUP BY e.doc_type", [match])
+        facets = dict(cursor.fetchall())
+
+        params = [MARK_START, MARK_END, SNIPPET_WORDS, TITLE_WEIGHT, BODY_WEIGHT, match]
+        type_filter = ''
+        if doc_types:
+            type_filter = f" AND e.doc_type IN ({', '.join(['%s'] * len(doc_types))})"
+            params += list(doc_types)
+        params += [limit, offset]
+
+        # bm25() is lower-is-better, so it is negated to a higher-is-better rank
+        cursor.execute(
+            f"""SELECT e.doc_type, e.object_id, e.title, e.url,
+                       snippet({FTS_TABLE}, 1, %s, %s, '…', %s),
+                       -bm25({FTS_TABLE}, %s, %s) AS score
+                {base}{type_filter}
+                ORDER BY score DESC
+                LIMIT %s OFFSET %s""",
+            params,
+        )
+        rows = cursor.fetchall()
+
+    count = sum(n for doc_type, n in facets.items() if not doc_types or doc_type in doc_types)
+    return {
+        'count': count,
+        'facets': facets,
+        'results': [
+            {
+                'type': row[0],
+                'id': row[1],
+                'title': row[2],
+                'url': row[3],
+                'snippet': highlighted_html(row[4]),
+                'rank': row[5],
+            }
+            for row in rows
+        ],
+    }
+
+
+def _search_fallback(text, doc_types, limit, offset):
+    tokens = tokenize(text)
+    if not tokens:
+        return {'count': 0, 'facets': {}, 'results': []}
+
+    queryset = SearchEntry.objects.all()
+    for token in tokens:
+        queryset = queryset.filter(Q(title__icontains=token) | Q(body__icontains=token))
+
+    facets = dict(queryset.values_list('doc_type').annotate(total=Count('id')).order_by())
+    if doc_types:
+        queryset = queryset.filter(doc_type__in=doc_types)
+
+    results = [
+        {
+            'type': entry.doc_type,
+            'id': entry.object_id,
+            'title': entry.title,
+            'url': entry.url,
+            'snippet': highlighted_html(entry.body[:200]),
+            'rank': 0.0,
+        }
+        for entry in queryset.order_by('-updated_at')[offset:offset + limit]
+    ]
+    count = sum(n for doc_type, n in facets.items() if not doc_types or doc_type in doc_types)
+    return {'count': count, 'facets': facets, 'results': results}
@@ -0,0 +1,34 @@
+"""
+Management command to rebuild the cross-app search index.
+
+The index is kept up to date by signals and was filled for existing rows
+by migration search 0002; run this after bulk imports, raw SQL changes or
+when adding a new search provider.
+
+Usage:
+    python manage.py rebuild_search_index
+    python manage.py rebuild_search_index --type product --type event
+"""
+
+from django.core.management.base import BaseCommand
+from search.index import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the cross-app full-text search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            action='append',
+            dest='doc_types',
+            help='Only rebuild this doc type (can be repeated)',
+        )
+
+    def handle(self, *args, **options):
+        counts = rebuild(options['doc_types'])
+        for doc_type, count in counts.items():
+            self.stdout.write(f"  {doc_type}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(f'Indexed {sum(counts.values())} entries.')
+        )
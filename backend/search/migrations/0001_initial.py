@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:50
+
+from django.db import migrations, models
+
+
+def create_fts_tables(apps, schema_editor):
+    from search.index import create_fts_tables
+
+    create_fts_tables(schema_editor)
+
+
+def drop_fts_tables(apps, schema_editor):
+    from search.index import drop_fts_tables
+
+    drop_fts_tables(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "doc_type",
+                    models.CharField(
+                        help_text="Provider key (e.g. 'product', 'event')",
+                        max_length=30,
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("title", models.CharField(max_length=300)),
+                ("body", models.TextField(blank=True)),
+                (
+                    "url",
+                    models.CharField(
+                        blank=True,
+                        help_text="Frontend route for the result",
+                        max_length=200,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Search Entry",
+                "verbose_name_plural": "Search Entries",
+                "indexes": [
+                    models.Index(
+                        fields=["doc_type"], name="search_sear_doc_typ_4134fa_idx"
+                    )
+                ],
+                "unique_together": {("doc_type", "object_id")},
+            },
+        ),
+        migrations.RunPython(create_fts_tables, drop_fts_tables),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 21:40
+
+from django.db import migrations
+
+
+def backfill_search_index(apps, schema_editor):
+    from search import index
+
+    index.rebuild(registry=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0001_initial"),
+        ("announcements", "0002_announcement_content_type_announcement_object_id"),
+        ("events", "0001_initial"),
+        ("legal", "0002_article_search_index"),
+        ("lost_found", "0001_initial"),
+        ("market", "0001_initial"),
+        ("opportunities", "0002_alter_opportunity_type"),
+        ("resources", "0003_resource_text"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+from django.db import models
+
+
+class SearchEntry(models.Model):
+    """
+    One searchable document in the cross-app search index.
+
+    Rows are maintained by signals (see search.signals) from the models
+    registered in search.providers. On SQLite an FTS5 table
+    (search_searchentry_fts) mirrors title/body through triggers created in
+    the initial migration.
+    """
+    doc_type = models.CharField(max_length=30, help_text="Provider key (e.g. 'product', 'event')")
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=300)
+    body = models.TextField(blank=True)
+    url = models.CharField(max_length=200, blank=True, help_text="Frontend route for the result")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('doc_type', 'object_id')
+        indexes = [models.Index(fields=['doc_type'])]
+        verbose_name = 'Search Entry'
+        verbose_name_plural = 'Search Entries'
+
+    def __str__(self):
+        return f"{self.doc_type}:{self.object_id} - {self.title}"
@@ -0,0 +1,159 @@
+"""
+Search providers for every publicly searchable model.
+
+Welfare reports are deliberately not indexed: they are private to admins.
+"""
+
+from market.models import Product
+from lost_found.models import LostItem
+from resources.models import AcademicResource
+from events.models import Event
+from opportunities.models import Opportunity
+from announcements.models import Announcement
+from legal.models import Article
+from .registry import SearchProvider, register
+
+
+def _join(*parts):
+    return ' '.join(part for part in parts if part)
+
+
+@register
+class ProductProvider(SearchProvider):
+    doc_type = 'product'
+    model = Product
+    label = 'Market'
+
+    def get_queryset(self, model=None):
+        return super().get_queryset(model).filter(is_sold=False)
+
+    def is_searchable(self, obj):
+        return not obj.is_sold
+
+    def get_title(self, obj):
+        return obj.title
+
+    def get_body(self, obj):
+        return _join(obj.get_category_display(), obj.description)
+
+    def get_url(self, obj):
+        return f'/market/{obj.id}'
+
+
+@register
+class LostItemProvider(SearchProvider):
+    doc_type = 'lost_item'
+    model = LostItem
+    label = 'Lost & Found'
+
+    def get_queryset(self, model=None):
+        return super().get_queryset(model).filter(is_resolved=False)
+
+    def is_searchable(self, obj):
+        return not obj.is_resolved
+
+    def get_title(self, obj):
+        if obj.student_name and obj.category == 'Student ID':
+            return f"{obj.type}: Student ID - {obj.student_name}"
+        return f"{obj.type}: {obj.get_category_display()}"
+
+    def get_body(self, obj):
+        return _join(obj.student_name, obj.description)
+
+    def get_url(self, obj):
+        return f'/lost-and-found/{obj.id}'
+
+
+@register
+class AcademicResourceProvider(SearchProvider):
+    doc_type = 'resource'
+    model = AcademicResource
+    label = 'Academic Resources'
+
+    def get_title(self, obj):
+        return f"{obj.course_code} - {obj.title}"
+
+    def get_body(self, obj):
+        return _join(obj.get_college_display(), f"Level {obj.level}", obj.get_semester_display())
+
+    def get_url(self, obj):
+        return '/academics'
+
+
+@register
+class EventProvider(SearchProvider):
+    doc_type = 'event'
+    model = Event
+    label = 'Events'
+
+    def get_title(self, obj):
+        return obj.title
+
+    def get_body(self, obj):
+        return _join(obj.location, obj.description)
+
+    def get_url(self, obj):
+        return '/events'
+
+
+@register
+class OpportunityProvider(SearchProvider):
+    doc_type = 'opportunity'
+    model = Opportunity
+    label = 'Opportunities'
+
+    def get_queryset(self, model=None):
+        return super().get_queryset(model).filter(is_active=True)
+
+    def is_searchable(self, obj):
+        return obj.is_active
+
+    def get_title(self, obj):
+        return f"{obj.title} - {obj.organization}"
+
+    def get_body(self, obj):
+        return _join(obj.type, obj.location, obj.description)
+
+    def get_url(self, obj):
+        return f'/career/{obj.id}'
+
+
+@register
+class AnnouncementProvider(SearchProvider):
+    doc_type = 'announcement'
+    model = Announcement
+    label = 'Announcements'
+
+    def get_queryset(self, model=None):
+        return super().get_queryset(model).filter(is_active=True)
+
+    def is_searchable(self, obj):
+        return obj.is_active
+
+    def get_title(self, obj):
+        return obj.title
+
+    def get_body(self, obj):
+        return obj.message
+
+    def get_url(self, obj):
+        return '/announcements'
+
+
+@register
+class ArticleProvider(SearchProvider):
+    doc_type = 'article'
+    model = Article
+    label = 'Constitution'
+
+    def get_queryset(self, model=None):
+        return super().get_queryset(model).select_related('chapter')
+
+    def get_title(self, obj):
+        return f"Article {obj.article_number}: {obj.title}"
+
+    def get_body(self, obj):
+        return obj.content
+
+    def get_url(self, obj):
+        return '/constitution'
@@ -0,0 +1,65 @@
+"""
+Registry of models that feed the cross-app search index.
+
+Each searchable model registers a SearchProvider describing how one of its
+instances becomes a SearchEntry (title, body text, frontend URL) and
+whether it should be publicly searchable at all (sold products, resolved
+lost items, inactive announcements etc. are removed from the index).
+"""
+
+
+class SearchProvider:
+    """
+    Describes how instances of one model are indexed.
+
+    Subclasses set ``doc_type`` / ``model`` / ``label`` and override
+    get_title(), get_body() and optionally get_url(), is_searchable() and
+    get_queryset().
+    """
+    doc_type = None
+    model = None
+    label = None
+
+    def get_queryset(self, model=None):
+        """
+        Rows to (re)index during a full rebuild. ``model`` replaces
+        ``self.model`` (migrations pass their historical one).
+        """
+        return (model or self.model)._default_manager.all()
+
+    def is_searchable(self, obj):
+        return True
+
+    def get_title(self, obj):
+        raise NotImplementedError
+
+    def get_body(self, obj):
+        return ''
+
+    def get_url(self, obj):
+        return ''
+
+
+_providers = {}
+
+
+def register(provider_class):
+    """Class decorator registering a provider instance under its doc_type."""
+    provider = provider_class()
+    _providers[provider.doc_type] = provider
+    return provider_class
+
+
+def get_provider(doc_type):
+    return _providers.get(doc_type)
+
+
+def get_providers():
+    return list(_providers.values())
+
+
+def get_provider_for_model(model):
+    for provider in _providers.values():
+        if provider.model is model:
+            return provider
+    return None
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_save, post_delete
+from core.deletion import bulk_deleted
+from .registry import get_providers
+from . import index
+
+
+def update_search_entry(sender, instance, **kwargs):
+    """
+    Push a saved object into the search index (or drop it if it is no
+    longer searchable, e.g. a product marked as sold).
+    """
+    index.index_object(instance)
+
+
+def remove_search_entry(sender, instance, **kwargs):
+    """
+    Remove a deleted object from the search index.
+    """
+    provider = next(p for p in get_providers() if p.model is sender)
+    index.remove_objects(provider.doc_type, [instance.pk])
+
+
+def remove_bulk_deleted_entries(sender, pks, **kwargs):
+    """
+    Remove rows deleted in bulk by core.deletion (no post_delete is sent).
+    """
+    index.remove_for_model(sender, pks)
+
+
+for provider in get_providers():
+    post_save.connect(update_search_entry, sender=provider.model, dispatch_uid=f'search_index_{provider.doc_type}')
+    post_delete.connect(remove_search_entry, sender=provider.model, dispatch_uid=f'search_unindex_{provider.doc_type}')
+    bulk_deleted.connect(remove_bulk_deleted_entries, sender=provider.model, dispatch_uid=f'search_bulk_unindex_{provider.doc_type}')
@@ -0,0 +1,150 @@
+import datetime
+import io
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from announcements.models import Announcement
+from core import deletion
+from dasa_users.models import User
+from events.models import Event
+from legal.models import Article, Chapter
+from lost_found.models import LostItem
+from market.models import Product
+from . import index
+from .models import SearchEntry
+from .registry import get_provider_for_model
+
+
+class SearchIndexTests(TestCase):
+    """Signals keep the index in step; searches are ranked, faceted and typo-tolerant."""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.seller = User.objects.create_user(username='seller')
+        self.product = self.create_product('Scientific calculator', 'Casio fx-991 for <b>engineering</b> maths')
+        self.event = Event.objects.create(
+            title='Freshers orientation', description='Welcome session for the engineering freshers',
+            date=timezone.now().date() + datetime.timedelta(days=7),
+            start_time=datetime.time(10), end_time=datetime.time(12), location='Great Hall',
+        )
+        chapter = Chapter.objects.create(number=3, title='Elections')
+        self.article = Article.objects.create(
+            chapter=chapter, article_number='3.1', title='Election of officers',
+            content='Officers are chosen by secret ballot.',
+        )
+
+    def create_product(self, title, description):
+        return Product.objects.create(
+            seller=self.seller, title=title, price='50.00', category='Electronics',
+            condition='Used - Good', image='market/p.jpg', description=description,
+            whatsapp_number='0200000000',
+        )
+
+    def search(self, query, **params):
+        response = self.client.get('/api/search/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def entry(self, obj):
+        provider = get_provider_for_model(type(obj))
+        return SearchEntry.objects.filter(doc_type=provider.doc_type, object_id=obj.pk).first()
+
+    def test_saved_objects_are_indexed_by_their_provider(self):
+        entry = self.entry(self.product)
+        self.assertEqual((entry.title, entry.url), ('Scientific calculator', f'/market/{self.product.pk}'))
+        self.assertEqual(entry.body, 'Electronics Casio fx-991 for <b>engineering</b> maths')
+        self.assertEqual(self.entry(self.article).title, 'Article 3.1: Election of officers')
+
+        self.product.title = 'Graphing calculator'
+        self.product.save()
+        self.assertEqual(self.entry(self.product).title, 'Graphing calculator')
+        self.assertEqual(SearchEntry.objects.filter(doc_type='product').count(), 1)
+
+    def test_results_are_ranked_and_escaped(self):
+        self.create_product('Maths set', 'Compass and protractor')
+
+        data = self.search('maths')
+
+        self.assertEqual([hit['title'] for hit in data['results']], ['Maths set', 'Scientific calculator'])
+        self.assertGreater(data['results'][0]['rank'], data['results'][1]['rank'])
+        snippet = self.search('engineering', type='product')['results'][0]['snippet']
+        self.assertIn('&lt;b&gt;<mark>engineering</mark>&lt;/b&gt;', snippet)
+        self.assertNotIn('<b>', snippet)
+
+    def test_facets_cover_every_type(self):
+        data = self.search('engineering', type='event')
+
+        self.assertEqual(data['facets'], {'event': 1, 'product': 1, 'announcement': 1})
+        self.assertEqual(data['count'], 1)
+        self.assertEqual([hit['type'] for hit in data['results']], ['event'])
+        self.assertEqual(data['types']['lost_item'], 'Lost & Found')
+
+    def test_misspelled_words_fall_back_to_indexed_terms(self):
+        with connection.cursor() as cursor:
+            self.assertIn('ballot', index._vocab_corrections(cursor, 'balot'))
+            self.assertEqual(index._vocab_corrections(cursor, 'zzzzzz'), [])
+
+        data = self.search('secret balot')
+        self.assertEqual([hit['id'] for hit in data['results']], [self.article.pk])
+        self.assertEqual(self.search('zzzzzz')['count'], 0)
+
+    def test_hidden_objects_drop_out(self):
+        item = LostItem.objects.create(
+            reporter=self.seller, type='Lost', category='Wallet',
+            description='Brown leather wallet near the library', contact_info='0200000000',
+        )
+        self.assertEqual(set(self.search('leather')['facets']), {'lost_item', 'announcement'})
+
+        item.is_resolved = True
+        item.save()  # its announcement is deactivated with update(), no post_save
+        self.product.is_sold = True
+        self.product.save()
+
+        self.assertEqual(self.search('leather')['count'], 0)
+        self.assertEqual(self.search('calculator')['count'], 0)
+        self.assertFalse(Announcement.objects.filter(is_active=True, message__contains='leather').exists())
+
+    def test_deleted_objects_drop_out(self):
+        other = self.create_product('Desk calculator', 'Solar powered')
+        self.product.delete()
+        deletion.delete_in_chunks(Product, [other.pk])  # raw delete: bulk_deleted, not post_delete
+
+        self.assertEqual(self.search('calculator')['count'], 0)
+        self.assertFalse(SearchEntry.objects.filter(doc_type='product').exists())
+
+    def test_rebuild_skips_hidden_rows(self):
+        sold = self.create_product('Used calculator', 'Works fine')
+        Product.objects.filter(pk=sold.pk).update(is_sold=True)  # no signals: still indexed
+        SearchEntry.objects.filter(doc_type='event').delete()
+
+        counts = index.rebuild(['product', 'event'])
+
+        self.assertEqual(counts, {'product': 1, 'event': 1})
+        self.assertIsNone(self.entry(sold))
+        self.assertIsNotNone(self.entry(self.event))
+        self.assertEqual(self.search('freshers orientation')['results'][0]['type'], 'event')
+
+        out = io.StringIO()
+        call_command('rebuild_search_index', '--type', 'article', stdout=out)
+        self.assertIn('Indexed 1 entries.', out.getvalue())
+        self.assertEqual(SearchEntry.objects.filter(doc_type='article').count(), 1)
+
+    def test_migration_backfills_existing_rows(self):
+        SearchEntry.objects.all().delete()
+        state = MigrationExecutor(connection).loader.project_state(('search', '0002_backfill_search_index'))
+
+        index.rebuild(registry=state.apps)
+
+        self.assertEqual(self.entry(self.product).url, f'/market/{self.product.pk}')
+        self.assertEqual(self.entry(self.article).title, 'Article 3.1: Election of officers')
+        self.assertEqual(self.entry(self.event).body, 'Great Hall Welcome session for the engineering freshers')
+        self.assertEqual(self.search('secret ballot')['results'][0]['type'], 'article')
+
+    def test_query_is_required(self):
+        self.assertEqual(self.client.get('/api/search/', {'q': ' '}).status_code, 400)
+        self.assertEqual(self.client.get('/api/search/', {'q': 'calculator', 'limit': 'x'}).status_code, 400)
@@ -0,0 +1,54 @@
+from rest_framework import permissions, status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from .registry import get_providers
+from . import index
+
+
+class SearchView(APIView):
+    """
+    Unified search across products, lost & found items, academic resources,
+    events, opportunities, announcements and constitution articles.
+
+    Endpoint:
+    - GET /api/search/?q=calculus
+    - GET /api/search/?q=wallet&type=lost_item,announcement
+
+    Query parameters:
+    - q: Search text (required). Words match as prefixes, and misspelled
+      words fall back to the closest indexed terms.
+    - type: Comma-separated doc types to return (facets still cover all types)
+    - limit: Page size (default 20, max 100)
+    - offset: Page offset (default 0)
+
+    Returns:
+    - count: Total hits for the selected types
+    - facets: Hit count per doc type
+    - types: Available doc types with display labels
+    - results: Ranked hits (type, id, title, url, highlighted snippet, rank)
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'Query parameter q is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        doc_types = [t for t in request.query_params.get('type', '').split(',') if t]
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+        except ValueError:
+            return Response(
+                {'error': 'limit and offset must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = index.search(query, doc_types=doc_types, limit=limit, offset=offset)
+        data['query'] = query
+        data['types'] = {provider.doc_type: provider.label for provider in get_providers()}
+        return Response(data)
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from dasa_users.serializers import UserSummarySerializer
 from .models import WelfareReport
 
 
@@ -7,7 +8,7 @@ class WelfareReportSerializer(serializers.ModelSerializer):
     Serializer for WelfareReport model.
     Handles anonymous submissions and provides reporter details when not anonymous.
     """
-    reporter_details = serializers.SerializerMethodField()
+    reporter_details = UserSummarySerializer(source='reporter', read_only=True)
 
     class Meta:
         model = WelfareReport
@@ -25,23 +26,14 @@ class WelfareReportSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-    def get_reporter_details(self, obj):
+    def to_representation(self, instance):
         """
-        Returns nested reporter details ONLY if report is not anonymous.
-        Returns None if anonymous or reporter is not set.
+        Hide reporter details for anonymous reports.
         """
-        if obj.is_anonymous or not obj.reporter:
-            return None
-
-        return {
-            'id': obj.reporter.id,
-            'username': obj.reporter.username,
-            'email': obj.reporter.email,
-            'first_name': obj.reporter.first_name,
-            'last_name': obj.reporter.last_name,
-            'full_name': f"{obj.reporter.first_name} {obj.reporter.last_name}" if obj.reporter.first_name and obj.reporter.last_name else obj.reporter.username,
-            'avatar': obj.reporter.profile.profile_picture.url if hasattr(obj.reporter, 'profile') and obj.reporter.profile.profile_picture else None,
-        }
+        data = super().to_representation(instance)
+        if instance.is_anonymous:
+            data['reporter_details'] = None
+        return data
 
     def create(self, validated_data):
         """
@@ -1,3 +1,32 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
+from dasa_users.models import User
+from .models import WelfareReport
 
-# Create your tests here.
+
+class WelfareReportListTests(TestCase):
+    """The admin report list hides the reporter of anonymous reports."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pass12345', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def create_reports(self, count, is_anonymous=False):
+        for i in range(count):
+            WelfareReport.objects.create(
+                category='Other',
+                description=f'Report {i}',
+                is_anonymous=is_anonymous,
+                reporter=self.admin,
+            )
+
+    def get_list(self):
+        response = self.client.get('/api/welfare/reports/', HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_anonymous_reports_hide_reporter(self):
+        self.create_reports(1, is_anonymous=True)
+        data = self.get_list()
+        self.assertIsNone(data[0]['reporter_details'])
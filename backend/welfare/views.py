@@ -1,11 +1,12 @@
 from rest_framework import viewsets, permissions, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from core.querysets import QueryPlanMixin
 from .models import WelfareReport
 from .serializers import WelfareReportSerializer
 
 
-class WelfareViewSet(viewsets.ModelViewSet):
+class WelfareViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing welfare reports.
     """